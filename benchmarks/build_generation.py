@@ -0,0 +1,95 @@
+"""Compare generation builds with the bulk-load pragmas against SQLite's default settings.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/build_generation.py --scales 1 10 --repeat 3
+
+The recorded ``/products/full`` feed and hardware pages under ``tests/fixtures``
+are parsed once and replicated to each scale. Every scale is then written with
+``Database.save`` twice: once with ``bulk_load=False``, which keeps SQLite's
+default ``journal_mode = DELETE`` and synchronous settings, and once with the
+bulk-load pragmas the build applies to its temporary file by default. The best
+time of ``--repeat`` runs is reported, including the fsync of the finished
+generation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+from eolchecker.models import HardwareLifecycle, SoftwareLifecycle
+from eolchecker.tools import Database
+from eolchecker.tools.downloader import Downloader
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def recorded_records() -> tuple[list[SoftwareLifecycle], list[HardwareLifecycle]]:
+    downloader = Downloader()
+    software = downloader.parse_software_feed((FIXTURES / "software" / "products_full.json").read_bytes())
+    hardware = [
+        record
+        for page in sorted((FIXTURES / "hardware").glob("*.html"))
+        for record in downloader.parse_hardware_page(page.read_bytes(), page.stem)
+    ]
+    return software, hardware
+
+
+def build_seconds(
+    path: Path,
+    software: list[SoftwareLifecycle],
+    hardware: list[HardwareLifecycle],
+    repeat: int,
+    compact: bool,
+    bulk_load: bool,
+) -> float:
+    timings = []
+    for _ in range(repeat):
+        path.unlink(missing_ok=True)
+        started = time.perf_counter()
+        Database(path).save(software, hardware, compact=compact, bulk_load=bulk_load)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10], help="Dataset multipliers")
+    parser.add_argument("--repeat", type=int, default=3, help="Builds per configuration (default: %(default)s)")
+    parser.add_argument("--compact", action="store_true", help="Also rewrite each generation with VACUUM INTO")
+    args = parser.parse_args()
+    # The recorded pages deliberately contain malformed rows; their warnings would drown the results.
+    logging.getLogger("eolchecker").setLevel(logging.ERROR)
+
+    software, hardware = recorded_records()
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "eol.db"
+        for scale in args.scales:
+            scaled_software = [
+                replace(record, name=f"{record.name}-{copy}") for copy in range(scale) for record in software
+            ]
+            scaled_hardware = [
+                replace(record, model=f"{record.model} {copy}") for copy in range(scale) for record in hardware
+            ]
+            records = len(scaled_software) + len(scaled_hardware)
+            timings = {}
+            for label, bulk_load in (("default", False), ("bulk-load", True)):
+                timings[label] = build_seconds(
+                    path, scaled_software, scaled_hardware, args.repeat, args.compact, bulk_load
+                )
+                print(
+                    f"{scale:>5}x  {label:<10} {records:>9} records  {timings[label]:8.3f} s  "
+                    f"{records / timings[label]:12.0f} records/s"
+                )
+            print(f"{scale:>5}x  speed-up   {timings['default'] / timings['bulk-load']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""Compare the hardware table extractors over the saved hardware fixture pages.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/hardware_parser.py --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from pathlib import Path
+
+from eolchecker.tools.htmltables import TABLE_EXTRACTORS
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "hardware"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="Timing repetitions per backend (default: %(default)s)")
+    args = parser.parse_args()
+
+    pages = [page.read_bytes() for page in sorted(FIXTURES.glob("*.html"))]
+    total_bytes = sum(len(page) for page in pages)
+    print(f"{len(pages)} pages, {total_bytes / 1024:.0f} KiB")
+    for name, extract in TABLE_EXTRACTORS.items():
+        best = min(
+            timeit.repeat(lambda extract=extract: [extract(page) for page in pages], number=1, repeat=args.repeat)
+        )
+        print(f"{name:>14}: {best * 1000:8.2f} ms  {total_bytes / best / 1024 / 1024:6.1f} MiB/s")
+
+
+if __name__ == "__main__":
+    main()
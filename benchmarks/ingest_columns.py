@@ -0,0 +1,129 @@
+"""Compare loading a refresh through record objects with loading it through validated columns.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/ingest_columns.py --scales 1 20 --repeat 3
+
+The recorded ``/products/full`` feed and the hardware pages under
+``tests/fixtures`` are parsed once with ``Downloader.parse_software_feed()`` and
+``Downloader.parse_hardware_page()``, and their values are replicated to each
+scale, so parsing, which both paths share, is not measured. Every scale is then
+validated and written with ``Database.save`` twice: once from a
+``SoftwareLifecycle`` or ``HardwareLifecycle`` record built per row, as before
+the columnar path existed, and once from ``SoftwareColumns`` and
+``HardwareColumns`` built from the same rows. The best CPU times of the
+validation and of the whole load over ``--repeat`` runs, which include the
+SQLite index builds both paths share, and the peak of traced allocations are
+reported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from eolchecker.models import (
+    HardwareColumns,
+    HardwareLifecycle,
+    HardwareRow,
+    SoftwareColumns,
+    SoftwareLifecycle,
+    SoftwareRow,
+)
+from eolchecker.tools import Database
+from eolchecker.tools.downloader import Downloader
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def recorded_sources(scale: int) -> tuple[list[SoftwareRow], list[HardwareRow]]:
+    downloader = Downloader()
+    software = downloader.parse_software_feed((FIXTURES / "software" / "products_full.json").read_bytes())
+    hardware = [
+        record
+        for page in sorted((FIXTURES / "hardware").glob("*.html"))
+        for record in downloader.parse_hardware_page(page.read_bytes(), page.stem)
+    ]
+    software_rows = [
+        (f"{record.name}-{copy}", record.version, record.eol) for copy in range(scale) for record in software
+    ]
+    hardware_rows = [
+        (record.manufacturer, f"{record.model} {copy}", record.eol, record.source)
+        for copy in range(scale)
+        for record in hardware
+    ]
+    return software_rows, hardware_rows
+
+
+def load_records(path: Path, software_rows: list[SoftwareRow], hardware_rows: list[HardwareRow]) -> float:
+    """Validate and save the rows as records, returning the CPU time of the validation."""
+    started = time.process_time()
+    software = [SoftwareLifecycle(*row) for row in software_rows]
+    hardware = [HardwareLifecycle(*row) for row in hardware_rows]
+    validated = time.process_time() - started
+    Database(path).save(software, hardware)
+    return validated
+
+
+def load_columns(path: Path, software_rows: list[SoftwareRow], hardware_rows: list[HardwareRow]) -> float:
+    """Validate and save the rows through columns, returning the CPU time of the validation."""
+    started = time.process_time()
+    software = SoftwareColumns.from_rows(software_rows)
+    hardware = HardwareColumns.from_rows(hardware_rows)
+    validated = time.process_time() - started
+    Database(path).save(software, hardware)
+    return validated
+
+
+def measure(load: Callable[[], float], path: Path, repeat: int) -> tuple[float, float, int]:
+    """Return the best validation and total CPU times of ``repeat`` loads and the peak of traced allocations."""
+    validations, totals = [], []
+    for _ in range(repeat):
+        path.unlink(missing_ok=True)
+        started = time.process_time()
+        validations.append(load())
+        totals.append(time.process_time() - started)
+    path.unlink(missing_ok=True)
+    tracemalloc.start()
+    try:
+        load()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(validations), min(totals), peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 20], help="Dataset multipliers")
+    parser.add_argument("--repeat", type=int, default=3, help="Loads per path (default: %(default)s)")
+    args = parser.parse_args()
+    # The recorded pages deliberately contain malformed rows; their warnings would drown the results.
+    logging.getLogger("eolchecker").setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "eol.db"
+        for scale in args.scales:
+            software_rows, hardware_rows = recorded_sources(scale)
+            results = {}
+            for label, load in (("records", load_records), ("columns", load_columns)):
+                load_rows = functools.partial(load, path, software_rows, hardware_rows)
+                validation, total, peak = measure(load_rows, path, args.repeat)
+                results[label] = validation
+                print(
+                    f"{scale:>5}x  {label:<8} {validation:8.3f} s validate  {total:8.3f} s total CPU  "
+                    f"{peak / 1024 / 1024:8.1f} MiB peak"
+                )
+            print(f"{scale:>5}x  validation speed-up {results['records'] / results['columns']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""Measure throughput and latency of the HTTP query service against one CLI invocation per query.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/load_test_server.py --rows 100000 --clients 16 --duration 10
+
+Without ``--url`` the script builds a synthetic cache and serves it in-process;
+with ``--url`` it loads an already running ``eolchecker --serve`` instance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import random
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from eolchecker.models import HardwareLifecycle, SoftwareLifecycle
+from eolchecker.tools import Database
+from eolchecker.tools.server import LifecycleServer
+
+
+def synthetic_cache(path: Path, rows: int, generator: random.Random) -> list[str]:
+    products = max(rows // 10, 1)
+    alphabet = string.ascii_lowercase
+    names = ["".join(generator.choices(alphabet, k=generator.randint(5, 14))) for _ in range(products)]
+    Database(path).save(
+        [SoftwareLifecycle(names[index % products], f"{index // products}.0", "2030-01-01") for index in range(rows)],
+        [HardwareLifecycle("Dell", f"PowerEdge R{index}", "2030-01-01") for index in range(rows)],
+    )
+    return names
+
+
+def request_paths(names: list[str], count: int, generator: random.Random) -> list[str]:
+    paths = []
+    for _ in range(count):
+        name = generator.choice(names)
+        kind = generator.random()
+        if kind < 0.5:
+            paths.append(f"/software?name={quote(name)}&version=1.{generator.randint(0, 9)}")
+        elif kind < 0.8:
+            paths.append(f"/software?name={quote(name[1:5])}")
+        else:
+            paths.append(f"/hardware?name=R{generator.randint(0, 999)}")
+    return paths
+
+
+def client(host: str, port: int, paths: list[str], deadline: float, latencies: list[float]) -> None:
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    index = 0
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            connection.request("GET", paths[index % len(paths)])
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                raise RuntimeError(f"Unexpected HTTP status {response.status}")
+            latencies.append(time.perf_counter() - started)
+            index += 1
+    finally:
+        connection.close()
+
+
+def load(host: str, port: int, paths: list[str], clients: int, duration: float) -> tuple[int, list[float]]:
+    per_client: list[list[float]] = [[] for _ in range(clients)]
+    deadline = time.perf_counter() + duration
+    stride = max(len(paths) // clients, 1)
+    threads = [
+        threading.Thread(
+            target=client, args=(host, port, paths[index * stride :] + paths[: index * stride], deadline, latencies)
+        )
+        for index, latencies in enumerate(per_client)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies = [value for values in per_client for value in values]
+    return len(latencies), latencies
+
+
+def cli_latencies(cache_path: Path, names: list[str], samples: int, generator: random.Random) -> list[float]:
+    results = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        command = [sys.executable, "-m", "eolchecker.eolchecker", "--cache-path", str(cache_path)]
+        subprocess.run(
+            [*command, "--software", generator.choice(names)],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        results.append(time.perf_counter() - started)
+    return results
+
+
+def describe(values: list[float]) -> str:
+    ordered = sorted(values)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"p50 {statistics.median(ordered) * 1e3:8.2f} ms  p99 {p99 * 1e3:8.2f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Load an already running service instead of an in-process one")
+    parser.add_argument("--rows", type=int, default=100_000, help="Synthetic rows per table (default: %(default)s)")
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent keep-alive clients (default: %(default)s)")
+    parser.add_argument("--threads", type=int, default=16, help="Server request threads (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load (default: %(default)s)")
+    parser.add_argument("--cli-samples", type=int, default=10, help="CLI invocations to compare (default: %(default)s)")
+    args = parser.parse_args()
+
+    generator = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = Path(directory) / "eol.db"
+        names = synthetic_cache(cache_path, args.rows, generator)
+        paths = request_paths(names, 10_000, generator)
+
+        if args.url:
+            address = urlsplit(args.url)
+            host, port = address.hostname or "127.0.0.1", address.port or 80
+            requests, latencies = load(host, port, paths, args.clients, args.duration)
+        else:
+            server = LifecycleServer(("127.0.0.1", 0), Database(cache_path, in_memory=True), threads=args.threads)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                requests, latencies = load("127.0.0.1", server.server_address[1], paths, args.clients, args.duration)
+            finally:
+                server.shutdown()
+                server.server_close()
+                server.database.close()
+
+        print(f"service  {requests / args.duration:10.1f} requests/s  {describe(latencies)}  ({args.clients} clients)")
+        if args.cli_samples > 0:
+            samples = cli_latencies(cache_path, names, args.cli_samples, generator)
+            print(f"cli      {1 / statistics.mean(samples):10.1f} requests/s  {describe(samples)}  (sequential)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Replay the recorded upstream fixtures through a local server and benchmark the refresh pipeline.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/refresh_suite.py --scales 1 10 100 --output results.json
+    python benchmarks/refresh_suite.py --scales 1 10 100 --baseline results.json
+
+The recorded ``/products/full`` feed and hardware pages under ``tests/fixtures``
+are replicated to each scale and served by a local HTTP server, so the whole
+refresh runs without network access. Every run measures end-to-end refresh
+time, parse throughput, generation build stages, and search latency
+percentiles. Results are written as JSON; with ``--baseline`` the script exits
+with status 1 when a measurement regresses by more than ``--tolerance``. Stage
+breakdowns, which are summed over concurrent pages, and p99 latencies are too
+noisy on shared machines to gate on; they are recorded for comparison only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+from eolchecker.tools import Database
+from eolchecker.tools.downloader import Downloader
+from eolchecker.tools.metrics import CACHE_SOURCE, RefreshMetrics
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+SOFTWARE_PATH = "/api/v1/products/full"
+HARDWARE_PREFIX = "/en"
+
+
+def scaled_software_feed(scale: int) -> bytes:
+    """Return the recorded feed with its products repeated ``scale`` times under distinct names."""
+    document = json.loads((FIXTURES / "software" / "products_full.json").read_bytes())
+    products = document["result"]
+    document["result"] = [
+        {**product, "name": product["name"] if copy == 0 else f"{product['name']}-{copy}"}
+        for copy in range(scale)
+        for product in products
+    ]
+    document["total"] = len(document["result"])
+    return json.dumps(document, separators=(",", ":")).encode("utf-8")
+
+
+def scaled_hardware_pages(scale: int) -> dict[str, bytes]:
+    """Return one page per configured manufacturer, cycling through the recorded pages with repeated rows."""
+    recorded = [page.read_bytes() for page in sorted((FIXTURES / "hardware").glob("*.html"))]
+    scaled = []
+    for page in recorded:
+        start = page.index(b"<tbody>") + len(b"<tbody>")
+        end = page.index(b"</tbody>")
+        scaled.append(page[:start] + page[start:end] * scale + page[end:])
+    return {
+        f"{HARDWARE_PREFIX}/{manufacturer}": scaled[index % len(scaled)]
+        for index, manufacturer in enumerate(Downloader.HARDWARE_MANUFACTURERS)
+    }
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """A local stand-in for the upstream sources that serves fixed responses by path."""
+
+    daemon_threads = True
+
+    def __init__(self, responses: Mapping[str, tuple[str, bytes]]) -> None:
+        super().__init__(("127.0.0.1", 0), ReplayHandler)
+        self.responses = responses
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    server: ReplayServer
+
+    def do_GET(self) -> None:
+        response = self.server.responses.get(self.path)
+        if response is None:
+            self.send_error(404)
+            return
+        content_type, body = response
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        return None
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def best_of(repeat: int, operation: Callable[[], object]) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run_scale(scale: int, repeat: int, queries: int, directory: Path) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+
+    def record(name: str, value: float, unit: str, better: str = "lower") -> None:
+        results.append({"name": name, "scale": scale, "value": value, "unit": unit, "better": better})
+
+    feed = scaled_software_feed(scale)
+    pages = scaled_hardware_pages(scale)
+    responses = {SOFTWARE_PATH: ("application/json", feed)}
+    responses.update({path: ("text/html; charset=utf-8", page) for path, page in pages.items()})
+    server = ReplayServer(responses)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        urls = {"software_api": f"{server.base_url}/api/v1", "hardware_url": f"{server.base_url}{HARDWARE_PREFIX}"}
+        cache_path = directory / f"eol-{scale}.db"
+
+        metrics = RefreshMetrics()
+        started = time.perf_counter()
+        with Downloader(max_workers=4, metrics=metrics, **urls) as downloader:
+            software_columns, hardware_columns = downloader.get_eol_columns()
+            Database(cache_path).save(software_columns, hardware_columns, downloader.validators, metrics)
+        metrics.finish(succeeded=True)
+        record("refresh.end_to_end", time.perf_counter() - started, "s")
+        for stage, seconds in sorted(metrics.stage_seconds().items()):
+            record(f"refresh.stage.{stage}", seconds, "s", better="none")
+        cache = next(source for source in metrics.sources if source.source == CACHE_SOURCE)
+        record("build.insert_rate", cache.records / cache.seconds["insert"], "records/s", "higher")
+
+        with Downloader(**urls) as downloader:
+            software_seconds = best_of(repeat, downloader.get_eol_software)
+            page_bytes = list(pages.values())
+            hardware_seconds = best_of(
+                repeat, lambda: [downloader.parse_hardware_page(page, "benchmark") for page in page_bytes]
+            )
+            hardware_count = sum(len(downloader.parse_hardware_page(page, "benchmark")) for page in page_bytes)
+        record("parse.software_rate", len(software_columns) / software_seconds, "records/s", "higher")
+        record("parse.hardware_rate", hardware_count / hardware_seconds, "records/s", "higher")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    software_records, hardware_records = software_columns.records(), hardware_columns.records()
+    generator = random.Random(scale)
+    software_terms = [generator.choice(software_records) for _ in range(queries)]
+    hardware_terms = [generator.choice(hardware_records).model.split()[-1] for _ in range(queries)]
+    with Database(cache_path, persistent=True) as database:
+        searches: dict[str, Callable[[int], object]] = {
+            "search.software": lambda index: database.search_software(software_terms[index].name[:5]),
+            "search.release": lambda index: database.find_software_release(
+                software_terms[index].name, f"{software_terms[index].version}.1"
+            ),
+            "search.hardware": lambda index: database.search_hardware(hardware_terms[index]),
+        }
+        for name, search in searches.items():
+            search(0)
+            latencies = []
+            for index in range(queries):
+                started = time.perf_counter()
+                search(index)
+                latencies.append(time.perf_counter() - started)
+            for label, fraction, better in (("p50", 0.5, "lower"), ("p90", 0.9, "lower"), ("p99", 0.99, "none")):
+                record(f"{name}.{label}", percentile(latencies, fraction) * 1e6, "us", better)
+    return results
+
+
+def regressions(results: list[dict[str, Any]], baseline: list[dict[str, Any]], tolerance: float) -> list[str]:
+    previous = {(entry["name"], entry["scale"]): entry["value"] for entry in baseline}
+    failures = []
+    for entry in results:
+        before = previous.get((entry["name"], entry["scale"]))
+        if not before:
+            continue
+        change = entry["value"] / before - 1
+        if (entry["better"] == "lower" and change > tolerance) or (entry["better"] == "higher" and -change > tolerance):
+            failures.append(
+                f"{entry['name']} at {entry['scale']}x: {before:.6g} -> {entry['value']:.6g} {entry['unit']} "
+                f"({change:+.0%})"
+            )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="Dataset multipliers")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions of throughput runs (default: %(default)s)")
+    parser.add_argument("--queries", type=int, default=500, help="Queries per search (default: %(default)s)")
+    parser.add_argument("--output", type=Path, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="Compare against results written by an earlier run")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="Allowed relative regression (default: %(default)s)"
+    )
+    args = parser.parse_args()
+    # The recorded pages deliberately contain malformed rows; their warnings would drown the results.
+    logging.getLogger("eolchecker").setLevel(logging.ERROR)
+
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for scale in args.scales:
+            scale_results = run_scale(scale, args.repeat, args.queries, Path(directory))
+            for entry in scale_results:
+                print(f"{entry['scale']:>5}x  {entry['name']:<28} {entry['value']:14.3f} {entry['unit']}")
+            results.extend(scale_results)
+
+    report = {
+        "environment": {
+            "eolchecker": version("eolchecker"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        failures = regressions(results, baseline["results"], args.tolerance)
+        for failure in failures:
+            print(f"REGRESSION: {failure}")
+        if failures:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Compare substring search latency with and without the FTS5 trigram index.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/search_index.py --sizes 1000 10000 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import statistics
+import string
+import tempfile
+import time
+from pathlib import Path
+
+from eolchecker.models import HardwareLifecycle, SoftwareLifecycle
+from eolchecker.tools import Database
+
+
+def drop_search_index(path: Path) -> None:
+    connection = sqlite3.connect(path)
+    try:
+        connection.execute("DROP TABLE IF EXISTS software_search")
+        connection.execute("DROP TABLE IF EXISTS hardware_search")
+        connection.commit()
+    finally:
+        connection.close()
+
+
+def synthetic_software(size: int, generator: random.Random) -> list[SoftwareLifecycle]:
+    products = max(size // 10, 1)
+    alphabet = string.ascii_lowercase + "-"
+    names = ["".join(generator.choices(alphabet, k=generator.randint(4, 16))) for _ in range(products)]
+    return [SoftwareLifecycle(names[index % products], f"{index // products}.0", "2030-01-01") for index in range(size)]
+
+
+def synthetic_hardware(size: int, generator: random.Random) -> list[HardwareLifecycle]:
+    vendors = ("Dell", "HPE", "Cisco", "IBM", "NetApp")
+    return [
+        HardwareLifecycle(generator.choice(vendors), f"Model {generator.randint(0, size * 10)}", "2030-01-01")
+        for _ in range(size)
+    ]
+
+
+def latencies(database: Database, terms: list[str], hardware: bool) -> list[float]:
+    search = database.search_hardware if hardware else database.search_software
+    search(terms[0])
+    results = []
+    for term in terms:
+        started = time.perf_counter()
+        search(term)
+        results.append(time.perf_counter() - started)
+    return results
+
+
+def describe(values: list[float]) -> str:
+    ordered = sorted(values)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return f"median {statistics.median(ordered) * 1e6:9.1f} us  p99 {p99 * 1e6:9.1f} us"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Rows per table")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per measurement (default: %(default)s)")
+    args = parser.parse_args()
+
+    generator = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            software_records = synthetic_software(size, generator)
+            hardware_records = synthetic_hardware(size, generator)
+            software_terms = [generator.choice(software_records).name[1:5] for _ in range(args.queries)]
+            hardware_terms = [generator.choice(hardware_records).model[-4:] for _ in range(args.queries)]
+            for label in ("scan", "trigram"):
+                path = Path(directory) / f"{label}-{size}.db"
+                Database(path).save(software_records, hardware_records)
+                if label == "scan":
+                    drop_search_index(path)
+                with Database(path, persistent=True) as database:
+                    print(
+                        f"{size:>8} rows {label:>8}  software {describe(latencies(database, software_terms, False))}"
+                        f"  hardware {describe(latencies(database, hardware_terms, True))}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
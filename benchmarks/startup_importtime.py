@@ -0,0 +1,72 @@
+"""Check the import cost of the command-line entry point with ``python -X importtime``.
+
+Run from the repository root with the package installed (``pip install -e .``)::
+
+    python benchmarks/startup_importtime.py --runs 20 --max-ms 100
+
+The script exits with status 1 when the median cumulative import time of
+``eolchecker.eolchecker`` exceeds ``--max-ms``, or when importing it loads one of
+the modules that only ``--update`` or ``--serve`` need. The default threshold is
+about half of the roughly 185 ms the import took when it still loaded the
+network stack, well clear of run-to-run noise around the current cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+# Modules that query-only invocations must never import.
+FORBIDDEN_MODULES = ("requests", "urllib3", "bs4", "http.server", "concurrent.futures")
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def import_profile(module: str) -> dict[str, tuple[int, int]]:
+    """Return ``{module: (self_us, cumulative_us)}`` for one fresh interpreter importing ``module``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in completed.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            profile[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return profile
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="eolchecker.eolchecker", help="Module to import (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=20, help="Fresh interpreters to measure (default: %(default)s)")
+    parser.add_argument("--max-ms", type=float, default=100.0, help="Median threshold in ms (default: %(default)s)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list (default: %(default)s)")
+    args = parser.parse_args()
+
+    profiles = [import_profile(args.module) for _ in range(args.runs)]
+    cumulative = [profile[args.module][1] / 1000 for profile in profiles]
+    median = statistics.median(cumulative)
+    print(f"{args.module}: median {median:.1f} ms, min {min(cumulative):.1f} ms over {args.runs} runs")
+
+    slowest = sorted(profiles[-1].items(), key=lambda item: item[1][0], reverse=True)[: args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {self_us / 1000:7.2f} ms self  {cumulative_us / 1000:7.2f} ms cumulative  {name}")
+
+    failures = []
+    loaded = sorted(name for name in FORBIDDEN_MODULES if name in profiles[-1])
+    if loaded:
+        failures.append(f"query-only startup imports {', '.join(loaded)}")
+    if median > args.max_ms:
+        failures.append(f"median import time {median:.1f} ms exceeds {args.max_ms:.1f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,31 @@
 from __future__ import annotations
 
 import argparse
+import csv
+import itertools
+import json
 import logging
+import operator
 import os
 import sys
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date, timedelta
 from pathlib import Path
+from typing import TextIO
 
-from eolchecker.tools import CacheError, Database, Downloader, SourceError
+from eolchecker.models import CacheGeneration, ChangeReport, HardwareLifecycle, SoftwareLifecycle
+from eolchecker.tools import CacheError, Database, SourceError
+from eolchecker.tools.database import DEFAULT_MATCH_THRESHOLD, SoftwareTerm
+from eolchecker.tools.metrics import RefreshMetrics
 
 APP_NAME = "eolchecker"
 APP_VERSION = "0.2.0"
+OUTPUT_FORMATS = ("text", "json", "jsonl", "ndjson", "csv")
+DEFAULT_RETAINED_GENERATIONS = 3
+# Mirrors eolchecker.tools.server.DEFAULT_THREADS, which is not imported here to keep http.server out of queries.
+DEFAULT_SERVER_THREADS = 8
 logger = logging.getLogger(__name__)
+_CSV_COLUMNS = ("type", "query", "name", "version", "manufacturer", "model", "eol")
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -19,7 +33,55 @@ def build_parser() -> argparse.ArgumentParser:
         description=f"{APP_NAME} {APP_VERSION}: query cached software and hardware lifecycle data."
     )
     parser.add_argument("--software", metavar="NAME", help="Search software lifecycle records by product name")
+    parser.add_argument(
+        "--version",
+        metavar="VERSION",
+        help="With --software, resolve an installed VERSION of the exactly named product to its release cycle",
+    )
+    parser.add_argument(
+        "--fuzzy",
+        action="store_true",
+        help="With --software, resolve NAME to the most similar product name, alias or label, such as "
+        "'Microsoft SQL Server 2019' to mssqlserver; a trailing version selects its release cycle",
+    )
+    parser.add_argument(
+        "--min-score",
+        type=_score,
+        default=DEFAULT_MATCH_THRESHOLD,
+        metavar="SCORE",
+        help="Lowest similarity between 0 and 1 that --fuzzy accepts (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="Output format of query results; json, jsonl (ndjson) and csv stream one record per row "
+        "(default: %(default)s)",
+    )
     parser.add_argument("--hardware", metavar="NAME", help="Search hardware lifecycle records by manufacturer or model")
+    parser.add_argument(
+        "--expiring-within",
+        type=_days,
+        metavar="DAYS",
+        help="List software and hardware records whose EOL date falls within the next DAYS days",
+    )
+    parser.add_argument(
+        "--software-file",
+        type=argparse.FileType("r", encoding="utf-8"),
+        metavar="FILE",
+        help="Search every software term in FILE ('-' for stdin); lines are NAME or NAME<TAB>VERSION",
+    )
+    parser.add_argument(
+        "--hardware-file",
+        type=argparse.FileType("r", encoding="utf-8"),
+        metavar="FILE",
+        help="Search every hardware term in FILE ('-' for stdin), one manufacturer or model per line",
+    )
+    parser.add_argument(
+        "--export",
+        action="store_true",
+        help="Write every cached software and hardware record, streamed in the selected --format",
+    )
     parser.add_argument(
         "-u",
         "--update",
@@ -32,6 +94,100 @@ def build_parser() -> argparse.ArgumentParser:
         default=default_cache_path(),
         help="Path to the local SQLite cache (default: %(default)s)",
     )
+    parser.add_argument(
+        "--retain",
+        type=_positive_int,
+        default=DEFAULT_RETAINED_GENERATIONS,
+        metavar="N",
+        help="Number of cache generations kept for --rollback when the cache is replaced (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--list-generations",
+        action="store_true",
+        help="List the retained cache generations, newest first",
+    )
+    parser.add_argument(
+        "--rollback",
+        nargs="?",
+        const="",
+        metavar="GENERATION",
+        help="Reinstall the previous retained cache generation, or the GENERATION named by its ID, "
+        "creation time or hash prefix, without downloading anything",
+    )
+    parser.add_argument(
+        "--export-snapshot",
+        type=Path,
+        metavar="FILE",
+        help="Write the active cache generation to FILE as a compressed, checksummed snapshot for --import-snapshot",
+    )
+    parser.add_argument(
+        "--import-snapshot",
+        metavar="FILE",
+        help="Verify the snapshot in FILE ('-' for stdin) and install it as the active cache, "
+        "without downloading anything",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="With --update, patch only changed rows into the cache and print a change report",
+    )
+    parser.add_argument(
+        "--products",
+        type=_names,
+        metavar="NAMES",
+        help="With --update, refresh only these comma-separated endoflife.date products, such as "
+        "nginx,postgresql, keep every other cached record, and print a change report",
+    )
+    parser.add_argument(
+        "--manufacturers",
+        type=_names,
+        metavar="NAMES",
+        help="With --update, refresh only the hardware pages of these comma-separated manufacturers, such as "
+        "dell,hp, keep every other cached record, and print a change report",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="With --update, print stage timings and per-source byte, record and retry counts",
+    )
+    parser.add_argument(
+        "--metrics-json",
+        type=Path,
+        metavar="FILE",
+        help="With --update, write the refresh metrics to FILE as JSON",
+    )
+    parser.add_argument(
+        "--prometheus-textfile",
+        type=Path,
+        metavar="FILE",
+        help="With --update, write the refresh metrics to FILE for the Prometheus textfile collector",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="Number of hardware source pages fetched concurrently during --update (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Serve lifecycle queries over HTTP/JSON from an in-memory copy of the cache until interrupted",
+    )
+    parser.add_argument(
+        "--bind",
+        default="127.0.0.1",
+        metavar="ADDRESS",
+        help="Address that --serve listens on (default: %(default)s)",
+    )
+    parser.add_argument("--port", type=_port, default=8787, help="Port that --serve listens on (default: %(default)s)")
+    parser.add_argument(
+        "--threads",
+        type=_positive_int,
+        default=DEFAULT_SERVER_THREADS,
+        metavar="N",
+        help="Number of request threads used by --serve (default: %(default)s)",
+    )
     parser.add_argument("--verbose", action="store_true", help="Enable diagnostic logging")
     return parser
 
@@ -41,30 +197,156 @@ def default_cache_path() -> Path:
     return cache_home / APP_NAME / "eol.db"
 
 
+def _positive_int(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as exception:
+        raise argparse.ArgumentTypeError(f"invalid positive integer: {value!r}") from exception
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"invalid positive integer: {value!r}")
+    return number
+
+
+def _days(value: str) -> int:
+    number = _positive_int(value)
+    if number > (date.max - date.today()).days:
+        raise argparse.ArgumentTypeError(f"invalid number of days beyond {date.max.isoformat()}: {value!r}")
+    return number
+
+
+def _port(value: str) -> int:
+    try:
+        number = int(value)
+    except ValueError as exception:
+        raise argparse.ArgumentTypeError(f"invalid port number: {value!r}") from exception
+    if not 0 <= number <= 65535:
+        raise argparse.ArgumentTypeError(f"invalid port number: {value!r}")
+    return number
+
+
+def _names(value: str) -> list[str]:
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    if not names:
+        raise argparse.ArgumentTypeError(f"invalid comma-separated names: {value!r}")
+    return names
+
+
+def _score(value: str) -> float:
+    try:
+        score = float(value)
+    except ValueError as exception:
+        raise argparse.ArgumentTypeError(f"invalid score: {value!r}") from exception
+    if not 0.0 < score <= 1.0:
+        raise argparse.ArgumentTypeError(f"score must be greater than 0 and at most 1: {value!r}")
+    return score
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
-    if not args.update and args.software is None and args.hardware is None:
+    queries = (args.software, args.hardware, args.software_file, args.hardware_file, args.expiring_within)
+    operations = (
+        args.update,
+        args.serve,
+        args.export,
+        args.list_generations,
+        args.rollback is not None,
+        args.export_snapshot,
+        args.import_snapshot,
+    )
+    if not any(operations) and all(query is None for query in queries):
         parser.print_help()
         return 0
+    if args.rollback is not None and args.update:
+        parser.error("--rollback cannot be combined with --update")
+    if args.import_snapshot is not None and (args.update or args.rollback is not None):
+        parser.error("--import-snapshot cannot be combined with --update or --rollback")
+    if args.incremental and not args.update:
+        parser.error("--incremental requires --update")
+    if (args.products is not None or args.manufacturers is not None) and not args.update:
+        parser.error("--products and --manufacturers require --update")
+    if (args.stats or args.metrics_json or args.prometheus_textfile) and not args.update:
+        parser.error("--stats, --metrics-json and --prometheus-textfile require --update")
+    if args.version is not None and args.software is None:
+        parser.error("--version requires --software")
+    if args.fuzzy and args.software is None:
+        parser.error("--fuzzy requires --software")
 
     configure_logging(args.verbose)
-    database = Database(args.cache_path)
+    database = Database(args.cache_path, retain=args.retain)
 
     try:
+        # Status messages must not interleave with machine-readable results on stdout.
+        status = sys.stdout if args.format == "text" else sys.stderr
         if args.update:
-            print("Updating the lifecycle cache. This may take a moment.")
-            with Downloader() as downloader:
-                database.save(
-                    software_list=downloader.get_eol_software(),
-                    hardware_list=downloader.get_eol_hardware(),
+            metrics = RefreshMetrics()
+            try:
+                _update(
+                    database, args.workers, args.incremental, metrics, status, args.products, args.manufacturers
                 )
-            print(f"Updated lifecycle cache: {args.cache_path}")
+                metrics.finish(succeeded=True)
+            finally:
+                if metrics.succeeded is None:
+                    metrics.finish(succeeded=False)
+                _report_metrics(metrics, args.stats, args.metrics_json, args.prometheus_textfile, status)
+            print(f"Updated lifecycle cache: {args.cache_path}", file=status)
+        if args.import_snapshot is not None:
+            source = sys.stdin.buffer if args.import_snapshot == "-" else Path(args.import_snapshot)
+            manifest = database.import_snapshot(source)
+            print(
+                f"Imported snapshot with {manifest.software_records} software and {manifest.hardware_records} "
+                f"hardware records into {args.cache_path}",
+                file=status,
+            )
+        if args.rollback is not None:
+            generation = database.rollback(args.rollback or None)
+            print(f"Rolled back lifecycle cache {args.cache_path} to generation {generation.id}", file=status)
+        if args.export_snapshot is not None:
+            manifest = database.export_snapshot(args.export_snapshot)
+            print(
+                f"Exported snapshot of {manifest.software_records} software and {manifest.hardware_records} "
+                f"hardware records to {args.export_snapshot} (generation sha256 {manifest.sha256})",
+                file=status,
+            )
+        if args.list_generations:
+            _print_generations(database.list_generations(), status)
 
-        if args.software is not None:
-            _print_software_results(database.search_software(args.software))
+        writer = _ResultWriter(args.format, sys.stdout)
+        if args.software is not None and args.fuzzy:
+            _write_fuzzy_software(database, writer, args.software, args.version, args.min_score, status)
+        elif args.software is not None and args.version is not None:
+            release = database.find_software_release(args.software, args.version)
+            writer.software(_software_rows([release] if release is not None else []), args.software)
+        elif args.software is not None:
+            writer.software(database.search_software_rows(args.software), args.software)
         if args.hardware is not None:
-            _print_hardware_results(database.search_hardware(args.hardware))
+            writer.hardware(database.search_hardware_rows(args.hardware), args.hardware)
+        if args.expiring_within is not None:
+            today = date.today()
+            software_records, hardware_records = database.expiring_before(
+                today + timedelta(days=args.expiring_within), since=today
+            )
+            writer.software(_software_rows(software_records))
+            writer.hardware(_hardware_rows(hardware_records))
+        if args.software_file is not None:
+            software_results = database.search_software_many(_read_software_terms(args.software_file))
+            for term, software_records in software_results.items():
+                label = " ".join(term) if isinstance(term, tuple) else term
+                writer.heading(label)
+                writer.software(_software_rows(software_records), label)
+        if args.hardware_file is not None:
+            hardware_results = database.search_hardware_many(_read_terms(args.hardware_file))
+            for hardware_term, hardware_records in hardware_results.items():
+                writer.heading(hardware_term)
+                writer.hardware(_hardware_rows(hardware_records), hardware_term)
+        if args.export:
+            # Both tables are read through one connection, so a concurrent refresh cannot mix generations.
+            write_rows = {"software": writer.software, "hardware": writer.hardware}
+            for table, rows in itertools.groupby(database.export_rows(), key=operator.itemgetter(0)):
+                write_rows[table](row[:3] for _, row in rows)
+        writer.close()
+        if args.serve:
+            return _serve(args.cache_path, args.bind, args.port, args.threads)
     except (CacheError, SourceError) as exception:
         logger.error("Lifecycle operation failed: %s", exception)
         print(f"ERROR: {exception}", file=sys.stderr)
@@ -72,6 +354,10 @@ def main(argv: Sequence[str] | None = None) -> int:
     except KeyboardInterrupt:
         print("Cancelled by user.", file=sys.stderr)
         return 130
+    except BrokenPipeError:
+        # The consumer of the results exited early, as with `| head`; keep the interpreter from flushing again.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
 
     return 0
 
@@ -83,6 +369,206 @@ def configure_logging(verbose: bool) -> None:
     )
 
 
+def _update(
+    database: Database,
+    workers: int,
+    incremental: bool,
+    metrics: RefreshMetrics,
+    status: TextIO,
+    products: list[str] | None = None,
+    manufacturers: list[str] | None = None,
+) -> None:
+    # Imported here so that query-only invocations never load the HTTP client and HTML parsing stacks.
+    from eolchecker.tools.downloader import Downloader
+
+    print("Updating the lifecycle cache. This may take a moment.", file=status)
+    with Downloader(max_workers=workers, cache=database, metrics=metrics) as downloader:
+        if products is not None or manufacturers is not None:
+            # Only the selected sources are retrieved; the rest of the cache is carried over unchanged.
+            software_list, hardware_list = downloader.get_eol_columns(products or [], manufacturers or [])
+            report = database.save_selective(
+                software_list=software_list,
+                hardware_list=hardware_list,
+                validators=downloader.validators,
+                metrics=metrics,
+                product_names=downloader.product_names,
+            )
+            _print_change_report(report, status)
+            return
+        # Both datasets are retrieved concurrently and collected in full, so the feed is not streamed into the build.
+        software_list, hardware_list = downloader.get_eol_columns()
+        if incremental:
+            report = database.save_incremental(
+                software_list=software_list,
+                hardware_list=hardware_list,
+                validators=downloader.validators,
+                metrics=metrics,
+                product_names=downloader.product_names,
+            )
+            _print_change_report(report, status)
+        else:
+            database.save(
+                software_list=software_list,
+                hardware_list=hardware_list,
+                validators=downloader.validators,
+                metrics=metrics,
+                product_names=downloader.product_names,
+            )
+
+
+def _write_fuzzy_software(
+    database: Database, writer: _ResultWriter, name: str, version: str | None, threshold: float, status: TextIO
+) -> None:
+    matches = database.match_products(name, threshold, limit=1)
+    if not matches:
+        print(f"No product name resembles {name!r}.", file=status)
+        writer.software(iter(()), name)
+        return
+    match = matches[0]
+    print(f"Matched {name!r} to {match}", file=status)
+    version = version or match.version
+    if version is not None:
+        release = database.find_software_release(match.product, version)
+        writer.software(_software_rows([release] if release is not None else []), name)
+    else:
+        rows = database.search_software_rows(match.product)
+        writer.software((row for row in rows if row[0] == match.product), name)
+
+
+def _report_metrics(
+    metrics: RefreshMetrics,
+    stats: bool,
+    json_path: Path | None,
+    prometheus_path: Path | None,
+    status: TextIO,
+) -> None:
+    if stats:
+        print(metrics.summary(), file=status)
+    try:
+        if json_path is not None:
+            metrics.write_json(json_path)
+        if prometheus_path is not None:
+            metrics.write_prometheus_textfile(prometheus_path)
+    except OSError as exception:
+        logger.warning("Could not write refresh metrics: %s", exception)
+
+
+def _serve(cache_path: Path, host: str, port: int, threads: int) -> int:
+    from eolchecker.tools.resultcache import ResultCache
+    from eolchecker.tools.server import LifecycleServer
+
+    database = Database(cache_path, in_memory=True, result_cache=ResultCache())
+    try:
+        server = LifecycleServer((host, port), database, threads=threads)
+    except OSError as exception:
+        logger.error("Could not start the query service: %s", exception)
+        print(f"ERROR: Could not listen on {host}:{port}: {exception}", file=sys.stderr)
+        return 3
+    with server:
+        print(f"Serving lifecycle queries on {server.url} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("Stopped serving.")
+        finally:
+            server.database.close()
+    return 0
+
+
+def _read_terms(stream: TextIO) -> Iterator[str]:
+    with stream:
+        for line in stream:
+            term = line.strip()
+            if term and not term.startswith("#"):
+                yield term
+
+
+def _read_software_terms(stream: TextIO) -> Iterator[SoftwareTerm]:
+    for term in _read_terms(stream):
+        name, separator, version = term.partition("\t")
+        yield (name.strip(), version.strip()) if separator and version.strip() else name.strip()
+
+
+class _ResultWriter:
+    """Print query results as text banners, or stream them as JSON, JSON Lines, or CSV records.
+
+    Structured formats write one record per row as rows arrive and never build
+    the result list, so a large result set is written in constant memory.
+    """
+
+    def __init__(self, output_format: str, stream: TextIO) -> None:
+        self._format = "jsonl" if output_format == "ndjson" else output_format
+        self._stream = stream
+        self._written = 0
+        self._csv = csv.writer(stream, lineterminator="\n") if self._format == "csv" else None
+        if self._csv is not None:
+            self._csv.writerow(_CSV_COLUMNS)
+        elif self._format == "json":
+            stream.write("[")
+
+    def heading(self, label: str) -> None:
+        if self._format == "text":
+            print(f"== {label} ==", file=self._stream)
+
+    def software(self, rows: Iterable[tuple[str, str, str]], query: str | None = None) -> None:
+        if self._format == "text":
+            _print_software_results([SoftwareLifecycle(name=row[0], version=row[1], eol=row[2]) for row in rows])
+            return
+        for name, version, eol in rows:
+            self._write({"type": "software", "query": query, "name": name, "version": version, "eol": eol})
+        self._stream.flush()
+
+    def hardware(self, rows: Iterable[tuple[str, str, str]], query: str | None = None) -> None:
+        if self._format == "text":
+            _print_hardware_results(
+                [HardwareLifecycle(manufacturer=row[0], model=row[1], eol=row[2]) for row in rows]
+            )
+            return
+        for manufacturer, model, eol in rows:
+            self._write({"type": "hardware", "query": query, "manufacturer": manufacturer, "model": model, "eol": eol})
+        self._stream.flush()
+
+    def close(self) -> None:
+        if self._format == "json":
+            self._stream.write("\n]\n" if self._written else "]\n")
+        self._stream.flush()
+
+    def _write(self, record: dict[str, str | None]) -> None:
+        if self._csv is not None:
+            self._csv.writerow([record.get(column) or "" for column in _CSV_COLUMNS])
+        elif self._format == "json":
+            self._stream.write(("," if self._written else "") + "\n" + json.dumps(record, ensure_ascii=False))
+        else:
+            self._stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._written += 1
+
+
+def _software_rows(records: Iterable[SoftwareLifecycle]) -> Iterator[tuple[str, str, str]]:
+    return ((record.name, record.version, record.eol) for record in records)
+
+
+def _hardware_rows(records: Iterable[HardwareLifecycle]) -> Iterator[tuple[str, str, str]]:
+    return ((record.manufacturer, record.model, record.eol) for record in records)
+
+
+def _print_generations(generations: Sequence[CacheGeneration], stream: TextIO) -> None:
+    if not generations:
+        print("No cache generations are retained.", file=stream)
+        return
+    for generation in generations:
+        print(generation, file=stream)
+
+
+def _print_change_report(report: ChangeReport, stream: TextIO) -> None:
+    print(f"Changes: {report}", file=stream)
+    for record in report.added:
+        print(f"+ {record}", file=stream)
+    for record in report.removed:
+        print(f"- {record}", file=stream)
+    for change in report.changed:
+        print(f"~ {change}", file=stream)
+
+
 def _print_software_results(records: Sequence[object]) -> None:
     if not records:
         print("No software matches found.")
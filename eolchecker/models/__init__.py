@@ -1,4 +1,26 @@
+from eolchecker.models.cacheGeneration import CacheGeneration
+from eolchecker.models.changeReport import ChangeReport, EolChange, LifecycleRecord
 from eolchecker.models.hardwareLifecycle import HardwareLifecycle
+from eolchecker.models.lifecycleColumns import HardwareColumns, HardwareRow, SoftwareColumns, SoftwareRow
+from eolchecker.models.productMatch import ProductMatch
+from eolchecker.models.recordPage import RecordPage
+from eolchecker.models.snapshotManifest import SnapshotManifest
 from eolchecker.models.softwareLifecycle import SoftwareLifecycle
+from eolchecker.models.sourceValidator import SourceValidator
 
-__all__ = ["HardwareLifecycle", "SoftwareLifecycle"]
+__all__ = [
+    "CacheGeneration",
+    "ChangeReport",
+    "EolChange",
+    "HardwareColumns",
+    "HardwareLifecycle",
+    "HardwareRow",
+    "LifecycleRecord",
+    "ProductMatch",
+    "RecordPage",
+    "SnapshotManifest",
+    "SoftwareColumns",
+    "SoftwareLifecycle",
+    "SoftwareRow",
+    "SourceValidator",
+]
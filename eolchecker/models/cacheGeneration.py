@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+
+@dataclass(frozen=True, slots=True)
+class CacheGeneration:
+    """A retained cache generation file, identified by its creation time and content hash."""
+
+    id: str
+    created: datetime
+    sha256: str
+    path: Path
+    active: bool = False
+
+    def __str__(self) -> str:
+        marker = "  (active)" if self.active else ""
+        return f"{self.id}  {self.created:%Y-%m-%d %H:%M:%S} UTC{marker}"
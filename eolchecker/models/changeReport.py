@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from eolchecker.models.hardwareLifecycle import HardwareLifecycle
+from eolchecker.models.softwareLifecycle import SoftwareLifecycle
+
+LifecycleRecord = SoftwareLifecycle | HardwareLifecycle
+
+
+@dataclass(frozen=True, slots=True)
+class EolChange:
+    """A record whose EOL value differs between two cache generations."""
+
+    previous: LifecycleRecord
+    current: LifecycleRecord
+
+    def __str__(self) -> str:
+        return f"{self.previous}  ->  {self.current.eol}"
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeReport:
+    """The records that a cache refresh added, removed, or changed.
+
+    ``rebuilt`` is set when the previous generation could not be compared, in
+    which case the report lists no individual changes.
+    """
+
+    added: tuple[LifecycleRecord, ...] = ()
+    removed: tuple[LifecycleRecord, ...] = ()
+    changed: tuple[EolChange, ...] = ()
+    rebuilt: bool = False
+
+    def __str__(self) -> str:
+        if self.rebuilt:
+            return "Rebuilt the whole cache; no change report is available"
+        return f"{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} EOL values changed"
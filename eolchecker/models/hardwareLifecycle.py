@@ -1,17 +1,22 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
-from dataclasses import dataclass
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
 from typing import Any
 
 
 @dataclass(frozen=True, slots=True)
 class HardwareLifecycle:
-    """A validated hardware lifecycle record."""
+    """A validated hardware lifecycle record.
+
+    ``source`` identifies the page the record was parsed from. It is provenance
+    only and does not take part in equality.
+    """
 
     manufacturer: str
     model: str
     eol: str
+    source: str = field(default="", compare=False, repr=False)
 
     def __post_init__(self) -> None:
         if not self.manufacturer.strip():
@@ -25,31 +30,47 @@ class HardwareLifecycle:
         return f"{self.manufacturer}, {self.model}: {self.eol}"
 
     @classmethod
-    def from_dict(cls, values: Mapping[str, Any]) -> HardwareLifecycle:
+    def from_dict(cls, values: Mapping[str, Any], source: str = "") -> HardwareLifecycle:
         """Create a record from normalized or legacy hardware source columns."""
-        manufacturer = cls._required_value(values, "manufacturer", "manuf.")
-        model = cls._required_value(values, "model")
+        positions = {key: index for index, key in enumerate(values)}
+        return cls(*cls.row_from_cells(list(values.values()), positions, source))
+
+    @classmethod
+    def row_from_cells(
+        cls, cells: Sequence[Any], positions: Mapping[str, int], source: str = ""
+    ) -> tuple[str, str, str, str]:
+        """Return the values of a table row whose column names map to cell ``positions``, as ``from_dict()`` reads them.
+
+        Missing required fields raise ``ValueError``; the values are not
+        validated otherwise.
+        """
+        manufacturer = cls._required_value(cells, positions, "manufacturer", "manuf.")
+        model = cls._required_value(cells, positions, "model")
         raw_eol = cls._optional_value(
-            values,
+            cells,
+            positions,
             "end_of_manufacturer_support",
             "end of manufacturer support (some dates may be estimated)",
             "end_of_service_life",
             "end-of-service-life",
         )
         eol = "unknown" if raw_eol.casefold() in {"unknown", "noch unbekannt", "unbekannt"} else raw_eol
-        return cls(manufacturer=manufacturer, model=model, eol=eol)
+        return manufacturer, model, eol, source
 
     @staticmethod
-    def _required_value(values: Mapping[str, Any], *keys: str) -> str:
-        value = HardwareLifecycle._optional_value(values, *keys)
+    def _required_value(cells: Sequence[Any], positions: Mapping[str, int], *keys: str) -> str:
+        value = HardwareLifecycle._optional_value(cells, positions, *keys)
         if value == "unknown":
             raise ValueError(f"Hardware source is missing required field {keys[0]!r}")
         return value
 
     @staticmethod
-    def _optional_value(values: Mapping[str, Any], *keys: str) -> str:
+    def _optional_value(cells: Sequence[Any], positions: Mapping[str, int], *keys: str) -> str:
         for key in keys:
-            value = values.get(key)
+            position = positions.get(key)
+            if position is None:
+                continue
+            value = cells[position]
             if value is not None and str(value).strip():
                 return str(value).strip()
         return "unknown"
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+
+from eolchecker.models.hardwareLifecycle import HardwareLifecycle
+from eolchecker.models.softwareLifecycle import SoftwareLifecycle
+
+SoftwareRow = tuple[str, str, str]
+HardwareRow = tuple[str, str, str, str]
+
+
+@dataclass(frozen=True, slots=True)
+class SoftwareColumns:
+    """Software lifecycle records stored column by column for bulk loading.
+
+    The values are validated like ``SoftwareLifecycle`` when the columns are
+    created, one column at a time instead of one record at a time.
+    """
+
+    names: tuple[str, ...] = ()
+    versions: tuple[str, ...] = ()
+    eols: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if not len(self.names) == len(self.versions) == len(self.eols):
+            raise ValueError("Software lifecycle columns must have equal lengths")
+        _require_values(self.names, "Software lifecycle name must not be empty")
+        _require_values(self.versions, "Software lifecycle version must not be empty")
+        _require_values(self.eols, "Software lifecycle EOL value must not be empty")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rows(self) -> Iterator[SoftwareRow]:
+        return zip(self.names, self.versions, self.eols, strict=True)
+
+    def records(self) -> list[SoftwareLifecycle]:
+        return [SoftwareLifecycle(name, version, eol) for name, version, eol in self.rows()]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[SoftwareRow]) -> SoftwareColumns:
+        # Rows are consumed one at a time, so a generator of rows is never held in memory as a whole.
+        names: list[str] = []
+        versions: list[str] = []
+        eols: list[str] = []
+        for name, version, eol in rows:
+            names.append(name)
+            versions.append(version)
+            eols.append(eol)
+        return cls(tuple(names), tuple(versions), tuple(eols))
+
+    @classmethod
+    def from_records(cls, records: Iterable[SoftwareLifecycle]) -> SoftwareColumns:
+        return cls.from_rows((record.name, record.version, record.eol) for record in records)
+
+
+@dataclass(frozen=True, slots=True)
+class HardwareColumns:
+    """Hardware lifecycle records stored column by column for bulk loading.
+
+    The values are validated like ``HardwareLifecycle`` when the columns are
+    created, one column at a time instead of one record at a time.
+    """
+
+    manufacturers: tuple[str, ...] = ()
+    models: tuple[str, ...] = ()
+    eols: tuple[str, ...] = ()
+    sources: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if not len(self.manufacturers) == len(self.models) == len(self.eols) == len(self.sources):
+            raise ValueError("Hardware lifecycle columns must have equal lengths")
+        _require_values(self.manufacturers, "Hardware manufacturer must not be empty")
+        _require_values(self.models, "Hardware model must not be empty")
+        _require_values(self.eols, "Hardware EOL value must not be empty")
+        if not all(isinstance(source, str) for source in self.sources):
+            raise ValueError("Hardware source must be text")
+
+    def __len__(self) -> int:
+        return len(self.manufacturers)
+
+    def rows(self) -> Iterator[HardwareRow]:
+        return zip(self.manufacturers, self.models, self.eols, self.sources, strict=True)
+
+    def records(self) -> list[HardwareLifecycle]:
+        return [
+            HardwareLifecycle(manufacturer, model, eol, source) for manufacturer, model, eol, source in self.rows()
+        ]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[HardwareRow]) -> HardwareColumns:
+        manufacturers: list[str] = []
+        models: list[str] = []
+        eols: list[str] = []
+        sources: list[str] = []
+        for manufacturer, model, eol, source in rows:
+            manufacturers.append(manufacturer)
+            models.append(model)
+            eols.append(eol)
+            sources.append(source)
+        return cls(tuple(manufacturers), tuple(models), tuple(eols), tuple(sources))
+
+    @classmethod
+    def from_records(cls, records: Iterable[HardwareLifecycle]) -> HardwareColumns:
+        return cls.from_rows((record.manufacturer, record.model, record.eol, record.source) for record in records)
+
+
+def _require_values(values: Sequence[str], message: str) -> None:
+    try:
+        # str.strip rejects values of other types, so one pass checks both type and content.
+        present = all(map(str.strip, values))
+    except TypeError as exception:
+        raise ValueError(message) from exception
+    if not present:
+        raise ValueError(message)
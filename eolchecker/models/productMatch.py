@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class ProductMatch:
+    """A software product ranked by how closely one of its names matches a queried name."""
+
+    product: str
+    score: float
+    matched: str
+    version: str | None = None
+
+    def __post_init__(self) -> None:
+        if not 0.0 <= self.score <= 1.0:
+            raise ValueError("Product match score must be between 0 and 1")
+
+    def __str__(self) -> str:
+        via = f" via {self.matched!r}" if self.matched != self.product else ""
+        return f"{self.product} ({self.score:.2f}{via})"
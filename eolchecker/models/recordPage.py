@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from eolchecker.models.hardwareLifecycle import HardwareLifecycle
+from eolchecker.models.softwareLifecycle import SoftwareLifecycle
+
+RecordT = TypeVar("RecordT", SoftwareLifecycle, HardwareLifecycle)
+
+
+@dataclass(frozen=True, slots=True)
+class RecordPage(Generic[RecordT]):
+    """One keyset page of records and the opaque cursor that continues behind it.
+
+    ``cursor`` is ``None`` on the last page.
+    """
+
+    records: tuple[RecordT, ...] = ()
+    cursor: str | None = None
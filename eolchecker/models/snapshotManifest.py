@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from eolchecker.models.sourceValidator import SourceValidator
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotManifest:
+    """The description of a cache generation stored in a portable snapshot."""
+
+    format: int
+    schema_version: str
+    created: datetime
+    sha256: str
+    size: int
+    software_records: int
+    hardware_records: int
+    sources: tuple[SourceValidator, ...] = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "format": self.format,
+            "schema_version": self.schema_version,
+            "created": self.created.isoformat(),
+            "sha256": self.sha256,
+            "size": self.size,
+            "software_records": self.software_records,
+            "hardware_records": self.hardware_records,
+            "sources": [
+                {"url": source.url, "etag": source.etag, "last_modified": source.last_modified}
+                for source in self.sources
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, values: Mapping[str, Any]) -> SnapshotManifest:
+        """Create a manifest from its ``to_dict()`` form, raising ``ValueError`` for invalid values."""
+        try:
+            manifest = cls(
+                format=_integer(values["format"]),
+                schema_version=str(values["schema_version"]),
+                created=datetime.fromisoformat(str(values["created"])),
+                sha256=str(values["sha256"]).casefold(),
+                size=_integer(values["size"]),
+                software_records=_integer(values["software_records"]),
+                hardware_records=_integer(values["hardware_records"]),
+                sources=tuple(
+                    SourceValidator(str(source["url"]), source.get("etag"), source.get("last_modified"))
+                    for source in values.get("sources", ())
+                ),
+            )
+        except (KeyError, TypeError, AttributeError) as exception:
+            raise ValueError(f"Snapshot manifest is incomplete: {exception}") from exception
+        if len(manifest.sha256) != 64 or any(character not in "0123456789abcdef" for character in manifest.sha256):
+            raise ValueError("Snapshot manifest contains an invalid SHA-256 digest")
+        return manifest
+
+
+def _integer(value: object) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"Snapshot manifest contains an invalid count {value!r}")
+    return value
@@ -29,7 +29,12 @@ class SoftwareLifecycle:
         cls, product_name: str, release: Mapping[str, Any]
     ) -> SoftwareLifecycle:
         """Create a lifecycle record from an endoflife.date v1 release object."""
+        return cls(*cls.v1_release_row(product_name, release))
+
+    @staticmethod
+    def v1_release_row(product_name: str, release: Mapping[str, Any]) -> tuple[str, str, str]:
+        """Return the name, version and EOL value of a v1 release object without validating them."""
         version = str(release.get("name") or release.get("label") or "").strip()
         eol_value = release.get("eolFrom")
         eol = "unknown" if eol_value in (None, "") else str(eol_value).strip()
-        return cls(name=product_name.strip(), version=version, eol=eol)
+        return product_name.strip(), version, eol
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class SourceValidator:
+    """HTTP cache validators recorded for an upstream source URL."""
+
+    url: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def __post_init__(self) -> None:
+        if not self.url.strip():
+            raise ValueError("Source validator URL must not be empty")
+
+    def request_headers(self) -> dict[str, str]:
+        """Return the conditional request headers for revalidating the source."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    @classmethod
+    def from_headers(cls, url: str, headers: Mapping[str, str]) -> SourceValidator | None:
+        """Create a validator from response headers, or ``None`` when the source provides none."""
+        etag = headers.get("ETag") or None
+        last_modified = headers.get("Last-Modified") or None
+        if etag is None and last_modified is None:
+            return None
+        return cls(url=url, etag=etag, last_modified=last_modified)
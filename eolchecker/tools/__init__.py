@@ -1,4 +1,21 @@
-from eolchecker.tools.database import CacheError, Database
-from eolchecker.tools.downloader import Downloader, SourceError
+from __future__ import annotations
 
-__all__ = ["CacheError", "Database", "Downloader", "SourceError"]
+from typing import TYPE_CHECKING, Any
+
+from eolchecker.tools.database import Database
+from eolchecker.tools.errors import CacheError, SourceError
+from eolchecker.tools.resultcache import ResultCache, ResultCacheStats
+
+if TYPE_CHECKING:
+    from eolchecker.tools.downloader import Downloader
+
+__all__ = ["CacheError", "Database", "Downloader", "ResultCache", "ResultCacheStats", "SourceError"]
+
+
+def __getattr__(name: str) -> Any:
+    # The downloader pulls in requests and the HTML parsers, which query-only callers never need.
+    if name == "Downloader":
+        from eolchecker.tools.downloader import Downloader
+
+        return Downloader
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
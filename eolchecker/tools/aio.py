@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, TypeVar
+
+from ..models import HardwareColumns, HardwareLifecycle, ProductMatch, SoftwareColumns, SoftwareLifecycle
+from .database import DEFAULT_MATCH_THRESHOLD, Database, SoftwareTerm
+from .errors import CacheError, SourceError
+from .resultcache import ResultCache
+
+if TYPE_CHECKING:
+    from .downloader import Downloader
+
+ResultT = TypeVar("ResultT")
+
+DEFAULT_READERS: Final[int] = 4
+
+
+class AsyncDatabase:
+    """An asyncio facade over ``Database`` that runs queries on a dedicated pool of reader threads.
+
+    Each of the ``readers`` threads keeps its own pooled connection, so at most
+    that many queries run at once however many coroutines await results;
+    further queries wait in the pool's queue without blocking the event loop.
+    A query that exceeds ``deadline`` seconds raises ``CacheError``. A cancelled
+    or timed-out query that has not started yet is dropped; one that has
+    started finishes in its thread and its result is discarded.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        readers: int = DEFAULT_READERS,
+        deadline: float | None = None,
+        in_memory: bool = False,
+        result_cache: ResultCache | None = None,
+    ) -> None:
+        if readers < 1:
+            raise ValueError("readers must be at least 1")
+        self.database = Database(path, persistent=True, in_memory=in_memory, result_cache=result_cache)
+        self._deadline = deadline
+        self._executor = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="eolchecker-reader")
+
+    async def __aenter__(self) -> AsyncDatabase:
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Stop the reader threads once their queries finish and close their connections."""
+        await asyncio.to_thread(functools.partial(self._executor.shutdown, wait=True, cancel_futures=True))
+        self.database.close()
+
+    async def search_software(self, software_name: str) -> list[SoftwareLifecycle]:
+        return await self._run(self.database.search_software, software_name)
+
+    async def search_hardware(self, hardware_name: str) -> list[HardwareLifecycle]:
+        return await self._run(self.database.search_hardware, hardware_name)
+
+    async def find_software_release(self, software_name: str, version: str) -> SoftwareLifecycle | None:
+        return await self._run(self.database.find_software_release, software_name, version)
+
+    async def expiring_before(
+        self, cutoff: date, since: date | None = None
+    ) -> tuple[list[SoftwareLifecycle], list[HardwareLifecycle]]:
+        return await self._run(self.database.expiring_before, cutoff, since)
+
+    async def search_software_many(
+        self, terms: Iterable[SoftwareTerm]
+    ) -> dict[SoftwareTerm, list[SoftwareLifecycle]]:
+        return await self._run(self.database.search_software_many, list(terms))
+
+    async def search_hardware_many(self, terms: Iterable[str]) -> dict[str, list[HardwareLifecycle]]:
+        return await self._run(self.database.search_hardware_many, list(terms))
+
+    async def match_products(
+        self, name: str, threshold: float = DEFAULT_MATCH_THRESHOLD, limit: int = 5
+    ) -> list[ProductMatch]:
+        return await self._run(self.database.match_products, name, threshold, limit)
+
+    async def _run(self, function: Callable[..., ResultT], *arguments: Any) -> ResultT:
+        future = asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(function, *arguments))
+        try:
+            return await asyncio.wait_for(future, self._deadline)
+        except asyncio.TimeoutError as exception:
+            raise CacheError(f"Cache query timed out after {self._deadline} seconds") from exception
+
+
+class AsyncDownloader:
+    """An asyncio facade over ``Downloader`` that retrieves sources on dedicated threads.
+
+    Records are validated exactly as by ``Downloader``, whose ``requests``
+    session keeps a bounded pool of HTTP connections. ``options``, including
+    the per-request ``timeout``, are passed to ``Downloader``. When a call is
+    cancelled or exceeds ``deadline`` seconds, its retrievals stop at their
+    next request or streamed chunk before the cancellation, or a
+    ``SourceError`` for the deadline, is raised; concurrent calls continue.
+    """
+
+    def __init__(self, deadline: float | None = None, **options: Any) -> None:
+        # Imported here so that query-only users of this module never import the HTTP client stack.
+        from .downloader import Downloader
+
+        self.downloader: Downloader = Downloader(**options)
+        self._deadline = deadline
+        self._executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="eolchecker-download")
+
+    async def __aenter__(self) -> AsyncDownloader:
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        self.downloader.cancel()
+        await asyncio.to_thread(functools.partial(self._executor.shutdown, wait=True, cancel_futures=True))
+        self.downloader.close()
+
+    async def get_eol_software(self) -> list[SoftwareLifecycle]:
+        return await self._run(self.downloader.get_eol_software)
+
+    async def get_eol_hardware(self) -> list[HardwareLifecycle]:
+        return await self._run(self.downloader.get_eol_hardware)
+
+    async def get_eol_datasets(self) -> tuple[list[SoftwareLifecycle], list[HardwareLifecycle]]:
+        """Retrieve both datasets concurrently, with the cancellation semantics of ``Downloader``."""
+        return await self._run(self.downloader.get_eol_datasets)
+
+    async def get_eol_columns(self) -> tuple[SoftwareColumns, HardwareColumns]:
+        """Retrieve both datasets concurrently as columns, ready for ``Database.save()``."""
+        return await self._run(self.downloader.get_eol_columns)
+
+    async def _run(self, function: Callable[[], ResultT]) -> ResultT:
+        # Each call stops only its own retrievals; other calls on the shared downloader continue.
+        cancelled = threading.Event()
+        retrieval = self._executor.submit(self.downloader.run_cancellable, cancelled, function)
+        future = asyncio.wrap_future(retrieval)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self._deadline)
+        except (asyncio.CancelledError, asyncio.TimeoutError) as exception:
+            if not retrieval.cancel():
+                # Wait for the threads to stop so that no request outlives the call.
+                cancelled.set()
+                with contextlib.suppress(Exception):
+                    await future
+            if isinstance(exception, asyncio.TimeoutError):
+                raise SourceError(f"Source retrieval timed out after {self._deadline} seconds") from exception
+            raise
@@ -1,41 +1,794 @@
 from __future__ import annotations
 
+import base64
+import contextlib
+import functools
+import hashlib
+import json
 import logging
 import os
+import re
+import shutil
 import sqlite3
+import stat
+import string
 import tempfile
-from collections.abc import Sequence
+import threading
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Generator, Hashable, Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
 from pathlib import Path
+from typing import Any, BinaryIO, Final, TypeVar
 
-from ..models import HardwareLifecycle, SoftwareLifecycle
+from ..models import (
+    CacheGeneration,
+    ChangeReport,
+    EolChange,
+    HardwareColumns,
+    HardwareLifecycle,
+    LifecycleRecord,
+    ProductMatch,
+    RecordPage,
+    SnapshotManifest,
+    SoftwareColumns,
+    SoftwareLifecycle,
+    SourceValidator,
+)
+from .errors import CacheError
+from .metrics import CACHE_SOURCE, RefreshMetrics
+from .normalization import (
+    parse_eol_date,
+    product_key,
+    split_product_version,
+    trigrams,
+    version_key,
+    version_key_prefixes,
+)
+from .resultcache import ResultCache
 
 logger = logging.getLogger(__name__)
+SoftwareTerm = str | tuple[str, str]
+ResultT = TypeVar("ResultT")
+GenerationId = tuple[int, int, int, int]
 
+# Bumped whenever the generation layout changes; incremental refreshes only patch matching generations.
+_SCHEMA_VERSION: Final[str] = "2"
+_SOFTWARE_COLUMNS: Final[tuple[str, ...]] = ("name", "version", "eol", "version_key", "eol_date", "eol_precision")
+_HARDWARE_COLUMNS: Final[tuple[str, ...]] = ("manufacturer", "model", "eol", "source", "eol_date", "eol_precision")
+# Leading columns that identify a row when generations are compared, and the subset that keys an EOL change.
+_SOFTWARE_IDENTITY: Final[int] = 3
+_HARDWARE_IDENTITY: Final[int] = 4
+_SEARCH_COLUMNS: Final[Mapping[str, tuple[str, ...]]] = {"software": ("name",), "hardware": ("manufacturer", "model")}
+# Applied to the private temporary file of a generation build only. A crash mid-build leaves a file that is never
+# installed, so the build skips journaling and syncing; _replace_generation fsyncs the finished file instead.
+_BULK_LOAD_PRAGMAS: Final[tuple[str, ...]] = (
+    "journal_mode = OFF",
+    "synchronous = OFF",
+    "cache_size = -65536",
+    "mmap_size = 268435456",
+    "temp_store = MEMORY",
+)
 
-class CacheError(RuntimeError):
-    """Raised when the lifecycle cache cannot be read or safely replaced."""
+DEFAULT_MATCH_THRESHOLD: Final[float] = 0.3
+# Retained generation files are named "<UTC creation time>-<SHA-256 of the content>.db".
+_GENERATION_FILE: Final = re.compile(r"(?P<created>\d{8}T\d{12}Z)-(?P<sha256>[0-9a-f]{64})\.db")
+_GENERATION_TIME_FORMAT: Final[str] = "%Y%m%dT%H%M%S%fZ"
+_ASCII_LOWERCASE: Final[dict[int, int]] = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Substring filters keyed by whether the generation has FTS5 trigram search tables.
+_SOFTWARE_FILTERS: Final[Mapping[bool, str]] = {
+    False: "software.name LIKE {pattern}",
+    True: "software.rowid IN (SELECT rowid FROM software_search WHERE name LIKE {pattern})",
+}
+_HARDWARE_FILTERS: Final[Mapping[bool, str]] = {
+    False: "(hardware.manufacturer LIKE {pattern} OR hardware.model LIKE {pattern})",
+    True: """hardware.rowid IN (
+        SELECT rowid FROM hardware_search WHERE manufacturer LIKE {pattern}
+        UNION SELECT rowid FROM hardware_search WHERE model LIKE {pattern}
+    )""",
+}
+# Selected columns, substring filters and their pattern count of the tables that iterators read in keyset order.
+_ORDERED_COLUMNS: Final[Mapping[str, tuple[tuple[str, ...], Mapping[bool, str], int]]] = {
+    "software": (("name", "version", "eol"), _SOFTWARE_FILTERS, 1),
+    "hardware": (("manufacturer", "model", "eol", "source"), _HARDWARE_FILTERS, 2),
+}
+
+
+@dataclass(slots=True)
+class _PooledReader:
+    connection: sqlite3.Connection
+    identity: GenerationId
+    epoch: int
+    search_index: bool
+    # Readers, such as unfinished streams, using the connection; a released connection is closed by the last one.
+    users: int = 0
+    released: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class _Snapshot:
+    connection: sqlite3.Connection
+    identity: GenerationId
+    uri: str
 
 
 class Database:
-    """A SQLite-backed lifecycle cache with atomic refresh semantics."""
+    """A SQLite-backed lifecycle cache with atomic refresh semantics.
+
+    By default every query opens and closes its own read-only connection. With
+    ``persistent=True`` each thread keeps one read-only connection with a large
+    statement cache, and reopens it when ``save()`` or another process replaces
+    the cache file. Call ``close()``, or use the database as a context manager,
+    to release pooled connections.
+
+    ``in_memory=True`` implies ``persistent=True`` and serves queries from an
+    in-memory copy of the active generation instead. The file is read once per
+    generation into one shared-cache in-memory database that every thread
+    queries through its own connection, so a long-running process holds a
+    single copy and picks up a replaced cache without sharing a connection
+    between threads.
+
+    With a ``result_cache``, the results of ``search_software()``,
+    ``search_hardware()``, ``find_software_release()`` and ``expiring_before()``
+    are kept per generation of the cache file, so repeated queries cost one
+    ``stat()`` call and no SQLite work until ``save()`` or another process
+    replaces the file. A ``ResultCache`` may be shared between databases.
+
+    With ``retain`` greater than one, every installed generation is also kept
+    in a ``<cache>.generations`` directory next to the cache, up to ``retain``
+    files, and ``rollback()`` reinstalls one of them without rebuilding it. The
+    cache path itself is the pointer to the active generation: a hard link to
+    one retained file, swapped with an atomic rename. Generation files are never
+    modified, so ``pin()`` gives a batch of queries one consistent generation.
+    """
+
+    _STATEMENT_CACHE_SIZE: Final[int] = 512
+    _FETCH_SIZE: Final[int] = 1024
 
-    def __init__(self, path: str | Path) -> None:
+    def __init__(
+        self,
+        path: str | Path,
+        persistent: bool = False,
+        in_memory: bool = False,
+        result_cache: ResultCache | None = None,
+        retain: int = 1,
+    ) -> None:
+        if retain < 1:
+            raise ValueError("retain must be at least 1")
         self._path = Path(path).expanduser()
+        self._retain = retain
+        self._pinned: sqlite3.Connection | None = None
+        self._pinned_search_index = False
+        self._persistent = persistent or in_memory
+        self._in_memory = in_memory
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._pool: list[sqlite3.Connection] = []
+        self._pool_epoch = 0
+        self._snapshot_lock = threading.Lock()
+        self._snapshot: _Snapshot | None = None
+        self.result_cache = result_cache
+        self._cache_namespace = str(self._path.resolve()) if result_cache is not None else ""
+
+    def __enter__(self) -> Database:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
 
     def save(
         self,
-        software_list: Sequence[SoftwareLifecycle],
-        hardware_list: Sequence[HardwareLifecycle],
+        software_list: Iterable[SoftwareLifecycle] | SoftwareColumns,
+        hardware_list: Iterable[HardwareLifecycle] | HardwareColumns,
+        validators: Mapping[str, SourceValidator] | None = None,
+        metrics: RefreshMetrics | None = None,
+        compact: bool = False,
+        product_names: Mapping[str, Iterable[str]] | None = None,
+        bulk_load: bool = True,
     ) -> bool:
         """Persist a complete validated generation without risking the active cache.
 
         A new database is built alongside the active cache and then atomically
         substituted only after both datasets have been written successfully.
+        Either dataset may be a lazy iterator such as
+        ``Downloader.iter_eol_software()``; records are validated while they are
+        written, so no intermediate list is built. ``validators`` are stored with
+        the generation so that the next refresh can revalidate unchanged sources
+        instead of downloading them again. Stage timings of the write are added
+        to ``metrics`` under ``CACHE_SOURCE``. With ``compact=True`` the finished
+        generation is rewritten with ``VACUUM INTO`` to leave no free pages.
+        ``product_names`` maps product names to their aliases and labels, which
+        ``match_products()`` matches in addition to the names themselves. With
+        ``bulk_load=False`` the new database is written with SQLite's default
+        journaling and sync settings instead of the unjournaled bulk-load ones.
+        """
+        metrics = metrics if metrics is not None else RefreshMetrics()
+        software_count, hardware_count = self._replace_generation(
+            lambda path: self._build_generation(
+                path, software_list, hardware_list, validators or {}, metrics, compact, product_names or {}, bulk_load
+            ),
+            metrics,
+        )
+        logger.info(
+            "Replaced lifecycle cache at %s with %s software and %s hardware records",
+            self._path,
+            software_count,
+            hardware_count,
+        )
+        return True
+
+    def save_incremental(
+        self,
+        software_list: Iterable[SoftwareLifecycle] | SoftwareColumns,
+        hardware_list: Iterable[HardwareLifecycle] | HardwareColumns,
+        validators: Mapping[str, SourceValidator] | None = None,
+        metrics: RefreshMetrics | None = None,
+        product_names: Mapping[str, Iterable[str]] | None = None,
+    ) -> ChangeReport:
+        """Persist a complete validated generation by patching a copy of the active one.
+
+        The active generation is copied with the SQLite backup API and only the
+        rows that differ from the supplied datasets are deleted or inserted before
+        the copy atomically replaces the cache, with the same validation as
+        ``save()``. The returned report lists added and removed records, and pairs
+        records whose EOL value changed. Without an active generation of the
+        current layout the cache is rebuilt completely instead. Without
+        ``product_names`` the aliases of the active generation are kept.
+        """
+        if self._metadata("schema_version") != _SCHEMA_VERSION:
+            self.save(software_list, hardware_list, validators, metrics, product_names=product_names)
+            return ChangeReport(rebuilt=True)
+        metrics = metrics if metrics is not None else RefreshMetrics()
+        report = self._replace_generation(
+            lambda path: self._patch_generation(
+                path, software_list, hardware_list, validators or {}, metrics, product_names
+            ),
+            metrics,
+        )
+        logger.info("Patched lifecycle cache at %s: %s", self._path, report)
+        return report
+
+    def save_selective(
+        self,
+        software_list: Iterable[SoftwareLifecycle] | SoftwareColumns,
+        hardware_list: Iterable[HardwareLifecycle] | HardwareColumns,
+        validators: Mapping[str, SourceValidator] | None = None,
+        metrics: RefreshMetrics | None = None,
+        product_names: Mapping[str, Iterable[str]] | None = None,
+    ) -> ChangeReport:
+        """Replace the records of some products and hardware sources, keeping every other row.
+
+        The supplied software records replace all rows of their products, and the
+        hardware records replace all rows of their sources. Rows of other
+        products and sources, their aliases, and the validators of sources that
+        were not retrieved are carried over from the active generation. The new
+        generation is patched and installed like with ``save_incremental()``,
+        which needs an active generation of the current layout.
+        """
+        if self._metadata("schema_version") != _SCHEMA_VERSION:
+            raise CacheError(f"A selective refresh needs a complete active cache at {self._path}; update it first")
+        metrics = metrics if metrics is not None else RefreshMetrics()
+        report = self._replace_generation(
+            lambda path: self._patch_generation(
+                path, software_list, hardware_list, validators or {}, metrics, product_names, selective=True
+            ),
+            metrics,
+        )
+        logger.info("Selectively refreshed lifecycle cache at %s: %s", self._path, report)
+        return report
+
+    def search_software(self, software_name: str) -> list[SoftwareLifecycle]:
+        """Return software records whose product name contains the supplied term."""
+        return self._cached(
+            ("software", _cache_term(software_name)),
+            lambda: [
+                SoftwareLifecycle(name=row[0], version=row[1], eol=row[2])
+                for row in self.search_software_rows(software_name)
+            ],
+        )
+
+    def search_software_rows(self, software_name: str) -> Generator[tuple[str, str, str], None, None]:
+        """Yield the ``(name, version, eol)`` rows of ``search_software()`` straight from the cursor.
+
+        Rows are fetched in batches while the iterator holds its connection
+        open, so arbitrarily large result sets are streamed in constant memory.
+        Close the iterator, or exhaust it, to release the connection.
+        """
+        return self._iter_rows(
+            "SELECT name, version, eol FROM software WHERE {filter} ORDER BY name, version",
+            (self._normalized_query(software_name),),
+            _SOFTWARE_FILTERS,
+        )
+
+    def find_software_release(self, software_name: str, version: str) -> SoftwareLifecycle | None:
+        """Return the release cycle of a product that contains a concrete installed version.
+
+        The product name must match exactly, ignoring case. The installed version
+        is resolved to the most specific cycle whose components prefix it, so
+        ``1.24.3`` resolves to the ``1.24`` cycle, or to ``1`` when no ``1.24``
+        cycle exists.
+        """
+        prefixes = version_key_prefixes(version)
+        if not prefixes or not software_name.strip():
+            return None
+        placeholders = ", ".join("?" for _ in prefixes)
+        releases = self._cached(
+            ("release", _cache_term(software_name), tuple(prefixes)),
+            lambda: [
+                SoftwareLifecycle(name=row[0], version=row[1], eol=row[2])
+                for row in self._fetch_all(
+                    f"""
+                    SELECT name, version, eol
+                    FROM software
+                    WHERE name = ? COLLATE NOCASE AND version_key IN ({placeholders})
+                    ORDER BY length(version_key) DESC, name
+                    LIMIT 1
+                    """,
+                    (software_name.strip(), *prefixes),
+                )
+            ],
+        )
+        return releases[0] if releases else None
+
+    def match_products(
+        self, name: str, threshold: float = DEFAULT_MATCH_THRESHOLD, limit: int = 5
+    ) -> list[ProductMatch]:
+        """Return up to ``limit`` products whose name, alias or label resembles ``name``, best first.
+
+        Names are compared by the trigram similarity of their ``product_key()``
+        through an index built with the generation, after a trailing version such
+        as ``nginx/1.24`` has been split off into ``ProductMatch.version``. A
+        score of 1.0 means the keys are equal; scores below ``threshold`` are
+        dropped.
+        """
+        return self._cached(
+            ("match", _cache_term(name), threshold, limit),
+            lambda: self.match_products_many([name], threshold, limit)[name],
+        )
+
+    def match_products_many(
+        self, names: Iterable[str], threshold: float = DEFAULT_MATCH_THRESHOLD, limit: int = 5
+    ) -> dict[str, list[ProductMatch]]:
+        """Match many inventory names in one set-based query, grouped by input name in input order."""
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be greater than 0 and at most 1")
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        queries = list(dict.fromkeys(names))
+        results: dict[str, list[ProductMatch]] = {query: [] for query in queries}
+        versions = [split_product_version(query)[1] for query in queries]
+        terms = [
+            (position, trigram, len(query_trigrams))
+            for position, query in enumerate(queries)
+            if (query_trigrams := trigrams(product_key(split_product_version(query)[0])))
+            for trigram in query_trigrams
+        ]
+        for position, product, matched, score in self._fetch_matches(terms, threshold):
+            matches = results[queries[position]]
+            if len(matches) < limit and all(match.product != product for match in matches):
+                matches.append(ProductMatch(product, min(score, 1.0), matched, versions[position]))
+        return results
+
+    def product_names(self) -> dict[str, tuple[str, ...]]:
+        """Return the aliases and labels stored with the active generation, keyed by product name."""
+        if not self._fetch_all(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'product_keys'", ()
+        ):
+            return {}
+        names: dict[str, tuple[str, ...]] = {}
+        for product, alias in self._fetch_all(
+            "SELECT product, alias FROM product_keys WHERE alias <> product ORDER BY rowid", ()
+        ):
+            names[product] = (*names.get(product, ()), alias)
+        return names
+
+    def search_hardware(self, hardware_name: str) -> list[HardwareLifecycle]:
+        """Return hardware records whose manufacturer or model contains the supplied term."""
+        return self._cached(
+            ("hardware", _cache_term(hardware_name)),
+            lambda: [
+                HardwareLifecycle(manufacturer=row[0], model=row[1], eol=row[2])
+                for row in self.search_hardware_rows(hardware_name)
+            ],
+        )
+
+    def search_hardware_rows(self, hardware_name: str) -> Generator[tuple[str, str, str], None, None]:
+        """Yield the ``(manufacturer, model, eol)`` rows of ``search_hardware()`` straight from the cursor."""
+        query = self._normalized_query(hardware_name)
+        return self._iter_rows(
+            "SELECT manufacturer, model, eol FROM hardware WHERE {filter} ORDER BY manufacturer, model",
+            (query, query),
+            _HARDWARE_FILTERS,
+        )
+
+    def expiring_before(
+        self, cutoff: date, since: date | None = None
+    ) -> tuple[list[SoftwareLifecycle], list[HardwareLifecycle]]:
+        """Return software and hardware records whose EOL date falls before ``cutoff``.
+
+        With ``since``, records that reached EOL before that date are excluded.
+        EOL values are compared through the date parsed while the generation was
+        built; month, quarter and year values count from the first day of their
+        period, and unknown or unrecognized values never match.
+        """
+        bounds = (since.isoformat() if since is not None else "", cutoff.isoformat())
+        software_records = self._cached(
+            ("expiring_software", bounds),
+            lambda: [
+                SoftwareLifecycle(name=row[0], version=row[1], eol=row[2])
+                for row in self._fetch_all(
+                    """
+                    SELECT name, version, eol
+                    FROM software
+                    WHERE eol_date >= ? AND eol_date < ?
+                    ORDER BY eol_date, name, version
+                    """,
+                    bounds,
+                )
+            ],
+        )
+        hardware_records = self._cached(
+            ("expiring_hardware", bounds),
+            lambda: [
+                HardwareLifecycle(manufacturer=row[0], model=row[1], eol=row[2])
+                for row in self._fetch_all(
+                    """
+                    SELECT manufacturer, model, eol
+                    FROM hardware
+                    WHERE eol_date >= ? AND eol_date < ?
+                    ORDER BY eol_date, manufacturer, model
+                    """,
+                    bounds,
+                )
+            ],
+        )
+        return software_records, hardware_records
+
+    def search_software_many(
+        self, terms: Iterable[SoftwareTerm]
+    ) -> dict[SoftwareTerm, list[SoftwareLifecycle]]:
+        """Search many product names in one set-based query.
+
+        Each term is a product name substring, or a ``(name, version)`` pair that
+        also requires an exact version match. The result maps every distinct term,
+        in input order, to its records.
+        """
+        queries = list(dict.fromkeys(terms))
+        results: dict[SoftwareTerm, list[SoftwareLifecycle]] = {query: [] for query in queries}
+        rows = self._fetch_batch(
+            [
+                (position, self._normalized_query(query), None)
+                if isinstance(query, str)
+                else (position, self._normalized_query(query[0]), query[1].strip())
+                for position, query in enumerate(queries)
+            ],
+            """
+            SELECT terms.position, software.name, software.version, software.eol
+            FROM temp.batch_terms AS terms
+            JOIN software ON {filter} AND (terms.version IS NULL OR software.version = terms.version)
+            ORDER BY terms.position, software.name, software.version
+            """,
+            _SOFTWARE_FILTERS,
+        )
+        for row in rows:
+            results[queries[row[0]]].append(SoftwareLifecycle(name=row[1], version=row[2], eol=row[3]))
+        return results
+
+    def search_hardware_many(self, terms: Iterable[str]) -> dict[str, list[HardwareLifecycle]]:
+        """Search many manufacturer or model terms in one set-based query, grouped by input term."""
+        queries = list(dict.fromkeys(terms))
+        results: dict[str, list[HardwareLifecycle]] = {query: [] for query in queries}
+        rows = self._fetch_batch(
+            [(position, self._normalized_query(query), None) for position, query in enumerate(queries)],
+            """
+            SELECT terms.position, hardware.manufacturer, hardware.model, hardware.eol
+            FROM temp.batch_terms AS terms
+            JOIN hardware ON {filter}
+            ORDER BY terms.position, hardware.manufacturer, hardware.model
+            """,
+            _HARDWARE_FILTERS,
+        )
+        for row in rows:
+            results[queries[row[0]]].append(HardwareLifecycle(manufacturer=row[1], model=row[2], eol=row[3]))
+        return results
+
+    def iter_software(
+        self,
+        software_name: str = "",
+        limit: int | None = None,
+        offset: int = 0,
+        after: str | None = None,
+    ) -> Generator[SoftwareLifecycle, None, None]:
+        """Yield software records ordered by name, version and EOL, streamed in cursor batches.
+
+        An empty ``software_name`` selects every record. ``limit`` and ``offset``
+        page through the result; ``after`` is the cursor of a ``software_page()``
+        and continues a keyset scan behind it, which stays cheap on deep pages.
+        Records with equal values are ordered by their row, so no copy is
+        skipped. The iterator keeps its connection open until it is exhausted
+        or closed.
+        """
+        rows = self._ordered_rows("software", software_name, self._page(limit, offset), after)
+        return _records(rows, _software_record)
+
+    def iter_hardware(
+        self,
+        hardware_name: str = "",
+        limit: int | None = None,
+        offset: int = 0,
+        after: str | None = None,
+    ) -> Generator[HardwareLifecycle, None, None]:
+        """Yield hardware records ordered by manufacturer, model and EOL, like ``iter_software()``."""
+        rows = self._ordered_rows("hardware", hardware_name, self._page(limit, offset), after)
+        return _records(rows, _hardware_record)
+
+    def software_page(
+        self, software_name: str = "", limit: int = _FETCH_SIZE, after: str | None = None
+    ) -> RecordPage[SoftwareLifecycle]:
+        """Return up to ``limit`` software records ordered like ``iter_software()``, behind the cursor ``after``.
+
+        Pass the ``cursor`` of the returned page as ``after`` to read the next
+        one. Paging this way reads every row of a generation exactly once, even
+        when records are identical.
+        """
+        rows = list(self._ordered_rows("software", software_name, self._page_size(limit), after))
+        return RecordPage(tuple(map(_software_record, rows[:limit])), _next_cursor(rows, limit))
+
+    def hardware_page(
+        self, hardware_name: str = "", limit: int = _FETCH_SIZE, after: str | None = None
+    ) -> RecordPage[HardwareLifecycle]:
+        """Return up to ``limit`` hardware records ordered like ``iter_hardware()``, like ``software_page()``."""
+        rows = list(self._ordered_rows("hardware", hardware_name, self._page_size(limit), after))
+        return RecordPage(tuple(map(_hardware_record, rows[:limit])), _next_cursor(rows, limit))
+
+    def export(self) -> Generator[LifecycleRecord, None, None]:
+        """Yield every software record and then every hardware record of one generation in insertion order.
+
+        Both tables are read through the same connection, so the export is
+        consistent even when ``save()`` replaces the cache while it is consumed.
+        """
+        rows = self.export_rows()
+        try:
+            for table, row in rows:
+                yield _software_record(row) if table == "software" else _hardware_record(row)
+        finally:
+            rows.close()
+
+    def export_rows(self) -> Generator[tuple[str, tuple[str, str, str] | tuple[str, str, str, str]], None, None]:
+        """Yield the rows of ``export()`` as value tuples, each paired with its table name.
+
+        Software rows hold the name, version and EOL value; hardware rows hold
+        the manufacturer, model, EOL value and source page.
+        """
+        with self._reader() as connection:
+            if connection is None:
+                return
+            software_rows = connection.execute("SELECT name, version, eol FROM software ORDER BY rowid")
+            for row in self._fetch_batches(software_rows):
+                yield "software", row
+            hardware_rows = connection.execute("SELECT manufacturer, model, eol, source FROM hardware ORDER BY rowid")
+            for row in self._fetch_batches(hardware_rows):
+                yield "hardware", row
+
+    def source_validators(self) -> dict[str, SourceValidator]:
+        """Return the HTTP validators stored with the active generation, keyed by source URL."""
+        if not self._fetch_all("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sources'", ()):
+            return {}
+        rows = self._fetch_all("SELECT url, etag, last_modified FROM sources ORDER BY url", ())
+        return {row[0]: SourceValidator(url=row[0], etag=row[1], last_modified=row[2]) for row in rows}
+
+    def all_software(self) -> list[SoftwareLifecycle]:
+        """Return every software record of the active generation in insertion order."""
+        rows = self._fetch_all("SELECT name, version, eol FROM software ORDER BY rowid", ())
+        return [SoftwareLifecycle(name=row[0], version=row[1], eol=row[2]) for row in rows]
+
+    def hardware_for_source(self, source: str) -> list[HardwareLifecycle]:
+        """Return the hardware records that the active generation parsed from one source page."""
+        rows = self._fetch_all(
+            "SELECT manufacturer, model, eol, source FROM hardware WHERE source = ? ORDER BY rowid",
+            (source,),
+        )
+        return [HardwareLifecycle(manufacturer=row[0], model=row[1], eol=row[2], source=row[3]) for row in rows]
+
+    def list_generations(self) -> list[CacheGeneration]:
+        """Return the retained generations, newest first, marking the one the cache path points to."""
+        generations = []
+        try:
+            entries = list(self._generations_path.iterdir())
+        except FileNotFoundError:
+            return []
+        except OSError as exception:
+            raise CacheError(f"Could not list generations in {self._generations_path}: {exception}") from exception
+        for entry in entries:
+            match = _GENERATION_FILE.fullmatch(entry.name)
+            if match is None:
+                continue
+            created = datetime.strptime(match["created"], _GENERATION_TIME_FORMAT).replace(tzinfo=timezone.utc)
+            generations.append(
+                CacheGeneration(
+                    id=f"{match['created']}-{match['sha256'][:12]}",
+                    created=created,
+                    sha256=match["sha256"],
+                    path=entry,
+                    active=_same_file(entry, self._path),
+                )
+            )
+        generations.sort(key=lambda generation: generation.created, reverse=True)
+        if generations and not any(generation.active for generation in generations) and self._path.is_file():
+            # Without hard links the active cache is a copy; recognize it by its content instead.
+            active_hash = _sha256(self._path)
+            generations = [
+                CacheGeneration(g.id, g.created, g.sha256, g.path, g.sha256 == active_hash) for g in generations
+            ]
+        return generations
+
+    def rollback(self, generation: str | None = None) -> CacheGeneration:
+        """Reinstall a retained generation and return it.
+
+        ``generation`` is a generation ID, or a prefix of its creation time or
+        content hash; by default the generation retained before the active one
+        is reinstalled. Only a link is swapped, so rolling back takes
+        milliseconds regardless of the size of the datasets.
+        """
+        generations = self.list_generations()
+        if generation is None:
+            active = [index for index, retained in enumerate(generations) if retained.active]
+            if not active:
+                raise CacheError(f"The active cache at {self._path} is not a retained generation")
+            if active[0] + 1 >= len(generations):
+                raise CacheError(f"No generation older than the active cache at {self._path} is retained")
+            target = generations[active[0] + 1]
+        else:
+            target = self._find_generation(generation, generations)
+        self._replace_generation(lambda path: _link_or_copy(target.path, path), RefreshMetrics(), retain=False)
+        logger.info("Rolled back lifecycle cache at %s to generation %s", self._path, target.id)
+        return CacheGeneration(target.id, target.created, target.sha256, target.path, active=True)
+
+    def export_snapshot(self, destination: str | Path) -> SnapshotManifest:
+        """Write the active generation to ``destination`` as a compressed, checksummed snapshot.
+
+        The snapshot holds a consistent copy of the generation and a manifest
+        with its SHA-256 digest, record counts and source validators, so that
+        ``import_snapshot()`` can install it on hosts without upstream access.
+        """
+        # The archive modules are only imported on demand, like the downloader; queries never need them.
+        from .snapshot import SNAPSHOT_FORMAT, write_snapshot
+
+        destination = Path(destination).expanduser()
+        if not self._path.is_file():
+            raise CacheError(f"No lifecycle cache exists at {self._path}")
+        descriptor, temporary_name = tempfile.mkstemp(
+            dir=self._path.parent, prefix=f".{self._path.name}.", suffix=".snapshot"
+        )
+        os.close(descriptor)
+        temporary_path = Path(temporary_name)
+        try:
+            connection = sqlite3.connect(temporary_path)
+            try:
+                active = self._open_reader()
+                try:
+                    active.backup(connection)
+                finally:
+                    active.close()
+                schema_version = self._generation_metadata(connection, "schema_version")
+                if schema_version != _SCHEMA_VERSION:
+                    raise CacheError(f"The cache at {self._path} uses an outdated layout; update it before exporting")
+                software_count = connection.execute("SELECT COUNT(*) FROM software").fetchone()[0]
+                hardware_count = connection.execute("SELECT COUNT(*) FROM hardware").fetchone()[0]
+                sources = tuple(
+                    SourceValidator(url=row[0], etag=row[1], last_modified=row[2])
+                    for row in connection.execute("SELECT url, etag, last_modified FROM sources ORDER BY url")
+                )
+            finally:
+                connection.close()
+            manifest = SnapshotManifest(
+                format=SNAPSHOT_FORMAT,
+                schema_version=schema_version,
+                created=datetime.now(timezone.utc),
+                sha256=_sha256(temporary_path),
+                size=temporary_path.stat().st_size,
+                software_records=software_count,
+                hardware_records=hardware_count,
+                sources=sources,
+            )
+            write_snapshot(destination, temporary_path, manifest)
+        except (OSError, sqlite3.Error) as exception:
+            raise CacheError(f"Could not export a snapshot of {self._path}: {exception}") from exception
+        finally:
+            temporary_path.unlink(missing_ok=True)
+        logger.info("Exported lifecycle cache at %s to snapshot %s", self._path, destination)
+        return manifest
+
+    def import_snapshot(
+        self, source: str | Path | BinaryIO, metrics: RefreshMetrics | None = None
+    ) -> SnapshotManifest:
+        """Install the generation of a snapshot written by ``export_snapshot()`` as the active cache.
+
+        ``source`` is a path or a binary stream, such as standard input, and is
+        read once from start to end. The generation is streamed into a temporary
+        file, checked against the digest and record counts of its manifest and
+        with ``PRAGMA quick_check``, and then installed like a generation built
+        by ``save()``.
         """
-        software_records = list(software_list)
-        hardware_records = list(hardware_list)
-        self._validate_records(software_records, hardware_records)
+        from .snapshot import read_snapshot
 
+        metrics = metrics if metrics is not None else RefreshMetrics()
+
+        def restore(path: Path) -> SnapshotManifest:
+            with contextlib.ExitStack() as stack:
+                stream = stack.enter_context(open(source, "rb")) if isinstance(source, (str, Path)) else source
+                with metrics.stage("import", CACHE_SOURCE):
+                    manifest = read_snapshot(stream, path)
+            with metrics.stage("validate", CACHE_SOURCE):
+                self._validate_snapshot(path, manifest)
+            metrics.count(CACHE_SOURCE, records=manifest.software_records + manifest.hardware_records)
+            return manifest
+
+        manifest = self._replace_generation(restore, metrics)
+        logger.info(
+            "Imported snapshot with %s software and %s hardware records into %s",
+            manifest.software_records,
+            manifest.hardware_records,
+            self._path,
+        )
+        return manifest
+
+    @contextmanager
+    def pin(self, generation: str | None = None) -> Iterator[Database]:
+        """Yield a read-only view of one generation for the duration of a batch of queries.
+
+        Every query of the view reads the generation that was active when the
+        view was opened, or the retained ``generation`` named as in
+        ``rollback()``, even when ``save()`` or another process installs a new
+        generation meanwhile.
+        """
+        path = self._path if generation is None else self._find_generation(generation, self.list_generations()).path
+        if not path.is_file():
+            raise CacheError(f"No lifecycle cache generation exists at {path}")
+        view = Database(path)
+        try:
+            view._pinned = view._open_reader(check_same_thread=False)
+            view._pinned_search_index = view._has_search_index(view._pinned)
+        except sqlite3.Error as exception:
+            raise CacheError(f"Could not read cache at {path}: {exception}") from exception
+        try:
+            yield view
+        finally:
+            view.close()
+
+    def close(self) -> None:
+        """Close the pooled connections of every thread; later queries reopen them on demand."""
+        if self._pinned is not None:
+            self._pinned.close()
+            self._pinned = None
+        with self._pool_lock:
+            connections, self._pool = self._pool, []
+            self._pool_epoch += 1
+        with self._snapshot_lock:
+            if self._snapshot is not None:
+                connections.append(self._snapshot.connection)
+                self._snapshot = None
+        for connection in connections:
+            connection.close()
+
+    @property
+    def _generations_path(self) -> Path:
+        return self._path.with_name(f"{self._path.name}.generations")
+
+    def _replace_generation(
+        self, build: Callable[[Path], ResultT], metrics: RefreshMetrics, retain: bool = True
+    ) -> ResultT:
+        """Build a generation in a temporary file with ``build`` and atomically install it.
+
+        With ``retain``, the generation is linked into the generations directory
+        before it is installed, and the oldest generations beyond the retained
+        number are removed afterwards.
+        """
+        if self._pinned is not None:
+            raise CacheError("A pinned generation is read-only")
         self._path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
         descriptor, temporary_name = tempfile.mkstemp(
             dir=self._path.parent,
@@ -46,15 +799,18 @@ class Database:
         temporary_path = Path(temporary_name)
 
         try:
-            self._build_generation(temporary_path, software_records, hardware_records)
-            os.replace(temporary_path, self._path)
-            logger.info(
-                "Replaced lifecycle cache at %s with %s software and %s hardware records",
-                self._path,
-                len(software_records),
-                len(hardware_records),
-            )
-            return True
+            result = build(temporary_path)
+            with metrics.stage("replace", CACHE_SOURCE):
+                _fsync_path(temporary_path)
+                if retain and self._retain > 1:
+                    self._retain_generation(temporary_path)
+                os.replace(temporary_path, self._path)
+                _fsync_directory(self._path.parent)
+            if self.result_cache is not None:
+                self.result_cache.invalidate(self._cache_namespace)
+            if self._retain > 1:
+                self._prune_generations()
+            return result
         except (OSError, sqlite3.Error) as exception:
             raise CacheError(f"Could not safely replace cache at {self._path}: {exception}") from exception
         finally:
@@ -64,91 +820,879 @@ class Database:
                 except OSError as exception:
                     logger.warning("Could not remove temporary cache file %s: %s", temporary_path, exception)
 
-    def search_software(self, software_name: str) -> list[SoftwareLifecycle]:
-        """Return software records whose product name contains the supplied term."""
-        query = self._normalized_query(software_name)
-        rows = self._fetch_all(
-            "SELECT name, version, eol FROM software WHERE name LIKE ? ORDER BY name, version",
-            (query,),
-        )
-        return [SoftwareLifecycle(name=row[0], version=row[1], eol=row[2]) for row in rows]
+    @classmethod
+    def _validate_snapshot(cls, path: Path, manifest: SnapshotManifest) -> None:
+        if manifest.schema_version != _SCHEMA_VERSION:
+            raise CacheError(f"Snapshot uses cache layout {manifest.schema_version}; expected {_SCHEMA_VERSION}")
+        if manifest.software_records <= 0 or manifest.hardware_records <= 0:
+            raise CacheError("Refusing to replace the cache with a snapshot of an empty dataset")
+        connection = sqlite3.connect(path)
+        try:
+            if connection.execute("PRAGMA quick_check").fetchone()[0] != "ok":
+                raise CacheError("Snapshot generation failed the SQLite integrity check")
+            if cls._generation_metadata(connection, "schema_version") != manifest.schema_version:
+                raise CacheError("Snapshot generation does not match the layout of its manifest")
+            if (
+                connection.execute("SELECT COUNT(*) FROM software").fetchone()[0] != manifest.software_records
+                or connection.execute("SELECT COUNT(*) FROM hardware").fetchone()[0] != manifest.hardware_records
+            ):
+                raise CacheError("Snapshot generation does not match the record counts of its manifest")
+        finally:
+            connection.close()
 
-    def search_hardware(self, hardware_name: str) -> list[HardwareLifecycle]:
-        """Return hardware records whose manufacturer or model contains the supplied term."""
-        query = self._normalized_query(hardware_name)
-        rows = self._fetch_all(
-            """
-            SELECT manufacturer, model, eol
-            FROM hardware
-            WHERE manufacturer LIKE ? OR model LIKE ?
-            ORDER BY manufacturer, model
-            """,
-            (query, query),
-        )
-        return [HardwareLifecycle(manufacturer=row[0], model=row[1], eol=row[2]) for row in rows]
+    def _find_generation(self, generation: str, generations: list[CacheGeneration]) -> CacheGeneration:
+        candidates = [
+            retained
+            for retained in generations
+            if retained.id.startswith(generation) or retained.sha256.startswith(generation.casefold())
+        ]
+        if len(candidates) != 1:
+            problem = "matches no" if not candidates else "is ambiguous among the"
+            raise CacheError(f"Generation {generation!r} {problem} retained generations of {self._path}")
+        return candidates[0]
 
-    def close(self) -> None:
-        """Retain the previous public API; connections are scoped per operation."""
+    def _retain_generation(self, path: Path) -> None:
+        self._generations_path.mkdir(mode=0o700, exist_ok=True)
+        created = datetime.now(timezone.utc).strftime(_GENERATION_TIME_FORMAT)
+        _link_or_copy(path, self._generations_path / f"{created}-{_sha256(path)}.db")
+        _fsync_directory(self._generations_path)
+
+    def _prune_generations(self) -> None:
+        """Remove the oldest inactive generations beyond the retained number."""
+        for generation in self.list_generations()[self._retain :]:
+            if generation.active:
+                continue
+            try:
+                # Readers that pinned the generation keep their open file; see pin().
+                generation.path.unlink()
+            except OSError as exception:
+                logger.warning("Could not remove cache generation %s: %s", generation.path, exception)
 
     @staticmethod
-    def _validate_records(
-        software_records: Sequence[SoftwareLifecycle], hardware_records: Sequence[HardwareLifecycle]
-    ) -> None:
-        if not software_records:
-            raise CacheError("Refusing to replace the cache with an empty software dataset")
-        if not hardware_records:
-            raise CacheError("Refusing to replace the cache with an empty hardware dataset")
-        if not all(isinstance(record, SoftwareLifecycle) for record in software_records):
-            raise CacheError("Software dataset contains an invalid record")
-        if not all(isinstance(record, HardwareLifecycle) for record in hardware_records):
-            raise CacheError("Hardware dataset contains an invalid record")
+    def _software_rows(
+        records: Iterable[SoftwareLifecycle] | SoftwareColumns,
+    ) -> Iterator[tuple[str, str, str, str, str | None, str | None]]:
+        if isinstance(records, SoftwareColumns):
+            # Validated columns are loaded without a Python frame per row; see _column_rows().
+            keys = {version: version_key(version) for version in set(records.versions)}
+            return _column_rows(records.names, records.versions, records.eols, map(keys.__getitem__, records.versions))
+        return Database._record_software_rows(records)
+
+    @staticmethod
+    def _record_software_rows(
+        records: Iterable[SoftwareLifecycle],
+    ) -> Iterator[tuple[str, str, str, str, str | None, str | None]]:
+        # Feeds repeat a few hundred release cycles and EOL values across thousands of rows.
+        version_keys: dict[str, str] = {}
+        eol_dates: dict[str, tuple[str | None, str | None]] = {}
+        for record in records:
+            if not isinstance(record, SoftwareLifecycle):
+                raise CacheError("Software dataset contains an invalid record")
+            key = version_keys.get(record.version)
+            if key is None:
+                key = version_keys[record.version] = version_key(record.version)
+            eol_date = eol_dates.get(record.eol)
+            if eol_date is None:
+                eol_date = eol_dates[record.eol] = parse_eol_date(record.eol)
+            yield (record.name, record.version, record.eol, key, *eol_date)
+
+    @staticmethod
+    def _hardware_rows(
+        records: Iterable[HardwareLifecycle] | HardwareColumns,
+    ) -> Iterator[tuple[str, str, str, str, str | None, str | None]]:
+        if isinstance(records, HardwareColumns):
+            return _column_rows(records.manufacturers, records.models, records.eols, records.sources)
+        return Database._record_hardware_rows(records)
+
+    @staticmethod
+    def _record_hardware_rows(
+        records: Iterable[HardwareLifecycle],
+    ) -> Iterator[tuple[str, str, str, str, str | None, str | None]]:
+        eol_dates: dict[str, tuple[str | None, str | None]] = {}
+        for record in records:
+            if not isinstance(record, HardwareLifecycle):
+                raise CacheError("Hardware dataset contains an invalid record")
+            eol_date = eol_dates.get(record.eol)
+            if eol_date is None:
+                eol_date = eol_dates[record.eol] = parse_eol_date(record.eol)
+            yield (record.manufacturer, record.model, record.eol, record.source, *eol_date)
 
     @staticmethod
     def _build_generation(
         path: Path,
-        software_records: Sequence[SoftwareLifecycle],
-        hardware_records: Sequence[HardwareLifecycle],
-    ) -> None:
+        software_records: Iterable[SoftwareLifecycle] | SoftwareColumns,
+        hardware_records: Iterable[HardwareLifecycle] | HardwareColumns,
+        validators: Mapping[str, SourceValidator],
+        metrics: RefreshMetrics,
+        compact: bool = False,
+        product_names: Mapping[str, Iterable[str]] | None = None,
+        bulk_load: bool = True,
+    ) -> tuple[int, int]:
         connection = sqlite3.connect(path)
         try:
-            connection.execute("PRAGMA journal_mode = DELETE")
+            if bulk_load:
+                _configure_bulk_load(connection)
             connection.execute(
-                "CREATE TABLE software (name TEXT NOT NULL, version TEXT NOT NULL, eol TEXT NOT NULL)"
+                """
+                CREATE TABLE software (
+                    name TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    eol TEXT NOT NULL,
+                    version_key TEXT NOT NULL DEFAULT '',
+                    eol_date TEXT,
+                    eol_precision TEXT
+                )
+                """
             )
             connection.execute(
-                "CREATE TABLE hardware (manufacturer TEXT NOT NULL, model TEXT NOT NULL, eol TEXT NOT NULL)"
-            )
-            connection.executemany(
-                "INSERT INTO software (name, version, eol) VALUES (?, ?, ?)",
-                [(record.name, record.version, record.eol) for record in software_records],
+                """
+                CREATE TABLE hardware (
+                    manufacturer TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    eol TEXT NOT NULL,
+                    source TEXT NOT NULL DEFAULT '',
+                    eol_date TEXT,
+                    eol_precision TEXT
+                )
+                """
             )
+            connection.execute("CREATE TABLE sources (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT)")
+            connection.execute("CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            connection.execute("INSERT INTO metadata (key, value) VALUES ('schema_version', ?)", (_SCHEMA_VERSION,))
+            with metrics.stage("insert", CACHE_SOURCE):
+                software_inserted = connection.executemany(
+                    _insert_statement("software", _SOFTWARE_COLUMNS), Database._software_rows(software_records)
+                ).rowcount
+                if software_inserted <= 0:
+                    raise CacheError("Refusing to replace the cache with an empty software dataset")
+                hardware_inserted = connection.executemany(
+                    _insert_statement("hardware", _HARDWARE_COLUMNS), Database._hardware_rows(hardware_records)
+                ).rowcount
+                if hardware_inserted <= 0:
+                    raise CacheError("Refusing to replace the cache with an empty hardware dataset")
+                connection.executemany(
+                    "INSERT INTO sources (url, etag, last_modified) VALUES (?, ?, ?)",
+                    [(validator.url, validator.etag, validator.last_modified) for validator in validators.values()],
+                )
+            with metrics.stage("index", CACHE_SOURCE):
+                connection.execute("CREATE INDEX software_name_index ON software(name)")
+                connection.execute(
+                    "CREATE INDEX software_version_index ON software(name COLLATE NOCASE, version_key)"
+                )
+                connection.execute("CREATE INDEX hardware_lookup_index ON hardware(manufacturer, model)")
+                connection.execute("CREATE INDEX software_eol_index ON software(eol_date)")
+                connection.execute("CREATE INDEX hardware_eol_index ON hardware(eol_date)")
+            with metrics.stage("search_index", CACHE_SOURCE):
+                Database._build_search_index(connection)
+            with metrics.stage("match_index", CACHE_SOURCE):
+                Database._build_match_index(connection, product_names or {})
+            with metrics.stage("commit", CACHE_SOURCE):
+                software_count = connection.execute("SELECT COUNT(*) FROM software").fetchone()[0]
+                hardware_count = connection.execute("SELECT COUNT(*) FROM hardware").fetchone()[0]
+                if software_count != software_inserted or hardware_count != hardware_inserted:
+                    raise CacheError("Cache validation failed after writing the refreshed datasets")
+                connection.commit()
+            with metrics.stage("analyze", CACHE_SOURCE):
+                connection.execute("ANALYZE")
+                connection.commit()
+            if compact:
+                with metrics.stage("compact", CACHE_SOURCE):
+                    Database._compact(connection, path)
+            metrics.count(CACHE_SOURCE, records=software_count + hardware_count)
+            return software_count, hardware_count
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _compact(connection: sqlite3.Connection, path: Path) -> None:
+        """Rewrite the generation at ``path`` without free pages through ``VACUUM INTO`` a sibling file."""
+        compacted = path.with_name(f"{path.name}.compact")
+        compacted.unlink(missing_ok=True)
+        try:
+            connection.execute("VACUUM INTO ?", (str(compacted),))
+            os.replace(compacted, path)
+        finally:
+            compacted.unlink(missing_ok=True)
+
+    def _patch_generation(
+        self,
+        path: Path,
+        software_records: Iterable[SoftwareLifecycle] | SoftwareColumns,
+        hardware_records: Iterable[HardwareLifecycle] | HardwareColumns,
+        validators: Mapping[str, SourceValidator],
+        metrics: RefreshMetrics,
+        product_names: Mapping[str, Iterable[str]] | None = None,
+        selective: bool = False,
+    ) -> ChangeReport:
+        """Patch a copy of the active generation to hold the supplied datasets.
+
+        With ``selective``, the datasets only cover their own products and
+        hardware sources, and the other rows of the copy are kept.
+        """
+        connection = sqlite3.connect(path)
+        try:
+            _configure_bulk_load(connection)
+            with metrics.stage("copy", CACHE_SOURCE):
+                active = self._open_reader()
+                try:
+                    active.backup(connection)
+                finally:
+                    active.close()
+            if self._generation_metadata(connection, "schema_version") != _SCHEMA_VERSION:
+                raise CacheError("The active cache changed its layout during an incremental refresh")
+
+            with metrics.stage("insert", CACHE_SOURCE):
+                software_count = self._load_incoming(
+                    connection, "software", _SOFTWARE_COLUMNS, self._software_rows(software_records)
+                )
+                hardware_count = self._load_incoming(
+                    connection, "hardware", _HARDWARE_COLUMNS, self._hardware_rows(hardware_records)
+                )
+                if selective:
+                    if software_count <= 0 and hardware_count <= 0:
+                        raise CacheError("Refusing to replace the cache without any selected records")
+                    software_count += self._carry_over(connection, "software", _SOFTWARE_COLUMNS, "name")
+                    hardware_count += self._carry_over(connection, "hardware", _HARDWARE_COLUMNS, "source")
+                if software_count <= 0:
+                    raise CacheError("Refusing to replace the cache with an empty software dataset")
+                if hardware_count <= 0:
+                    raise CacheError("Refusing to replace the cache with an empty hardware dataset")
+
+            with metrics.stage("patch", CACHE_SOURCE):
+                has_search_index = self._has_search_index(connection)
+                software_added, software_removed = self._apply_difference(
+                    connection, "software", _SOFTWARE_COLUMNS, _SOFTWARE_IDENTITY, has_search_index
+                )
+                hardware_added, hardware_removed = self._apply_difference(
+                    connection, "hardware", _HARDWARE_COLUMNS, _HARDWARE_IDENTITY, has_search_index
+                )
+            with metrics.stage("match_index", CACHE_SOURCE):
+                if product_names is None or selective:
+                    product_names = {**self._generation_product_names(connection), **(product_names or {})}
+                connection.execute("DROP TABLE product_keys")
+                connection.execute("DROP TABLE product_trigrams")
+                self._build_match_index(connection, product_names)
+            if selective:
+                connection.executemany("DELETE FROM sources WHERE url = ?", [(url,) for url in validators])
+            else:
+                connection.execute("DELETE FROM sources")
             connection.executemany(
-                "INSERT INTO hardware (manufacturer, model, eol) VALUES (?, ?, ?)",
-                [(record.manufacturer, record.model, record.eol) for record in hardware_records],
+                "INSERT INTO sources (url, etag, last_modified) VALUES (?, ?, ?)",
+                [(validator.url, validator.etag, validator.last_modified) for validator in validators.values()],
             )
-            connection.execute("CREATE INDEX software_name_index ON software(name)")
-            connection.execute("CREATE INDEX hardware_lookup_index ON hardware(manufacturer, model)")
-            software_count = connection.execute("SELECT COUNT(*) FROM software").fetchone()[0]
-            hardware_count = connection.execute("SELECT COUNT(*) FROM hardware").fetchone()[0]
-            if software_count != len(software_records) or hardware_count != len(hardware_records):
-                raise CacheError("Cache validation failed after writing the refreshed datasets")
-            connection.commit()
+
+            with metrics.stage("commit", CACHE_SOURCE):
+                if (
+                    connection.execute("SELECT COUNT(*) FROM main.software").fetchone()[0] != software_count
+                    or connection.execute("SELECT COUNT(*) FROM main.hardware").fetchone()[0] != hardware_count
+                ):
+                    raise CacheError("Cache validation failed after patching the refreshed datasets")
+                connection.commit()
+            metrics.count(CACHE_SOURCE, records=software_count + hardware_count)
         finally:
             connection.close()
 
+        return _change_report(
+            [SoftwareLifecycle(*row) for row in software_added] + [HardwareLifecycle(*row) for row in hardware_added],
+            [SoftwareLifecycle(*row) for row in software_removed]
+            + [HardwareLifecycle(*row) for row in hardware_removed],
+        )
+
+    @staticmethod
+    def _load_incoming(
+        connection: sqlite3.Connection, table: str, columns: tuple[str, ...], rows: Iterable[tuple[object, ...]]
+    ) -> int:
+        connection.execute(
+            f"CREATE TEMP TABLE incoming_{table} AS SELECT {', '.join(columns)} FROM main.{table} LIMIT 0"
+        )
+        return connection.executemany(_insert_statement(f"temp.incoming_{table}", columns), rows).rowcount
+
+    @staticmethod
+    def _carry_over(connection: sqlite3.Connection, table: str, columns: tuple[str, ...], scope: str) -> int:
+        """Add the active rows outside the ``scope`` values of ``incoming_<table>`` to it; return their count."""
+        selected = ", ".join(columns)
+        return connection.execute(
+            f"""
+            INSERT INTO temp.incoming_{table} ({selected})
+            SELECT {selected} FROM main.{table}
+            WHERE {scope} NOT IN (SELECT {scope} FROM temp.incoming_{table})
+            ORDER BY rowid
+            """
+        ).rowcount
+
+    @staticmethod
+    def _apply_difference(
+        connection: sqlite3.Connection,
+        table: str,
+        columns: tuple[str, ...],
+        identity: int,
+        has_search_index: bool,
+    ) -> tuple[list[tuple[str, ...]], list[tuple[str, ...]]]:
+        """Replace the rows of ``table`` that differ from ``incoming_<table>``; return added and removed rows.
+
+        Rows are compared as a multiset over their identity columns, so repeated
+        identical rows are matched one for one.
+        """
+        identity_columns = ", ".join(columns[:identity])
+        numbered = (
+            "SELECT rowid AS row_id, {columns}, "
+            f"ROW_NUMBER() OVER (PARTITION BY {identity_columns} ORDER BY rowid) AS occurrence FROM {{source}}"
+        )
+        active, incoming = f"main.{table}", f"temp.incoming_{table}"
+        for difference, source, other in (("removed", active, incoming), ("added", incoming, active)):
+            connection.execute(
+                f"""
+                CREATE TEMP TABLE {difference}_{table} AS
+                SELECT row_id, {identity_columns}
+                FROM ({numbered.format(columns=identity_columns, source=source)})
+                WHERE ({identity_columns}, occurrence) NOT IN (
+                    SELECT {identity_columns}, occurrence
+                    FROM ({numbered.format(columns=identity_columns, source=other)})
+                )
+                """
+            )
+        removed = connection.execute(
+            f"SELECT {identity_columns} FROM temp.removed_{table} ORDER BY row_id"
+        ).fetchall()
+        added = connection.execute(f"SELECT {identity_columns} FROM temp.added_{table} ORDER BY row_id").fetchall()
+
+        search_columns = ", ".join(_SEARCH_COLUMNS[table])
+        if has_search_index:
+            connection.execute(
+                f"""
+                INSERT INTO {table}_search({table}_search, rowid, {search_columns})
+                SELECT 'delete', rowid, {search_columns} FROM main.{table}
+                WHERE rowid IN (SELECT row_id FROM temp.removed_{table})
+                """
+            )
+        connection.execute(f"DELETE FROM main.{table} WHERE rowid IN (SELECT row_id FROM temp.removed_{table})")
+        last_rowid = connection.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM main.{table}").fetchone()[0]
+        connection.execute(
+            f"""
+            INSERT INTO main.{table} ({", ".join(columns)})
+            SELECT {", ".join(columns)} FROM temp.incoming_{table}
+            WHERE rowid IN (SELECT row_id FROM temp.added_{table})
+            ORDER BY rowid
+            """
+        )
+        if has_search_index:
+            connection.execute(
+                f"""
+                INSERT INTO {table}_search(rowid, {search_columns})
+                SELECT rowid, {search_columns} FROM main.{table} WHERE rowid > ?
+                """,
+                (last_rowid,),
+            )
+        return added, removed
+
+    def _metadata(self, key: str) -> str | None:
+        with self._reader() as connection:
+            return self._generation_metadata(connection, key) if connection is not None else None
+
+    @staticmethod
+    def _generation_metadata(connection: sqlite3.Connection, key: str) -> str | None:
+        if not connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'metadata'").fetchone():
+            return None
+        row = connection.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return str(row[0]) if row is not None else None
+
+    @staticmethod
+    def _build_search_index(connection: sqlite3.Connection) -> bool:
+        """Create FTS5 trigram tables over the product and hardware names when SQLite supports them."""
+        try:
+            connection.execute(
+                """
+                CREATE VIRTUAL TABLE software_search
+                USING fts5(name, content='software', content_rowid='rowid', tokenize='trigram')
+                """
+            )
+        except sqlite3.OperationalError as exception:
+            logger.info("SQLite lacks FTS5 trigram support; substring searches will scan the tables: %s", exception)
+            return False
+        connection.execute(
+            """
+            CREATE VIRTUAL TABLE hardware_search
+            USING fts5(manufacturer, model, content='hardware', content_rowid='rowid', tokenize='trigram')
+            """
+        )
+        connection.execute("INSERT INTO software_search(software_search) VALUES ('rebuild')")
+        connection.execute("INSERT INTO hardware_search(hardware_search) VALUES ('rebuild')")
+        return True
+
+    @staticmethod
+    def _build_match_index(connection: sqlite3.Connection, product_names: Mapping[str, Iterable[str]]) -> None:
+        """Store the ``product_key()`` of every product name, alias and label with an inverted trigram index."""
+        connection.execute(
+            """
+            CREATE TABLE product_keys (
+                product TEXT NOT NULL,
+                alias TEXT NOT NULL,
+                key TEXT NOT NULL,
+                trigrams INTEGER NOT NULL
+            )
+            """
+        )
+        connection.execute(
+            """
+            CREATE TABLE product_trigrams (
+                trigram TEXT NOT NULL,
+                key_id INTEGER NOT NULL,
+                PRIMARY KEY (trigram, key_id)
+            ) WITHOUT ROWID
+            """
+        )
+        products = [row[0] for row in connection.execute("SELECT DISTINCT name FROM main.software ORDER BY name")]
+        for product in products:
+            keys: set[str] = set()
+            for alias in (product, *product_names.get(product, ())):
+                key = product_key(alias)
+                if not key or key in keys:
+                    continue
+                keys.add(key)
+                key_trigrams = trigrams(key)
+                key_id = connection.execute(
+                    "INSERT INTO product_keys (product, alias, key, trigrams) VALUES (?, ?, ?, ?)",
+                    (product, alias, key, len(key_trigrams)),
+                ).lastrowid
+                connection.executemany(
+                    "INSERT INTO product_trigrams (trigram, key_id) VALUES (?, ?)",
+                    [(trigram, key_id) for trigram in key_trigrams],
+                )
+
+    @staticmethod
+    def _generation_product_names(connection: sqlite3.Connection) -> dict[str, list[str]]:
+        names: dict[str, list[str]] = defaultdict(list)
+        for product, alias in connection.execute(
+            "SELECT product, alias FROM product_keys WHERE alias <> product ORDER BY rowid"
+        ):
+            names[product].append(alias)
+        return names
+
+    @staticmethod
+    def _has_search_index(connection: sqlite3.Connection) -> bool:
+        if not _trigram_search_available():
+            return False
+        tables = connection.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ('software_search', 'hardware_search')"
+        ).fetchone()[0]
+        return bool(tables == 2)
+
+    def _search_index(self, connection: sqlite3.Connection) -> bool:
+        """Return ``_has_search_index()`` of a reader, as looked up once when a pooled or pinned one was opened."""
+        pooled: _PooledReader | None = getattr(self._local, "reader", None)
+        if pooled is not None and pooled.connection is connection:
+            return pooled.search_index
+        if connection is self._pinned:
+            return self._pinned_search_index
+        return self._has_search_index(connection)
+
     def _fetch_all(self, statement: str, parameters: tuple[str, ...]) -> list[tuple[str, ...]]:
-        if not self._path.is_file():
+        with self._reader() as connection:
+            if connection is None:
+                return []
+            return connection.execute(statement, parameters).fetchall()
+
+    def _iter_rows(
+        self, statement: str, parameters: tuple[object, ...], filters: Mapping[bool, str] | None = None
+    ) -> Generator[Any, None, None]:
+        """Yield the rows of ``statement`` in ``fetchmany`` batches while holding its connection open.
+
+        With ``filters``, the ``{filter}`` placeholder of ``statement`` is replaced
+        by the substring filter that suits the generation.
+        """
+        with self._reader() as connection:
+            if connection is None:
+                return
+            if filters is not None:
+                statement = statement.format(filter=filters[self._search_index(connection)].format(pattern="?"))
+            yield from self._fetch_batches(connection.execute(statement, parameters))
+
+    def _fetch_batches(self, cursor: sqlite3.Cursor) -> Iterator[Any]:
+        try:
+            while rows := cursor.fetchmany(self._FETCH_SIZE):
+                yield from rows
+        finally:
+            cursor.close()
+
+    def _fetch_batch(
+        self, terms: list[tuple[int, str, str | None]], statement: str, filters: Mapping[bool, str]
+    ) -> list[tuple[int, str, str, str]]:
+        """Run ``statement`` against a temporary ``batch_terms`` table holding ``terms``."""
+        if not terms:
             return []
-        connection: sqlite3.Connection | None = None
+        with self._reader() as connection:
+            if connection is None:
+                return []
+            try:
+                connection.execute("DROP TABLE IF EXISTS temp.batch_terms")
+                connection.execute(
+                    "CREATE TEMP TABLE batch_terms (position INTEGER PRIMARY KEY, pattern TEXT NOT NULL, version TEXT)"
+                )
+                connection.executemany("INSERT INTO temp.batch_terms VALUES (?, ?, ?)", terms)
+                search_filter = filters[self._search_index(connection)].format(pattern="terms.pattern")
+                return connection.execute(statement.format(filter=search_filter)).fetchall()
+            finally:
+                connection.rollback()
+                connection.execute("DROP TABLE IF EXISTS temp.batch_terms")
+
+    def _fetch_matches(
+        self, terms: list[tuple[int, str, int]], threshold: float
+    ) -> list[tuple[int, str, str, float]]:
+        """Rank stored product keys by Jaccard similarity to the ``(position, trigram, size)`` query terms."""
+        if not terms:
+            return []
+        with self._reader() as connection:
+            if connection is None or not connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'product_trigrams'"
+            ).fetchone():
+                return []
+            try:
+                connection.execute("DROP TABLE IF EXISTS temp.match_terms")
+                connection.execute(
+                    """
+                    CREATE TEMP TABLE match_terms (
+                        position INTEGER NOT NULL,
+                        trigram TEXT NOT NULL,
+                        size INTEGER NOT NULL,
+                        PRIMARY KEY (position, trigram)
+                    )
+                    """
+                )
+                connection.executemany("INSERT INTO temp.match_terms VALUES (?, ?, ?)", terms)
+                return connection.execute(
+                    """
+                    SELECT shared.position, keys.product, keys.alias,
+                        shared.count * 1.0 / (shared.size + keys.trigrams - shared.count) AS score
+                    FROM (
+                        SELECT terms.position, grams.key_id, terms.size, COUNT(*) AS count
+                        FROM temp.match_terms AS terms
+                        JOIN product_trigrams AS grams ON grams.trigram = terms.trigram
+                        GROUP BY terms.position, grams.key_id
+                    ) AS shared
+                    JOIN product_keys AS keys ON keys.rowid = shared.key_id
+                    WHERE score >= ?
+                    ORDER BY shared.position, score DESC, keys.product, keys.rowid
+                    """,
+                    (threshold,),
+                ).fetchall()
+            finally:
+                connection.rollback()
+                connection.execute("DROP TABLE IF EXISTS temp.match_terms")
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection | None]:
+        """Yield a read-only connection to the active cache, or ``None`` when no cache exists."""
         try:
-            connection = sqlite3.connect(f"{self._path.resolve().as_uri()}?mode=ro", uri=True)
-            return connection.execute(statement, parameters).fetchall()
+            if self._pinned is not None:
+                yield self._pinned
+                return
+            if self._persistent:
+                pooled = self._pooled_reader()
+                if pooled is None:
+                    yield None
+                    return
+                pooled.users += 1
+                try:
+                    yield pooled.connection
+                finally:
+                    pooled.users -= 1
+                    if pooled.released and not pooled.users:
+                        self._close_pooled(pooled)
+                return
+            if not self._path.is_file():
+                yield None
+                return
+            connection = self._open_reader()
+            try:
+                yield connection
+            finally:
+                connection.close()
         except sqlite3.Error as exception:
             raise CacheError(f"Could not read cache at {self._path}: {exception}") from exception
-        finally:
-            if connection is not None:
-                connection.close()
+
+    def _cached(self, key: Hashable, load: Callable[[], list[ResultT]]) -> list[ResultT]:
+        """Return the result of ``load`` through the result cache, keyed by ``key`` and the active generation."""
+        if self.result_cache is None:
+            return load()
+        generation = self._generation()
+        if generation is None:
+            return load()
+        return self.result_cache.lookup(self._cache_namespace, generation, key, load)
+
+    def _generation(self) -> GenerationId | None:
+        """Return the identity of the active cache file, which changes whenever a generation is installed."""
+        try:
+            status = self._path.stat()
+        except OSError:
+            return None
+        if not stat.S_ISREG(status.st_mode):
+            return None
+        return (status.st_dev, status.st_ino, status.st_mtime_ns, status.st_size)
+
+    def _pooled_reader(self) -> _PooledReader | None:
+        pooled: _PooledReader | None = getattr(self._local, "reader", None)
+        identity = self._generation()
+        if identity is None:
+            if pooled is not None:
+                self._release(pooled)
+            return None
+
+        if pooled is not None and pooled.identity == identity and pooled.epoch == self._pool_epoch:
+            return pooled
+        if pooled is not None:
+            self._release(pooled)
+            logger.debug("Reopening cache connection for %s after the cache file changed", self._path)
+
+        connection = (
+            self._open_memory_copy(identity) if self._in_memory else self._open_reader(check_same_thread=False)
+        )
+        try:
+            search_index = self._has_search_index(connection)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        pooled = _PooledReader(connection, identity, self._pool_epoch, search_index)
+        with self._pool_lock:
+            self._pool.append(connection)
+            self._local.reader = pooled
+        return pooled
+
+    def _release(self, pooled: _PooledReader) -> None:
+        """Stop reusing ``pooled`` in this thread, closing it once no stream reads through it anymore."""
+        self._local.reader = None
+        if pooled.users:
+            pooled.released = True
+            return
+        self._close_pooled(pooled)
+
+    def _close_pooled(self, pooled: _PooledReader) -> None:
+        with self._pool_lock:
+            if pooled.connection not in self._pool:
+                return
+            self._pool.remove(pooled.connection)
+        pooled.connection.close()
+
+    def _open_memory_copy(self, identity: GenerationId) -> sqlite3.Connection:
+        """Return a connection to the in-memory copy of the generation ``identity``, reading the file only once for it.
+
+        The copy is a shared-cache in-memory database that lives as long as a
+        connection to it is open. The snapshot keeps one connection as its
+        anchor, and a replaced snapshot is dropped once its last reader closes.
+        """
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.identity != identity:
+                uri = f"file:eolchecker-{uuid.uuid4().hex}?mode=memory&cache=shared"
+                loaded = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                source = self._open_reader()
+                try:
+                    source.backup(loaded)
+                finally:
+                    source.close()
+                if snapshot is not None:
+                    snapshot.connection.close()
+                logger.debug("Loaded the lifecycle cache generation at %s into memory", self._path)
+                self._snapshot = snapshot = _Snapshot(loaded, identity, uri)
+            return sqlite3.connect(
+                snapshot.uri, uri=True, cached_statements=self._STATEMENT_CACHE_SIZE, check_same_thread=False
+            )
+
+    def _open_reader(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        return sqlite3.connect(
+            f"{self._path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            cached_statements=self._STATEMENT_CACHE_SIZE,
+            check_same_thread=check_same_thread,
+        )
 
     @staticmethod
     def _normalized_query(value: str) -> str:
         return f"%{value.strip()}%"
+
+    @staticmethod
+    def _conditions(term: str, filters: Mapping[bool, str], patterns: int) -> tuple[list[str], tuple[object, ...]]:
+        """Return the substring filter condition for ``term``, or no condition for an empty term."""
+        if not term.strip():
+            return [], ()
+        return ["{filter}"], (Database._normalized_query(term),) * patterns
+
+    @staticmethod
+    def _where(conditions: list[str]) -> str:
+        return f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    @staticmethod
+    def _page(limit: int | None, offset: int) -> tuple[int, int]:
+        if (limit is not None and limit < 0) or offset < 0:
+            raise ValueError("limit and offset must not be negative")
+        return (-1 if limit is None else limit), offset
+
+    @staticmethod
+    def _page_size(limit: int) -> tuple[int, int]:
+        if limit < 1:
+            raise ValueError("limit must be positive")
+        # One row more than the page tells whether another page follows.
+        return limit + 1, 0
+
+    def _ordered_rows(
+        self, table: str, term: str, page: tuple[int, int], after: str | None
+    ) -> Generator[Any, None, None]:
+        """Yield the rows of ``table`` matching ``term`` in keyset order, each ending with its ``rowid``."""
+        columns, filters, patterns = _ORDERED_COLUMNS[table]
+        conditions, parameters = self._conditions(term, filters, patterns)
+        order = ", ".join(columns[:3])
+        if after is not None:
+            conditions.append(f"({order}, rowid) > (?, ?, ?, ?)")
+            parameters += _decode_cursor(after)
+        return self._iter_rows(
+            f"SELECT {', '.join(columns)}, rowid FROM {table}"
+            f"{self._where(conditions)} ORDER BY {order}, rowid LIMIT ? OFFSET ?",
+            (*parameters, *page),
+            filters,
+        )
+
+
+def _cache_term(value: str) -> str:
+    # LIKE and COLLATE NOCASE fold ASCII letters only, so terms that differ in ASCII case share a result.
+    return value.strip().translate(_ASCII_LOWERCASE)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as stream:
+        while chunk := stream.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _same_file(first: Path, second: Path) -> bool:
+    try:
+        return os.path.samefile(first, second)
+    except OSError:
+        return False
+
+
+def _link_or_copy(source: Path, destination: Path) -> None:
+    """Make ``destination`` a hard link to ``source``, or a copy where the file system has no hard links."""
+    destination.unlink(missing_ok=True)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+
+def _configure_bulk_load(connection: sqlite3.Connection) -> None:
+    for pragma in _BULK_LOAD_PRAGMAS:
+        connection.execute(f"PRAGMA {pragma}")
+
+
+def _fsync_path(path: Path) -> None:
+    descriptor = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _fsync_directory(path: Path) -> None:
+    """Persist a rename in ``path``; directories cannot be opened for syncing on Windows."""
+    if os.name == "nt":
+        return
+    _fsync_path(path)
+
+
+def _column_rows(
+    first: tuple[str, ...], second: tuple[str, ...], eols: tuple[str, ...], fourth: Iterable[str]
+) -> Iterator[tuple[str, str, str, str, str | None, str | None]]:
+    """Zip validated columns with the parsed date and precision of their EOL values into insertable rows."""
+    parsed = {eol: parse_eol_date(eol) for eol in set(eols)}
+    dates = {eol: eol_date for eol, (eol_date, _) in parsed.items()}
+    precisions = {eol: precision for eol, (_, precision) in parsed.items()}
+    return zip(
+        first, second, eols, fourth, map(dates.__getitem__, eols), map(precisions.__getitem__, eols), strict=True
+    )
+
+
+def _insert_statement(table: str, columns: tuple[str, ...]) -> str:
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+
+def _software_record(row: Any) -> SoftwareLifecycle:
+    return SoftwareLifecycle(name=row[0], version=row[1], eol=row[2])
+
+
+def _hardware_record(row: Any) -> HardwareLifecycle:
+    return HardwareLifecycle(manufacturer=row[0], model=row[1], eol=row[2], source=row[3])
+
+
+def _next_cursor(rows: list[Any], limit: int) -> str | None:
+    """Return the cursor behind the last of ``limit`` rows when ``rows`` holds more, otherwise ``None``."""
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    values = json.dumps([*last[:3], last[-1]], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(values).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str, str, int]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError) as exception:
+        raise ValueError(f"Invalid page cursor {cursor!r}") from exception
+    if (
+        not isinstance(values, list)
+        or len(values) != 4
+        or not all(isinstance(value, str) for value in values[:3])
+        or isinstance(values[3], bool)
+        or not isinstance(values[3], int)
+    ):
+        raise ValueError(f"Invalid page cursor {cursor!r}")
+    return values[0], values[1], values[2], values[3]
+
+
+def _records(rows: Generator[Any, None, None], record: Callable[[Any], ResultT]) -> Generator[ResultT, None, None]:
+    """Map ``rows`` to records, closing the row cursor and its connection when the records are closed."""
+    try:
+        for row in rows:
+            yield record(row)
+    finally:
+        rows.close()
+
+
+def _change_report(added: list[LifecycleRecord], removed: list[LifecycleRecord]) -> ChangeReport:
+    """Pair added and removed records with the same identity into EOL changes."""
+    removed_by_key: dict[tuple[str, ...], list[LifecycleRecord]] = defaultdict(list)
+    for record in removed:
+        removed_by_key[_change_key(record)].append(record)
+    remaining_added: list[LifecycleRecord] = []
+    changes: list[EolChange] = []
+    for record in added:
+        candidates = removed_by_key.get(_change_key(record))
+        if candidates:
+            changes.append(EolChange(previous=candidates.pop(0), current=record))
+        else:
+            remaining_added.append(record)
+    paired = {id(change.previous) for change in changes}
+    return ChangeReport(
+        added=tuple(remaining_added),
+        removed=tuple(record for record in removed if id(record) not in paired),
+        changed=tuple(changes),
+    )
+
+
+def _change_key(record: LifecycleRecord) -> tuple[str, ...]:
+    if isinstance(record, SoftwareLifecycle):
+        return ("software", record.name, record.version)
+    return ("hardware", record.manufacturer, record.model, record.source)
+
+
+@functools.cache
+def _trigram_search_available() -> bool:
+    """Return whether the linked SQLite library provides the FTS5 trigram tokenizer."""
+    connection = sqlite3.connect(":memory:")
+    try:
+        connection.execute("CREATE VIRTUAL TABLE probe USING fts5(value, tokenize='trigram')")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        connection.close()
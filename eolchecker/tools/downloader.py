@@ -1,26 +1,50 @@
 from __future__ import annotations
 
+import contextvars
 import json
 import logging
-from collections.abc import Mapping
-from typing import Any, Final
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_EXCEPTION, Executor, Future, ThreadPoolExecutor, wait
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Final, TypeVar
+from urllib.parse import quote
 
 import requests
-from bs4 import BeautifulSoup, Tag
-from requests.adapters import HTTPAdapter
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 from urllib3.util.retry import Retry
 
-from ..models import HardwareLifecycle, SoftwareLifecycle
-
-logger = logging.getLogger(__name__)
+from ..models import HardwareColumns, HardwareLifecycle, SoftwareColumns, SoftwareLifecycle, SourceValidator
+from .errors import CacheError, SourceError
+from .htmltables import TABLE_EXTRACTORS
+from .jsonstream import iter_array_items
+from .metrics import RefreshMetrics
 
+if TYPE_CHECKING:
+    from .database import Database
 
-class SourceError(RuntimeError):
-    """Raised when an upstream source cannot provide a validated dataset."""
+logger = logging.getLogger(__name__)
+# Column lists that a source is parsed into; SoftwareColumns and HardwareColumns validate them once, when assembled.
+_SoftwareLists = tuple[list[str], list[str], list[str]]
+_HardwareLists = tuple[list[str], list[str], list[str], list[str]]
+ListsT = TypeVar("ListsT", _SoftwareLists, _HardwareLists)
+ResultT = TypeVar("ResultT")
+# The cancellation events of the retrievals that the current thread works for; see Downloader.run_cancellable().
+_CANCELLATIONS: Final[contextvars.ContextVar[tuple[threading.Event, ...]]] = contextvars.ContextVar(
+    "eolchecker_cancellations", default=()
+)
 
 
 class Downloader:
-    """Retrieve and validate lifecycle records from their upstream sources."""
+    """Retrieve and validate lifecycle records from their upstream sources.
+
+    When a ``cache`` is supplied, sources are revalidated with the HTTP
+    validators stored in its active generation. A source that answers
+    ``304 Not Modified`` reuses the cached records instead of being parsed again.
+    Stage timings, byte, record and retry counts of every source are collected
+    in ``metrics``. ``software_api`` and ``hardware_url`` replace the upstream
+    base URLs, for example with a mirror or a local replay server.
+    """
 
     SOFTWARE_EOL_API: Final[str] = "https://endoflife.date/api/v1"
     HARDWARE_EOL_URL: Final[str] = "https://www.hardwarewartung.com/en"
@@ -36,15 +60,36 @@ class Downloader:
         "hitachi-end-of-life-en",
     )
     _REQUIRED_HARDWARE_COLUMNS: Final[frozenset[str]] = frozenset({"manufacturer", "model"})
+    _STREAM_CHUNK_SIZE: Final[int] = 64 * 1024
 
     def __init__(
         self,
         session: requests.Session | None = None,
         timeout: tuple[float, float] = (5.0, 30.0),
+        max_workers: int = 1,
+        cache: Database | None = None,
+        hardware_parser: str = "events",
+        metrics: RefreshMetrics | None = None,
+        software_api: str | None = None,
+        hardware_url: str | None = None,
     ) -> None:
-        self._session = session or self._new_session()
+        if max_workers < 1:
+            raise ValueError("Downloader max_workers must be at least 1")
+        if hardware_parser not in TABLE_EXTRACTORS:
+            raise ValueError(f"Unknown hardware parser {hardware_parser!r}")
+        self._session = session or self._new_session(max_workers)
         self._owns_session = session is None
         self._timeout = timeout
+        self._max_workers = max_workers
+        self._extract_tables = TABLE_EXTRACTORS[hardware_parser]
+        self._software_api = (software_api or self.SOFTWARE_EOL_API).rstrip("/")
+        self._hardware_url = (hardware_url or self.HARDWARE_EOL_URL).rstrip("/")
+        self._cache = cache
+        self._previous_validators = self._load_validators(cache)
+        self._validators: dict[str, SourceValidator] = {}
+        self._product_names: dict[str, tuple[str, ...]] = {}
+        self._cancelled = threading.Event()
+        self.metrics = metrics if metrics is not None else RefreshMetrics()
 
     def __enter__(self) -> Downloader:
         return self
@@ -56,64 +101,335 @@ class Downloader:
         if self._owns_session:
             self._session.close()
 
+    def cancel(self) -> None:
+        """Make all retrievals, running or future, fail with ``SourceError`` at their next request or chunk."""
+        self._cancelled.set()
+
+    def run_cancellable(self, cancelled: threading.Event, function: Callable[..., ResultT], *args: Any) -> ResultT:
+        """Return ``function(*args)``, stopping the retrievals it makes, and only those, once ``cancelled`` is set.
+
+        ``function`` is a retrieval method of this downloader. Setting
+        ``cancelled`` from another thread makes it fail with ``SourceError`` at
+        its next request or chunk, while other retrievals of the same
+        downloader continue.
+        """
+        token = _CANCELLATIONS.set((*_CANCELLATIONS.get(), cancelled))
+        try:
+            return function(*args)
+        finally:
+            _CANCELLATIONS.reset(token)
+
+    @property
+    def validators(self) -> dict[str, SourceValidator]:
+        """HTTP validators of the sources retrieved or revalidated by this downloader."""
+        return dict(self._validators)
+
+    @property
+    def product_names(self) -> dict[str, tuple[str, ...]]:
+        """Aliases and labels of the software products retrieved so far, keyed by product name."""
+        return dict(self._product_names)
+
+    def get_eol_datasets(
+        self, products: Iterable[str] | None = None, manufacturers: Iterable[str] | None = None
+    ) -> tuple[list[SoftwareLifecycle], list[HardwareLifecycle]]:
+        """Retrieve the software and hardware datasets concurrently as records, as with ``get_eol_columns()``."""
+        software, hardware = self.get_eol_columns(products, manufacturers)
+        return software.records(), hardware.records()
+
+    def get_eol_columns(
+        self, products: Iterable[str] | None = None, manufacturers: Iterable[str] | None = None
+    ) -> tuple[SoftwareColumns, HardwareColumns]:
+        """Retrieve the software and hardware datasets concurrently and return them as validated columns.
+
+        ``products`` and ``manufacturers`` limit the retrieval as with
+        ``get_eol_products()`` and ``get_eol_hardware()``.
+        """
+        failed = threading.Event()
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="eolchecker-dataset") as executor:
+            if products is None:
+                software = self._submit(executor, self.run_cancellable, failed, self._software_feed_lists)
+            else:
+                software = self._submit(executor, self.run_cancellable, failed, self._product_lists, products)
+            hardware = self._submit(executor, self.run_cancellable, failed, self._hardware_lists, manufacturers)
+            futures: list[Future[Any]] = [software, hardware]
+            try:
+                done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            except BaseException:
+                failed.set()
+                raise
+            errors = [error for future in futures if future in done and (error := future.exception()) is not None]
+            if errors:
+                failed.set()
+                wait(futures)
+                raise errors[0]
+        names, versions, eols = software.result()
+        manufacturers_column, models, hardware_eols, sources = hardware.result()
+        try:
+            return (
+                SoftwareColumns(tuple(names), tuple(versions), tuple(eols)),
+                HardwareColumns(tuple(manufacturers_column), tuple(models), tuple(hardware_eols), tuple(sources)),
+            )
+        except ValueError as exception:
+            raise SourceError(f"Source datasets contain invalid lifecycle values: {exception}") from exception
+
     def get_eol_software(self) -> list[SoftwareLifecycle]:
         """Retrieve all release cycles from the endoflife.date v1 full-product feed."""
-        payload = self._get_json(f"{self.SOFTWARE_EOL_API}/products/full")
+        url = f"{self._software_api}/products/full"
+        response = self._get_changed_response(url, self._cached_software)
+        if isinstance(response, tuple):
+            return self._software_records_of(response)
+        with self.metrics.stage("decode", url):
+            payload = self._json_payload(url, response)
         products = payload.get("result")
         if not isinstance(products, list):
             raise SourceError("Software source response does not contain a product result list")
 
-        records: list[SoftwareLifecycle] = []
-        for product in products:
-            if not isinstance(product, Mapping):
-                raise SourceError("Software source contains a non-object product")
-            product_name = product.get("name")
-            releases = product.get("releases")
-            if not isinstance(product_name, str) or not product_name.strip():
-                raise SourceError("Software source contains a product without a name")
-            if not isinstance(releases, list):
-                raise SourceError(f"Software source product {product_name!r} has no release list")
-            for release in releases:
-                if not isinstance(release, Mapping):
-                    raise SourceError(f"Software source product {product_name!r} has an invalid release")
-                try:
-                    records.append(SoftwareLifecycle.from_v1_release(product_name, release))
-                except ValueError as exception:
-                    raise SourceError(
-                        f"Software source product {product_name!r} contains an invalid release"
-                    ) from exception
-
+        with self.metrics.stage("validate", url):
+            records = [record for product in products for record in self._software_records(product)]
+        self.metrics.count(url, records=len(records))
         if not records:
             raise SourceError("Software source returned no lifecycle records")
         logger.info("Retrieved %s software lifecycle records", len(records))
         return records
 
-    def get_eol_hardware(self) -> list[HardwareLifecycle]:
-        """Retrieve lifecycle records from all configured hardware source pages."""
-        records: list[HardwareLifecycle] = []
-        for manufacturer_path in self.HARDWARE_MANUFACTURERS:
-            url = f"{self.HARDWARE_EOL_URL}/{manufacturer_path}"
-            page = self._get_response(url).content
-            page_records = self._parse_hardware_page(page, url)
-            if not page_records:
-                raise SourceError(f"Hardware source {url} returned no valid lifecycle records")
-            records.extend(page_records)
+    def iter_eol_software(self) -> Iterator[SoftwareLifecycle]:
+        """Stream release cycles from the full-product feed one product at a time.
 
-        if not records:
-            raise SourceError("Hardware source returned no lifecycle records")
-        logger.info("Retrieved %s hardware lifecycle records", len(records))
-        return records
+        The response body is decoded incrementally, so neither the raw document
+        nor its decoded object tree is held in memory. Validation failures raise
+        ``SourceError`` when the offending product is reached; a consumer such as
+        ``Database.save`` must discard everything read from a failed iterator.
+        """
+        url = f"{self._software_api}/products/full"
+        response = self._get_changed_response(url, self._cached_software, stream=True)
+        if isinstance(response, tuple):
+            yield from self._software_records_of(response)
+            return
+
+        with response:
+            self._check_json_content_type(url, response)
+            count = 0
+            for product in self._stream_products(url, response):
+                with self.metrics.stage("validate", url):
+                    records = self._software_records(product)
+                count += len(records)
+                self.metrics.count(url, records=len(records))
+                yield from records
+
+        if not count:
+            raise SourceError("Software source returned no lifecycle records")
+        logger.info("Streamed %s software lifecycle records", count)
+
+    def get_eol_products(self, products: Iterable[str]) -> list[SoftwareLifecycle]:
+        """Retrieve the release cycles of the named products from their endoflife.date v1 endpoints.
+
+        Products are fetched by up to ``max_workers`` threads and validated
+        like the full-product feed. Records are returned in the order of
+        ``products``, and a product that is unknown upstream or has no release
+        cycles fails the whole dataset.
+        """
+        return self._software_records_of(self._product_lists(products))
+
+    def get_eol_hardware(self, manufacturers: Iterable[str] | None = None) -> list[HardwareLifecycle]:
+        """Retrieve lifecycle records from all configured hardware source pages.
+
+        Pages are fetched by up to ``max_workers`` threads. Records are always
+        returned in ``HARDWARE_MANUFACTURERS`` order, and any failed or empty
+        page fails the whole dataset. ``manufacturers``, such as ``"dell"``,
+        limits the retrieval to the pages of those manufacturers.
+        """
+        return self._hardware_records_of(self._hardware_lists(manufacturers))
 
     def html_to_json(self, content: bytes, indent: int | None = None) -> str:
         """Return validated, normalized hardware rows as JSON for compatibility."""
         rows = self._extract_hardware_rows(content, "provided HTML")
         return json.dumps(rows, indent=indent)
 
-    def _get_json(self, url: str) -> Mapping[str, Any]:
-        response = self._get_response(url)
+    def parse_software_feed(self, content: bytes) -> list[SoftwareLifecycle]:
+        """Return the validated release cycles of a ``/products/full`` document, such as a recorded response."""
+        try:
+            payload = json.loads(content)
+        except ValueError as exception:
+            raise SourceError("Software feed is not valid JSON") from exception
+        products = payload.get("result") if isinstance(payload, Mapping) else None
+        if not isinstance(products, list):
+            raise SourceError("Software source response does not contain a product result list")
+        return [record for product in products for record in self._software_records(product)]
+
+    def parse_hardware_page(self, content: bytes, source: str) -> list[HardwareLifecycle]:
+        """Return the validated records of a hardware source page, skipping rows that describe none."""
+        return self._hardware_records_of(self._parse_hardware_lists(content, source))
+
+    def _fetch_concurrently(
+        self, fetch: Callable[[str], ListsT], keys: list[str], thread_name_prefix: str
+    ) -> list[ListsT]:
+        """Return ``fetch(key)`` of every key in order, calling it from up to ``max_workers`` threads."""
+        if self._max_workers == 1 or len(keys) < 2:
+            return [fetch(key) for key in keys]
+        with ThreadPoolExecutor(
+            max_workers=min(self._max_workers, len(keys)), thread_name_prefix=thread_name_prefix
+        ) as executor:
+            futures = [self._submit(executor, fetch, key) for key in keys]
+            try:
+                return [future.result() for future in futures]
+            except BaseException:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+
+    @staticmethod
+    def _submit(executor: Executor, function: Callable[..., ResultT], *args: Any) -> Future[ResultT]:
+        """Submit ``function(*args)`` with the cancellation events of the calling thread."""
+        return executor.submit(contextvars.copy_context().run, function, *args)
+
+    def _manufacturer_paths(self, manufacturers: Iterable[str]) -> list[str]:
+        """Return the configured pages of ``manufacturers``, given by name or page path, in configured order."""
+        paths = {path.split("-end-of-life", 1)[0]: path for path in self.HARDWARE_MANUFACTURERS}
+        selected = {manufacturer.strip().casefold() for manufacturer in manufacturers if manufacturer.strip()}
+        unknown = sorted(name for name in selected if name not in paths and name not in paths.values())
+        if unknown:
+            raise SourceError(f"Unknown hardware manufacturers {', '.join(unknown)}; choose from {', '.join(paths)}")
+        return [path for name, path in paths.items() if name in selected or path in selected]
+
+    def _software_feed_lists(self) -> _SoftwareLists:
+        url = f"{self._software_api}/products/full"
+        response = self._get_changed_response(url, self._cached_software, stream=True)
+        if isinstance(response, tuple):
+            return response
+
+        lists: _SoftwareLists = ([], [], [])
+        with response:
+            self._check_json_content_type(url, response)
+            for product in self._stream_products(url, response):
+                count = len(lists[0])
+                with self.metrics.stage("validate", url):
+                    self._add_software_product(product, lists)
+                self.metrics.count(url, records=len(lists[0]) - count)
+
+        if not lists[0]:
+            raise SourceError("Software source returned no lifecycle records")
+        logger.info("Streamed %s software lifecycle records", len(lists[0]))
+        return lists
+
+    def _product_lists(self, products: Iterable[str]) -> _SoftwareLists:
+        names = list(dict.fromkeys(product.strip() for product in products if product.strip()))
+        lists: _SoftwareLists = ([], [], [])
+        for product_lists in self._fetch_concurrently(self._get_product, names, "eolchecker-software"):
+            for column, values in zip(lists, product_lists, strict=True):
+                column.extend(values)
+        logger.info("Retrieved %s software lifecycle records of %s products", len(lists[0]), len(names))
+        return lists
+
+    def _hardware_lists(self, manufacturers: Iterable[str] | None) -> _HardwareLists:
+        lists: _HardwareLists = ([], [], [], [])
+        if manufacturers is None:
+            manufacturer_paths: list[str] = list(self.HARDWARE_MANUFACTURERS)
+        else:
+            manufacturer_paths = self._manufacturer_paths(manufacturers)
+            if not manufacturer_paths:
+                return lists
+        urls = [f"{self._hardware_url}/{manufacturer_path}" for manufacturer_path in manufacturer_paths]
+        for page_lists in self._fetch_concurrently(self._get_hardware_page, urls, "eolchecker-hardware"):
+            for column, values in zip(lists, page_lists, strict=True):
+                column.extend(values)
+        if not lists[0]:
+            raise SourceError("Hardware source returned no lifecycle records")
+        logger.info("Retrieved %s hardware lifecycle records", len(lists[0]))
+        return lists
+
+    def _get_product(self, product: str) -> _SoftwareLists:
+        url = f"{self._software_api}/products/{quote(product, safe='')}"
+        response = self._get_changed_response(url, lambda _: self._cached_product(product))
+        if isinstance(response, tuple):
+            return response
+        with self.metrics.stage("decode", url):
+            payload = self._json_payload(url, response)
+        lists: _SoftwareLists = ([], [], [])
+        with self.metrics.stage("validate", url):
+            self._add_software_product(payload.get("result"), lists)
+        if not lists[0]:
+            raise SourceError(f"Software source {url} returned no lifecycle records")
+        self.metrics.count(url, records=len(lists[0]))
+        return lists
+
+    def _software_records(self, product: object) -> list[SoftwareLifecycle]:
+        lists: _SoftwareLists = ([], [], [])
+        product_name = self._add_software_product(product, lists)
+        try:
+            return [SoftwareLifecycle(*row) for row in zip(*lists, strict=True)]
+        except ValueError as exception:
+            raise SourceError(f"Software source product {product_name!r} contains an invalid release") from exception
+
+    @staticmethod
+    def _software_records_of(lists: _SoftwareLists) -> list[SoftwareLifecycle]:
+        try:
+            return [SoftwareLifecycle(*row) for row in zip(*lists, strict=True)]
+        except ValueError as exception:
+            raise SourceError(f"Software source contains an invalid release: {exception}") from exception
+
+    @staticmethod
+    def _hardware_records_of(lists: _HardwareLists) -> list[HardwareLifecycle]:
+        return [HardwareLifecycle(*row) for row in zip(*lists, strict=True)]
+
+    def _add_software_product(self, product: object, lists: _SoftwareLists) -> str:
+        """Append the release cycles of a v1 ``product`` to ``lists`` unvalidated, and return the product name."""
+        if not isinstance(product, Mapping):
+            raise SourceError("Software source contains a non-object product")
+        product_name = product.get("name")
+        releases = product.get("releases")
+        if not isinstance(product_name, str) or not product_name.strip():
+            raise SourceError("Software source contains a product without a name")
+        if not isinstance(releases, list):
+            raise SourceError(f"Software source product {product_name!r} has no release list")
+        name = product_name.strip()
+        self._product_names[name] = self._alternative_names(product)
+        names, versions, eols = lists
+        for release in releases:
+            if not isinstance(release, Mapping):
+                raise SourceError(f"Software source product {product_name!r} has an invalid release")
+            _, version, eol = SoftwareLifecycle.v1_release_row(name, release)
+            names.append(name)
+            versions.append(version)
+            eols.append(eol)
+        return name
+
+    @staticmethod
+    def _alternative_names(product: Mapping[str, Any]) -> tuple[str, ...]:
+        aliases = product.get("aliases")
+        names = [*(aliases if isinstance(aliases, list) else ()), product.get("label")]
+        return tuple(dict.fromkeys(name.strip() for name in names if isinstance(name, str) and name.strip()))
+
+    def _stream_products(self, url: str, response: requests.Response) -> Iterator[object]:
+        products = iter_array_items(self._counted_chunks(url, response), "result")
+        while True:
+            try:
+                with self.metrics.stage("stream", url):
+                    product = next(products)
+            except StopIteration:
+                return
+            except ValueError as exception:
+                raise SourceError(f"Source {url} returned an invalid product list: {exception}") from exception
+            except requests.RequestException as exception:
+                raise SourceError(f"Could not retrieve source {url}: {exception}") from exception
+            yield product
+
+    def _counted_chunks(self, url: str, response: requests.Response) -> Iterator[bytes]:
+        for chunk in response.iter_content(chunk_size=self._STREAM_CHUNK_SIZE):
+            self._check_cancelled(url)
+            self.metrics.count(url, bytes=len(chunk))
+            yield chunk
+
+    def _check_cancelled(self, url: str) -> None:
+        if self._cancelled.is_set() or any(cancelled.is_set() for cancelled in _CANCELLATIONS.get()):
+            raise SourceError(f"Retrieval of source {url} was cancelled")
+
+    @staticmethod
+    def _check_json_content_type(url: str, response: requests.Response) -> None:
         content_type = response.headers.get("Content-Type", "")
         if "json" not in content_type.casefold():
             raise SourceError(f"Source {url} returned unexpected content type {content_type!r}")
+
+    def _json_payload(self, url: str, response: requests.Response) -> Mapping[str, Any]:
+        self._check_json_content_type(url, response)
         try:
             payload = response.json()
         except ValueError as exception:
@@ -122,41 +438,151 @@ class Downloader:
             raise SourceError(f"Source {url} returned a non-object JSON document")
         return payload
 
-    def _get_response(self, url: str) -> requests.Response:
+    def _get_changed_response(
+        self, url: str, load_cached: Callable[[str], ListsT], stream: bool = False
+    ) -> requests.Response | ListsT:
+        """Return a fresh response, or the values of the cached records when the source is unchanged."""
+        validator = self._previous_validators.get(url)
+        if validator is not None:
+            response = self._get_response(url, validator, stream)
+            if response.status_code != HTTPStatus.NOT_MODIFIED:
+                return response
+            try:
+                with self.metrics.stage("cache_read", url):
+                    cached = load_cached(url)
+            except CacheError as exception:
+                logger.warning("Could not reuse cached records for %s: %s", url, exception)
+                cached = None
+            if cached is not None and cached[0]:
+                self.metrics.count(url, records=len(cached[0]), not_modified=True)
+                self._validators[url] = SourceValidator.from_headers(url, response.headers) or validator
+                logger.info("Source %s is unchanged; reusing %s cached records", url, len(cached[0]))
+                return cached
+            logger.info("Source %s is unchanged but has no cached records; downloading it again", url)
+        return self._get_response(url, stream=stream)
+
+    def _get_response(
+        self, url: str, validator: SourceValidator | None = None, stream: bool = False
+    ) -> requests.Response:
+        headers = validator.request_headers() if validator is not None else {}
+        self._check_cancelled(url)
         try:
-            response = self._session.get(url, timeout=self._timeout)
+            with self.metrics.stage("download", url):
+                response = self._session.get(url, timeout=self._timeout, headers=headers, stream=stream)
+            self.metrics.count(url, retries=self._retries(response))
             response.raise_for_status()
-            return response
         except requests.RequestException as exception:
             raise SourceError(f"Could not retrieve source {url}: {exception}") from exception
+        # Unstreamed bodies are read by the request itself; streamed ones are counted as chunks arrive.
+        self.metrics.count(url, bytes=0 if stream else len(response.content))
+        if not headers or response.status_code != HTTPStatus.NOT_MODIFIED:
+            fresh_validator = SourceValidator.from_headers(url, response.headers)
+            if fresh_validator is not None:
+                self._validators[url] = fresh_validator
+        return response
 
-    def _parse_hardware_page(self, content: bytes, source: str) -> list[HardwareLifecycle]:
-        rows = self._extract_hardware_rows(content, source)
-        records: list[HardwareLifecycle] = []
-        for row in rows:
-            try:
-                records.append(HardwareLifecycle.from_dict(row))
-            except ValueError as exception:
-                logger.warning("Skipping invalid hardware row from %s: %s", source, exception)
-        return records
+    @staticmethod
+    def _retries(response: requests.Response) -> int:
+        """Return how many attempts the urllib3 ``Retry`` of the adapter spent before ``response``."""
+        retries = getattr(getattr(response, "raw", None), "retries", None)
+        return len(getattr(retries, "history", ()) or ())
+
+    def _cached_software(self, _: str) -> _SoftwareLists:
+        lists: _SoftwareLists = ([], [], [])
+        if self._cache is not None:
+            self._product_names = self._cache.product_names()
+            self._add_software_records(self._cache.all_software(), lists)
+        return lists
+
+    def _cached_product(self, product: str) -> _SoftwareLists:
+        lists: _SoftwareLists = ([], [], [])
+        if self._cache is None:
+            return lists
+        self._add_software_records(
+            (record for record in self._cache.search_software(product) if record.name == product), lists
+        )
+        if lists[0]:
+            self._product_names[product] = self._cache.product_names().get(product, ())
+        return lists
+
+    @staticmethod
+    def _add_software_records(records: Iterable[SoftwareLifecycle], lists: _SoftwareLists) -> None:
+        names, versions, eols = lists
+        for record in records:
+            names.append(record.name)
+            versions.append(record.version)
+            eols.append(record.eol)
+
+    def _cached_hardware(self, url: str) -> _HardwareLists:
+        lists: _HardwareLists = ([], [], [], [])
+        if self._cache is not None:
+            manufacturers, models, eols, sources = lists
+            for record in self._cache.hardware_for_source(url):
+                manufacturers.append(record.manufacturer)
+                models.append(record.model)
+                eols.append(record.eol)
+                sources.append(record.source)
+        return lists
+
+    def _get_hardware_page(self, url: str) -> _HardwareLists:
+        response = self._get_changed_response(url, self._cached_hardware)
+        if isinstance(response, tuple):
+            return response
+        page = response.content
+        lists = self._parse_hardware_lists(page, url)
+        if not lists[0]:
+            raise SourceError(f"Hardware source {url} returned no valid lifecycle records")
+        self.metrics.count(url, records=len(lists[0]))
+        return lists
+
+    def _parse_hardware_lists(self, content: bytes, source: str) -> _HardwareLists:
+        with self.metrics.stage("parse", source):
+            tables = self._hardware_tables(content, source)
+        lists: _HardwareLists = ([], [], [], [])
+        with self.metrics.stage("validate", source):
+            self._add_hardware_tables(tables, source, lists)
+        return lists
+
+    @staticmethod
+    def _add_hardware_tables(
+        tables: list[tuple[dict[str, int], list[list[str]]]], source: str, lists: _HardwareLists
+    ) -> None:
+        """Append the values of the table rows that describe a record to ``lists``, skipping the others."""
+        manufacturers, models, eols, sources = lists
+        for positions, cell_rows in tables:
+            for cells in cell_rows:
+                try:
+                    manufacturer, model, eol, _ = HardwareLifecycle.row_from_cells(cells, positions, source)
+                except ValueError as exception:
+                    logger.warning("Skipping invalid hardware row from %s: %s", source, exception)
+                    continue
+                manufacturers.append(manufacturer)
+                models.append(model)
+                eols.append(eol)
+                sources.append(source)
 
     def _extract_hardware_rows(self, content: bytes, source: str) -> list[dict[str, str]]:
-        soup = BeautifulSoup(content, "html.parser")
-        rows: list[dict[str, str]] = []
-        tables = soup.find_all("table")
+        return [
+            dict(zip(positions, cells, strict=True))
+            for positions, cell_rows in self._hardware_tables(content, source)
+            for cells in cell_rows
+        ]
+
+    def _hardware_tables(self, content: bytes, source: str) -> list[tuple[dict[str, int], list[list[str]]]]:
+        """Return the column positions and complete data rows of every recognized hardware table."""
+        tables = self._extract_tables(content)
         if not tables:
             raise SourceError(f"Hardware source {source} contains no tables")
 
+        recognized: list[tuple[dict[str, int], list[list[str]]]] = []
         for table in tables:
-            if not isinstance(table, Tag):
-                continue
-            headers = self._headers_for_table(table)
+            headers = self._headers_for_table(table.headers)
             if not headers or not self._REQUIRED_HARDWARE_COLUMNS.issubset(headers):
                 continue
-            for row in table.find_all("tr"):
-                if not isinstance(row, Tag):
-                    continue
-                cells = row.find_all("td", recursive=False)
+            positions = {header: index for index, header in enumerate(headers)}
+            required = [positions[column] for column in self._REQUIRED_HARDWARE_COLUMNS]
+            rows: list[list[str]] = []
+            for cells in table.rows:
                 if not cells:
                     continue
                 if len(cells) != len(headers):
@@ -167,29 +593,20 @@ class Downloader:
                         len(cells),
                     )
                     continue
-                values = {
-                    header: cell.get_text(" ", strip=True)
-                    for header, cell in zip(headers, cells, strict=True)
-                }
-                if any(not values[column] for column in self._REQUIRED_HARDWARE_COLUMNS):
+                if any(not cells[position] for position in required):
                     logger.warning("Skipping hardware row from %s with blank required values", source)
                     continue
-                rows.append(values)
+                rows.append(cells)
+            if rows:
+                recognized.append((positions, rows))
 
-        if not rows:
+        if not recognized:
             raise SourceError(f"Hardware source {source} contains no recognized data rows")
-        return rows
+        return recognized
 
     @staticmethod
-    def _headers_for_table(table: Tag) -> list[str]:
-        header_row = table.find("thead")
-        if not isinstance(header_row, Tag):
-            return []
-        headers = header_row.find_all("th")
-        normalized_headers = [
-            Downloader._normalize_hardware_header(header.get_text(" ", strip=True))
-            for header in headers
-        ]
+    def _headers_for_table(headers: list[str]) -> list[str]:
+        normalized_headers = [Downloader._normalize_hardware_header(header) for header in headers]
         if not normalized_headers or len(set(normalized_headers)) != len(normalized_headers):
             return []
         return normalized_headers
@@ -207,7 +624,17 @@ class Downloader:
         return aliases.get(normalized, normalized.replace(" ", "_"))
 
     @staticmethod
-    def _new_session() -> requests.Session:
+    def _load_validators(cache: Database | None) -> dict[str, SourceValidator]:
+        if cache is None:
+            return {}
+        try:
+            return cache.source_validators()
+        except CacheError as exception:
+            logger.warning("Ignoring unreadable source validators; downloading every source: %s", exception)
+            return {}
+
+    @staticmethod
+    def _new_session(max_workers: int = 1) -> requests.Session:
         retry = Retry(
             total=3,
             connect=3,
@@ -221,5 +648,8 @@ class Downloader:
         )
         session = requests.Session()
         session.headers.update({"User-Agent": "eolchecker/0.2.0"})
-        session.mount("https://", HTTPAdapter(max_retries=retry))
+        adapter = HTTPAdapter(max_retries=retry, pool_maxsize=max(max_workers, DEFAULT_POOLSIZE))
+        session.mount("https://", adapter)
+        # Plain HTTP is only used for configured mirrors and local replay servers.
+        session.mount("http://", adapter)
         return session
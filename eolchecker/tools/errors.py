@@ -0,0 +1,9 @@
+from __future__ import annotations
+
+
+class CacheError(RuntimeError):
+    """Raised when the lifecycle cache cannot be read or safely replaced."""
+
+
+class SourceError(RuntimeError):
+    """Raised when an upstream source cannot provide a validated dataset."""
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Final
+
+# Void elements never receive children, matching BeautifulSoup's HTML tree builder.
+_VOID_ELEMENTS: Final[frozenset[str]] = frozenset(
+    {
+        "area", "base", "basefont", "bgsound", "br", "col", "command", "embed", "frame", "hr", "image",
+        "img", "input", "isindex", "keygen", "link", "menuitem", "meta", "nextid", "param", "source",
+        "spacer", "track", "wbr",
+    }
+)
+# Strings inside these elements are not treated as text by BeautifulSoup's get_text().
+_NON_TEXT_ELEMENTS: Final[frozenset[str]] = frozenset({"rp", "rt", "script", "style", "template"})
+_BYTE_ORDER_MARKS: Final[tuple[tuple[bytes, str], ...]] = (
+    (b"\xef\xbb\xbf", "utf-8"),
+    (b"\xff\xfe", "utf-16-le"),
+    (b"\xfe\xff", "utf-16-be"),
+)
+_DECLARED_CHARSET: Final = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([a-zA-Z0-9_:.-]+)", re.IGNORECASE)
+
+
+@dataclass(slots=True)
+class RawTable:
+    """The stripped header and data cell text of one HTML table.
+
+    ``headers`` holds the ``th`` cells of the first ``thead`` inside the table
+    and ``rows`` holds the direct ``td`` cells of every ``tr`` inside the table,
+    both in document order.
+    """
+
+    headers: list[str] = field(default_factory=list)
+    rows: list[list[str]] = field(default_factory=list)
+
+
+def extract_tables_beautifulsoup(content: bytes) -> list[RawTable]:
+    """Extract tables by building a complete BeautifulSoup document tree."""
+    from bs4 import BeautifulSoup, Tag
+
+    soup = BeautifulSoup(content, "html.parser")
+    tables: list[RawTable] = []
+    for table in soup.find_all("table"):
+        if not isinstance(table, Tag):
+            continue
+        header_row = table.find("thead")
+        headers = (
+            [header.get_text(" ", strip=True) for header in header_row.find_all("th")]
+            if isinstance(header_row, Tag)
+            else []
+        )
+        rows = [
+            [cell.get_text(" ", strip=True) for cell in row.find_all("td", recursive=False)]
+            for row in table.find_all("tr")
+            if isinstance(row, Tag)
+        ]
+        tables.append(RawTable(headers=headers, rows=rows))
+    return tables
+
+
+def extract_tables_events(content: bytes) -> list[RawTable]:
+    """Extract tables from parser events without building a document tree."""
+    parser = _TableEventParser()
+    parser.feed(_decode(content))
+    parser.close()
+    return [
+        RawTable(
+            headers=[" ".join(cell) for cell in table.headers],
+            rows=[[" ".join(cell) for cell in row] for row in table.rows],
+        )
+        for table in parser.tables
+    ]
+
+
+TABLE_EXTRACTORS: Final[dict[str, Callable[[bytes], list[RawTable]]]] = {
+    "events": extract_tables_events,
+    "beautifulsoup": extract_tables_beautifulsoup,
+}
+
+
+@dataclass(slots=True)
+class _TableCells:
+    has_header: bool = False
+    headers: list[list[str]] = field(default_factory=list)
+    rows: list[list[list[str]]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class _OpenElement:
+    name: str
+    table: _TableCells | None = None
+    header_tables: list[_TableCells] = field(default_factory=list)
+    row: list[list[str]] | None = None
+    text: list[str] | None = None
+
+
+class _TableEventParser(HTMLParser):
+    """Collect table cell text while mirroring BeautifulSoup's html.parser tree semantics.
+
+    Unclosed elements stay open until a matching end tag closes them and every
+    element above them, exactly as the tree builder nests them. Text is
+    appended to every cell that is open when it is read.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.tables: list[_TableCells] = []
+        self._open: list[_OpenElement] = []
+        self._open_text: list[list[str]] = []
+        self._pending_text: list[str] = []
+        self._non_text_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._flush_text()
+        if tag in _VOID_ELEMENTS:
+            return
+        element = _OpenElement(tag)
+        if tag == "table":
+            element.table = _TableCells()
+            self.tables.append(element.table)
+        elif tag == "thead":
+            for parent in self._open:
+                if parent.table is not None and not parent.table.has_header:
+                    parent.table.has_header = True
+                    element.header_tables.append(parent.table)
+        elif tag == "th":
+            header_tables = [table for parent in self._open for table in parent.header_tables]
+            if header_tables:
+                element.text = []
+                for table in header_tables:
+                    table.headers.append(element.text)
+        elif tag == "tr":
+            element.row = []
+            for parent in self._open:
+                if parent.table is not None:
+                    parent.table.rows.append(element.row)
+        elif tag == "td" and self._open and self._open[-1].row is not None:
+            element.text = []
+            self._open[-1].row.append(element.text)
+
+        if tag in _NON_TEXT_ELEMENTS:
+            self._non_text_depth += 1
+        if element.text is not None:
+            self._open_text.append(element.text)
+        self._open.append(element)
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush_text()
+        for index in range(len(self._open) - 1, -1, -1):
+            if self._open[index].name == tag:
+                break
+        else:
+            return
+        while len(self._open) > index:
+            self._close(self._open.pop())
+
+    def handle_data(self, data: str) -> None:
+        self._pending_text.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._flush_text()
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush_text()
+
+    def handle_pi(self, data: str) -> None:
+        self._flush_text()
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush_text()
+
+    def close(self) -> None:
+        super().close()
+        self._flush_text()
+        while self._open:
+            self._close(self._open.pop())
+
+    def _close(self, element: _OpenElement) -> None:
+        if element.text is not None:
+            self._open_text.pop()
+        if element.name in _NON_TEXT_ELEMENTS:
+            self._non_text_depth -= 1
+
+    def _flush_text(self) -> None:
+        if not self._pending_text:
+            return
+        text = "".join(self._pending_text).strip()
+        self._pending_text.clear()
+        if text and not self._non_text_depth:
+            for cell in self._open_text:
+                cell.append(text)
+
+
+def _decode(content: bytes) -> str:
+    for byte_order_mark, encoding in _BYTE_ORDER_MARKS:
+        if content.startswith(byte_order_mark):
+            return content[len(byte_order_mark) :].decode(encoding, errors="replace")
+    declared = _DECLARED_CHARSET.search(content[:4096])
+    candidates = [declared.group(1).decode("ascii")] if declared else []
+    for encoding in (*candidates, "utf-8", "windows-1252"):
+        try:
+            return content.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return content.decode("utf-8", errors="replace")
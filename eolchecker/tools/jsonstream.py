@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import codecs
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any, Final
+
+_DECODER: Final = json.JSONDecoder()
+_WHITESPACE: Final[str] = " \t\n\r"
+
+
+def iter_array_items(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """Yield the items of the array stored under ``key`` in a top-level JSON object.
+
+    The document is decoded incrementally from UTF-8 ``chunks``, so only the
+    item being decoded is held in memory rather than the whole document.
+    Raises ``ValueError`` when the document is malformed, truncated, or does not
+    contain an array under ``key``.
+    """
+    reader = _ChunkReader(chunks)
+    reader.expect("{")
+    while reader.peek() != "}":
+        member = reader.decode_value()
+        if not isinstance(member, str):
+            raise ValueError("JSON object member name is not a string")
+        reader.expect(":")
+        if member == key:
+            yield from _iter_items(reader, key)
+            return
+        reader.decode_value()
+        if reader.peek() == ",":
+            reader.expect(",")
+    raise ValueError(f"JSON document does not contain {key!r}")
+
+
+def _iter_items(reader: _ChunkReader, key: str) -> Iterator[Any]:
+    if reader.peek() != "[":
+        raise ValueError(f"JSON member {key!r} is not an array")
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.decode_value()
+        if reader.peek() == "]":
+            return
+        reader.expect(",")
+
+
+class _ChunkReader:
+    """A text buffer over byte chunks that only retains undecoded input."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._text = ""
+        self._position = 0
+        self._exhausted = False
+
+    def peek(self) -> str:
+        while True:
+            while self._position < len(self._text) and self._text[self._position] in _WHITESPACE:
+                self._position += 1
+            if self._position < len(self._text):
+                return self._text[self._position]
+            if not self._fill():
+                raise ValueError("JSON document ended unexpectedly")
+
+    def expect(self, character: str) -> None:
+        found = self.peek()
+        if found != character:
+            raise ValueError(f"Expected {character!r} in JSON document but found {found!r}")
+        self._position += 1
+
+    def decode_value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._text, self._position)
+            except json.JSONDecodeError as exception:
+                if self._fill():
+                    continue
+                raise ValueError(f"Invalid JSON document: {exception.msg}") from exception
+            # A number at the end of the buffer may continue in the next chunk.
+            if end == len(self._text) and self._fill():
+                continue
+            self._position = end
+            return value
+
+    def _fill(self) -> bool:
+        if self._exhausted:
+            return False
+        text = ""
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                break
+        else:
+            text = self._decoder.decode(b"", final=True)
+            self._exhausted = True
+        self._text = self._text[self._position :] + text
+        self._position = 0
+        return bool(text)
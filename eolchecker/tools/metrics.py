@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Final
+
+CACHE_SOURCE: Final[str] = "cache"
+_PROMETHEUS_PREFIX: Final[str] = "eolchecker_refresh"
+
+
+@dataclass(slots=True)
+class SourceMetrics:
+    """Stage timings and counters of one upstream source, or of the cache as ``CACHE_SOURCE``."""
+
+    source: str
+    seconds: dict[str, float] = field(default_factory=dict)
+    bytes: int = 0
+    records: int = 0
+    retries: int = 0
+    not_modified: bool = False
+
+
+class RefreshMetrics:
+    """Thread-safe stage timings and counters collected across one cache refresh.
+
+    Stage timings are summed over sources, so pages fetched concurrently may add
+    up to more than the elapsed wall time of the refresh.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sources: dict[str, SourceMetrics] = {}
+        self._started = time.perf_counter()
+        self._elapsed: float | None = None
+        self._finished_at: float | None = None
+        self.succeeded: bool | None = None
+
+    @contextmanager
+    def stage(self, stage: str, source: str) -> Iterator[None]:
+        """Add the time spent in the ``with`` block to ``stage`` of ``source``, even when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                seconds = self._source(source).seconds
+                seconds[stage] = seconds.get(stage, 0.0) + elapsed
+
+    def count(
+        self, source: str, bytes: int = 0, records: int = 0, retries: int = 0, not_modified: bool = False
+    ) -> None:
+        with self._lock:
+            metrics = self._source(source)
+            metrics.bytes += bytes
+            metrics.records += records
+            metrics.retries += retries
+            metrics.not_modified = metrics.not_modified or not_modified
+
+    def finish(self, succeeded: bool) -> None:
+        """Record the outcome and the elapsed wall time of the refresh."""
+        with self._lock:
+            self.succeeded = succeeded
+            self._elapsed = time.perf_counter() - self._started
+            self._finished_at = time.time()
+
+    @property
+    def elapsed(self) -> float:
+        return self._elapsed if self._elapsed is not None else time.perf_counter() - self._started
+
+    @property
+    def sources(self) -> list[SourceMetrics]:
+        with self._lock:
+            return [SourceMetrics(**asdict(metrics)) for metrics in self._sources.values()]
+
+    def stage_seconds(self) -> dict[str, float]:
+        """Return the time of every stage summed over all sources."""
+        totals: dict[str, float] = {}
+        for metrics in self.sources:
+            for stage, seconds in metrics.seconds.items():
+                totals[stage] = totals.get(stage, 0.0) + seconds
+        return totals
+
+    def as_dict(self) -> dict[str, Any]:
+        sources = self.sources
+        return {
+            "succeeded": self.succeeded,
+            "elapsed_seconds": self.elapsed,
+            "finished_at": self._finished_at,
+            "stages": self.stage_seconds(),
+            "bytes": sum(metrics.bytes for metrics in sources if metrics.source != CACHE_SOURCE),
+            "retries": sum(metrics.retries for metrics in sources),
+            "sources": [asdict(metrics) for metrics in sources],
+        }
+
+    def summary(self) -> str:
+        """Return a human-readable table of the stage timings and per-source counters."""
+        outcome = {True: "succeeded", False: "failed", None: "in progress"}[self.succeeded]
+        lines = [f"Refresh {outcome} in {self.elapsed:.2f} s"]
+        lines.extend(f"  {stage:<16} {seconds:9.3f} s" for stage, seconds in sorted(self.stage_seconds().items()))
+        for metrics in self.sources:
+            stages = ", ".join(f"{stage} {seconds:.3f} s" for stage, seconds in metrics.seconds.items())
+            notes = " (not modified)" if metrics.not_modified else ""
+            lines.append(
+                f"  {metrics.source}: {metrics.records} records, {metrics.bytes} bytes, "
+                f"{metrics.retries} retries{notes}; {stages}"
+            )
+        return "\n".join(lines)
+
+    def prometheus(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        sources = self.sources
+        lines: list[str] = []
+
+        def family(name: str, help_text: str, samples: list[tuple[dict[str, str], float]]) -> None:
+            lines.append(f"# HELP {_PROMETHEUS_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {_PROMETHEUS_PREFIX}_{name} gauge")
+            for labels, value in samples:
+                rendered = ",".join(f'{key}="{_escape_label(label)}"' for key, label in labels.items())
+                selector = f"{{{rendered}}}" if rendered else ""
+                lines.append(f"{_PROMETHEUS_PREFIX}_{name}{selector} {value!r}")
+
+        family("success", "Whether the last refresh completed successfully.", [({}, float(bool(self.succeeded)))])
+        family("duration_seconds", "Elapsed wall time of the last refresh.", [({}, self.elapsed)])
+        if self._finished_at is not None:
+            family("finished_timestamp_seconds", "Unix time at which the refresh ended.", [({}, self._finished_at)])
+        family(
+            "stage_seconds",
+            "Time spent in each refresh stage, per source.",
+            [
+                ({"source": metrics.source, "stage": stage}, seconds)
+                for metrics in sources
+                for stage, seconds in metrics.seconds.items()
+            ],
+        )
+        for counter, help_text in (
+            ("bytes", "Response bytes read per source."),
+            ("records", "Records produced per source."),
+            ("retries", "HTTP retries per source."),
+        ):
+            samples = [({"source": metrics.source}, float(getattr(metrics, counter))) for metrics in sources]
+            family(counter, help_text, samples)
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path: str | Path) -> None:
+        _write_atomically(Path(path), json.dumps(self.as_dict(), indent=2) + "\n")
+
+    def write_prometheus_textfile(self, path: str | Path) -> None:
+        """Write the Prometheus metrics so that a textfile collector never reads a partial file."""
+        _write_atomically(Path(path), self.prometheus())
+
+    def _source(self, source: str) -> SourceMetrics:
+        metrics = self._sources.get(source)
+        if metrics is None:
+            metrics = self._sources[source] = SourceMetrics(source)
+        return metrics
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _write_atomically(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as stream:
+            stream.write(text)
+        # mkstemp creates owner-only files; collectors such as node_exporter usually run as another user.
+        os.chmod(temporary_name, 0o644)
+        os.replace(temporary_name, path)
+    except BaseException:
+        Path(temporary_name).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from datetime import date
+from typing import Final
+
+_VERSION_COMPONENT: Final = re.compile(r"\d+|[^\W\d_]+")
+_NUMERIC_WIDTH: Final[int] = 10
+_PRODUCT_KEY_NOISE: Final = re.compile(r"[\W_]+")
+# A trailing version separated from the product name, as in "nginx/1.24" or "Microsoft SQL Server 2019".
+_TRAILING_VERSION: Final = re.compile(r"(?P<name>.*?[^\W_])[\s/@:_-]+v?(?P<version>\d[\w.+-]*)")
+
+
+def version_key(version: str) -> str:
+    """Return a sortable key for a release cycle or installed version.
+
+    Numeric components are zero padded so that keys sort numerically, and
+    components are joined with ``.``. The key of a release cycle such as ``1.24``
+    is therefore a component prefix of the key of every version in that cycle,
+    such as ``1.24.0`` or ``v1.24.3-rc1``.
+    """
+    components = _VERSION_COMPONENT.findall(version.casefold())
+    if len(components) > 1 and components[0] == "v" and components[1].isdigit():
+        components = components[1:]
+    return ".".join(
+        component.zfill(_NUMERIC_WIDTH) if component.isdigit() else component for component in components
+    )
+
+
+def version_key_prefixes(version: str) -> list[str]:
+    """Return the keys of every release cycle that could contain ``version``, longest first."""
+    components = version_key(version).split(".")
+    return [".".join(components[:length]) for length in range(len(components), 0, -1) if components[0]]
+
+
+_MONTHS: Final[dict[str, int]] = {
+    name: number
+    for number, names in enumerate(
+        (
+            ("january", "jan", "januar", "jän"),
+            ("february", "feb", "februar"),
+            ("march", "mar", "märz", "maerz", "mär"),
+            ("april", "apr"),
+            ("may", "mai"),
+            ("june", "jun", "juni"),
+            ("july", "jul", "juli"),
+            ("august", "aug"),
+            ("september", "sep", "sept"),
+            ("october", "oct", "oktober", "okt"),
+            ("november", "nov"),
+            ("december", "dec", "dezember", "dez"),
+        ),
+        start=1,
+    )
+    for name in names
+}
+_MONTH_NAME: Final[str] = r"(?P<month_name>[^\W\d_]+)\.?"
+_EOL_DATE_FORMATS: Final[tuple[tuple[re.Pattern[str], str], ...]] = tuple(
+    (re.compile(pattern), precision)
+    for pattern, precision in (
+        (r"(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})", "day"),
+        (r"(?P<year>\d{4})/(?P<month>\d{1,2})/(?P<day>\d{1,2})", "day"),
+        (r"(?P<day>\d{1,2})\.\s*(?P<month>\d{1,2})\.\s*(?P<year>\d{4})", "day"),
+        (rf"(?P<day>\d{{1,2}})\.?\s+{_MONTH_NAME}\s+(?P<year>\d{{4}})", "day"),
+        (rf"{_MONTH_NAME}\s+(?P<day>\d{{1,2}}),?\s+(?P<year>\d{{4}})", "day"),
+        (r"(?P<year>\d{4})[-/](?P<month>\d{1,2})", "month"),
+        (r"(?P<month>\d{1,2})[./](?P<year>\d{4})", "month"),
+        (rf"{_MONTH_NAME}\s+(?P<year>\d{{4}})", "month"),
+        (r"q(?P<quarter>[1-4])\s*[/-]?\s*(?P<year>\d{4})", "quarter"),
+        (r"(?P<year>\d{4})\s*[/-]?\s*q(?P<quarter>[1-4])", "quarter"),
+        (r"(?P<year>\d{4})", "year"),
+    )
+)
+_EOL_DATE_NOISE: Final = re.compile(r"^(?:ca\.?|approx\.?|est\.?|~)\s*|\s*(?:\*+|\([^)]*\))$")
+
+
+def parse_eol_date(value: str) -> tuple[str | None, str | None]:
+    """Return the earliest ISO date an EOL value can denote and its precision.
+
+    Precision is ``day``, ``month``, ``quarter`` or ``year``; coarser values
+    resolve to the first day of their period. Unknown or unrecognized values
+    return ``(None, None)``.
+    """
+    text = " ".join(value.casefold().split())
+    previous = None
+    while previous != text:
+        previous, text = text, _EOL_DATE_NOISE.sub("", text).strip()
+    for pattern, precision in _EOL_DATE_FORMATS:
+        match = pattern.fullmatch(text)
+        if match is None:
+            continue
+        fields = match.groupdict()
+        if fields.get("month_name") is not None:
+            month = _MONTHS.get(fields["month_name"])
+        elif fields.get("quarter") is not None:
+            month = int(fields["quarter"]) * 3 - 2
+        else:
+            month = int(fields.get("month") or 1)
+        if month is None:
+            return None, None
+        try:
+            parsed = date(int(fields["year"]), month, int(fields.get("day") or 1))
+        except ValueError:
+            return None, None
+        return parsed.isoformat(), precision
+    return None, None
+
+
+def product_key(name: str) -> str:
+    """Return the matching key of a product name, alias or label.
+
+    Keys are case-folded, stripped of accents, and keep only letters and digits,
+    so ``Microsoft SQL Server`` and ``microsoft-sql-server`` share one key.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    unaccented = "".join(character for character in decomposed if not unicodedata.combining(character))
+    return _PRODUCT_KEY_NOISE.sub("", unaccented)
+
+
+def split_product_version(name: str) -> tuple[str, str | None]:
+    """Split an inventory name such as ``nginx/1.24`` into its product name and trailing version."""
+    match = _TRAILING_VERSION.fullmatch(name.strip())
+    if match is None:
+        return name.strip(), None
+    return match.group("name"), match.group("version")
+
+
+def trigrams(key: str) -> set[str]:
+    """Return the padded character trigrams of a product key, so that short keys still share trigrams."""
+    padded = f"  {key} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)} if key else set()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Final, TypeVar
+
+ResultT = TypeVar("ResultT")
+
+DEFAULT_MAX_ENTRIES: Final[int] = 1024
+DEFAULT_MAX_ROWS: Final[int] = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class ResultCacheStats:
+    """Counters of a ``ResultCache`` since it was created."""
+
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    entries: int
+
+
+class ResultCache:
+    """A thread-safe LRU cache of query results, scoped to one cache generation per namespace.
+
+    Entries are stored under a namespace, such as a cache file, together with the
+    generation they were read from. The first lookup that names a different
+    generation for a namespace drops every entry of that namespace, so results
+    never outlive the generation that produced them. At most ``max_entries``
+    results of at most ``max_rows`` rows each are kept; with ``ttl``, entries
+    also expire after that many seconds.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_rows: int = DEFAULT_MAX_ROWS,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1 or max_rows < 0:
+            raise ValueError("max_entries must be at least 1 and max_rows must not be negative")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self._max_entries = max_entries
+        self._max_rows = max_rows
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[Hashable, Hashable], tuple[float | None, tuple[Any, ...]]] = OrderedDict()
+        self._generations: dict[Hashable, Hashable] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def lookup(
+        self, namespace: Hashable, generation: Hashable, key: Hashable, load: Callable[[], list[ResultT]]
+    ) -> list[ResultT]:
+        """Return the cached result of ``key`` in ``generation``, calling ``load`` on a miss.
+
+        Every call returns a new list, so callers may modify it freely. ``load``
+        runs without holding the cache lock; concurrent misses of one key may
+        each load it.
+        """
+        entry_key = (namespace, key)
+        with self._lock:
+            if self._generations.get(namespace, generation) != generation:
+                self._invalidate(namespace)
+            self._generations[namespace] = generation
+            entry = self._entries.get(entry_key)
+            if entry is not None and (entry[0] is None or entry[0] > self._clock()):
+                self._entries.move_to_end(entry_key)
+                self._hits += 1
+                return list(entry[1])
+            if entry is not None:
+                del self._entries[entry_key]
+            self._misses += 1
+
+        result = load()
+        if len(result) > self._max_rows:
+            return result
+        expires = self._clock() + self._ttl if self._ttl is not None else None
+        with self._lock:
+            # A lookup of a newer generation may have run while this result was loading.
+            if self._generations.get(namespace) != generation:
+                return result
+            self._entries[entry_key] = (expires, tuple(result))
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return result
+
+    def invalidate(self, namespace: Hashable | None = None) -> None:
+        """Drop the entries of ``namespace``, or of every namespace."""
+        with self._lock:
+            if namespace is None:
+                self._invalidations += len(self._entries)
+                self._entries.clear()
+                self._generations.clear()
+            else:
+                self._invalidate(namespace)
+                self._generations.pop(namespace, None)
+
+    def stats(self) -> ResultCacheStats:
+        with self._lock:
+            return ResultCacheStats(self._hits, self._misses, self._evictions, self._invalidations, len(self._entries))
+
+    def _invalidate(self, namespace: Hashable) -> None:
+        stale = [entry_key for entry_key in self._entries if entry_key[0] == namespace]
+        for entry_key in stale:
+            del self._entries[entry_key]
+        self._invalidations += len(stale)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import json
+import logging
+import socket
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import date, timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Final
+from urllib.parse import parse_qs, urlsplit
+
+from ..models import HardwareLifecycle, SoftwareLifecycle
+from .database import Database
+from .errors import CacheError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THREADS: Final[int] = 8
+
+
+class LifecycleServer(HTTPServer):
+    """An HTTP/JSON query service over a lifecycle cache.
+
+    Requests are answered by a fixed pool of ``threads`` worker threads, so each
+    worker keeps its pooled cache connection for the lifetime of the server.
+    Use an ``in_memory`` or ``persistent`` database; either one switches to a
+    new generation as soon as ``Database.save()`` replaces the cache file. When
+    the database has a result cache, ``/health`` reports its counters.
+
+    Endpoints:
+
+    * ``GET /software?name=NAME[&version=VERSION]``
+    * ``GET /hardware?name=NAME``
+    * ``GET /expiring?days=DAYS``
+    * ``GET /health``
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], database: Database, threads: int = DEFAULT_THREADS) -> None:
+        if threads < 1:
+            raise ValueError("threads must be at least 1")
+        super().__init__(address, _LifecycleRequestHandler)
+        self.database = database
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="eolchecker-server")
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}/"
+
+    def process_request(self, request: socket.socket | tuple[bytes, socket.socket], client_address: Any) -> None:
+        self._executor.submit(self._process_request, request, client_address)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _process_request(self, request: socket.socket | tuple[bytes, socket.socket], client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class _QueryError(ValueError):
+    """Raised for a request that names an unknown endpoint or lacks a valid parameter."""
+
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class _LifecycleRequestHandler(BaseHTTPRequestHandler):
+    server: LifecycleServer
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY keep-alive replies stall on delayed ACKs.
+    disable_nagle_algorithm = True
+    # Idle keep-alive connections release their worker thread after this many seconds.
+    timeout = 5
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        parameters = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        endpoint = _ENDPOINTS.get(url.path.rstrip("/") or "/")
+        try:
+            if endpoint is None:
+                raise _QueryError(HTTPStatus.NOT_FOUND, f"Unknown endpoint {url.path!r}")
+            self._send_json(HTTPStatus.OK, endpoint(self.server.database, parameters))
+        except _QueryError as exception:
+            self._send_json(exception.status, {"error": str(exception)})
+        except CacheError as exception:
+            logger.error("Lifecycle query failed: %s", exception)
+            self._send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(exception)})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s %s", self.address_string(), format % args)
+
+    def _send_json(self, status: HTTPStatus, payload: Mapping[str, Any]) -> None:
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _required(parameters: Mapping[str, str], name: str) -> str:
+    value = parameters.get(name, "").strip()
+    if not value:
+        raise _QueryError(HTTPStatus.BAD_REQUEST, f"Missing required parameter {name!r}")
+    return value
+
+
+def _software_json(records: Sequence[SoftwareLifecycle]) -> list[dict[str, str]]:
+    return [{"name": record.name, "version": record.version, "eol": record.eol} for record in records]
+
+
+def _hardware_json(records: Sequence[HardwareLifecycle]) -> list[dict[str, str]]:
+    return [{"manufacturer": record.manufacturer, "model": record.model, "eol": record.eol} for record in records]
+
+
+def _software(database: Database, parameters: Mapping[str, str]) -> dict[str, Any]:
+    name = _required(parameters, "name")
+    if parameters.get("version", "").strip():
+        release = database.find_software_release(name, parameters["version"])
+        return {"software": _software_json([release] if release is not None else [])}
+    return {"software": _software_json(database.search_software(name))}
+
+
+def _hardware(database: Database, parameters: Mapping[str, str]) -> dict[str, Any]:
+    return {"hardware": _hardware_json(database.search_hardware(_required(parameters, "name")))}
+
+
+def _expiring(database: Database, parameters: Mapping[str, str]) -> dict[str, Any]:
+    days = _required(parameters, "days")
+    if not days.isdecimal() or int(days) < 1:
+        raise _QueryError(HTTPStatus.BAD_REQUEST, f"Invalid positive integer for 'days': {days!r}")
+    today = date.today()
+    if int(days) > (date.max - today).days:
+        raise _QueryError(
+            HTTPStatus.BAD_REQUEST, f"Invalid number of days for 'days' beyond {date.max.isoformat()}: {days!r}"
+        )
+    software_records, hardware_records = database.expiring_before(today + timedelta(days=int(days)), since=today)
+    return {"software": _software_json(software_records), "hardware": _hardware_json(hardware_records)}
+
+
+def _health(database: Database, parameters: Mapping[str, str]) -> dict[str, Any]:
+    if database.result_cache is None:
+        return {"status": "ok"}
+    return {"status": "ok", "result_cache": asdict(database.result_cache.stats())}
+
+
+_ENDPOINTS: Final[Mapping[str, Callable[[Database, Mapping[str, str]], dict[str, Any]]]] = {
+    "/software": _software,
+    "/hardware": _hardware,
+    "/expiring": _expiring,
+    "/health": _health,
+}
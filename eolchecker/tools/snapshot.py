@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import tarfile
+import tempfile
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Final
+
+from ..models import SnapshotManifest
+from .errors import CacheError
+
+SNAPSHOT_FORMAT: Final[int] = 1
+_MANIFEST_MEMBER: Final[str] = "manifest.json"
+_GENERATION_MEMBER: Final[str] = "generation.db"
+_MAX_MANIFEST_SIZE: Final[int] = 1024 * 1024
+_COMPRESS_LEVEL: Final[int] = 6
+_CHUNK_SIZE: Final[int] = 1024 * 1024
+
+
+def write_snapshot(destination: Path, generation: Path, manifest: SnapshotManifest) -> None:
+    """Write ``manifest`` and the ``generation`` file it describes to ``destination`` as a ``.tar.gz`` archive.
+
+    The manifest is the first member, so that readers can verify the generation
+    while it streams past. The archive is written to a temporary file and
+    renamed into place, so ``destination`` never holds a partial snapshot.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary_name = tempfile.mkstemp(dir=destination.parent, prefix=f".{destination.name}.", suffix=".tmp")
+    temporary_path = Path(temporary_name)
+    try:
+        with os.fdopen(descriptor, "wb") as raw:
+            with (
+                gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=_COMPRESS_LEVEL, mtime=0) as compressed,
+                tarfile.open(fileobj=compressed, mode="w|", format=tarfile.PAX_FORMAT) as archive,
+            ):
+                manifest_bytes = json.dumps(manifest.to_dict(), indent=2).encode("utf-8") + b"\n"
+                archive.addfile(
+                    _member(_MANIFEST_MEMBER, len(manifest_bytes), manifest.created), io.BytesIO(manifest_bytes)
+                )
+                with generation.open("rb") as source:
+                    archive.addfile(_member(_GENERATION_MEMBER, manifest.size, manifest.created), source)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temporary_path, destination)
+    finally:
+        temporary_path.unlink(missing_ok=True)
+
+
+def read_snapshot(source: BinaryIO, destination: Path) -> SnapshotManifest:
+    """Stream the generation of the snapshot read from ``source`` into ``destination`` and return its manifest.
+
+    The snapshot is read strictly sequentially, so ``source`` may be a pipe.
+    ``CacheError`` is raised for a damaged or unsupported snapshot, including a
+    gzip checksum mismatch, or when the size or SHA-256 digest of the
+    generation differs from its manifest.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with (
+            gzip.GzipFile(fileobj=source, mode="rb") as compressed,
+            tarfile.open(fileobj=compressed, mode="r|") as archive,
+        ):
+            manifest = _read_manifest(archive, archive.next())
+            member = archive.next()
+            extracted = archive.extractfile(member) if member is not None and member.isfile() else None
+            if member is None or member.name != _GENERATION_MEMBER or extracted is None:
+                raise CacheError("Snapshot does not contain a cache generation")
+            with destination.open("wb") as target:
+                while chunk := extracted.read(_CHUNK_SIZE):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    target.write(chunk)
+            if archive.next() is not None:
+                raise CacheError("Snapshot contains unexpected members")
+            # The CRC-32 and length of the whole archive are checked once its end has been read.
+            while compressed.read(_CHUNK_SIZE):
+                pass
+    except (tarfile.TarError, EOFError, zlib.error, gzip.BadGzipFile) as exception:
+        raise CacheError(f"Snapshot is not a readable archive: {exception}") from exception
+    if size != manifest.size or digest.hexdigest() != manifest.sha256:
+        raise CacheError("Snapshot generation does not match the size and SHA-256 digest of its manifest")
+    return manifest
+
+
+def _read_manifest(archive: tarfile.TarFile, member: tarfile.TarInfo | None) -> SnapshotManifest:
+    if member is None or member.name != _MANIFEST_MEMBER or not member.isfile():
+        raise CacheError("Snapshot does not start with a manifest")
+    if member.size > _MAX_MANIFEST_SIZE:
+        raise CacheError(f"Snapshot manifest exceeds {_MAX_MANIFEST_SIZE} bytes")
+    extracted = archive.extractfile(member)
+    try:
+        manifest = SnapshotManifest.from_dict(json.loads(extracted.read() if extracted is not None else b""))
+    except ValueError as exception:
+        raise CacheError(f"Snapshot manifest is invalid: {exception}") from exception
+    if manifest.format != SNAPSHOT_FORMAT:
+        raise CacheError(f"Unsupported snapshot format {manifest.format}; expected {SNAPSHOT_FORMAT}")
+    return manifest
+
+
+def _member(name: str, size: int, created: datetime) -> tarfile.TarInfo:
+    member = tarfile.TarInfo(name)
+    member.size = size
+    member.mode = 0o600
+    member.mtime = int(created.timestamp())
+    return member
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from eolchecker.models import HardwareLifecycle, SoftwareLifecycle
+from eolchecker.tools.aio import AsyncDatabase, AsyncDownloader
+from eolchecker.tools.downloader import Downloader
+from eolchecker.tools.errors import CacheError, SourceError
+
+
+def test_concurrent_async_lookups_share_a_bounded_reader_pool(tmp_path: Path) -> None:
+    cache_path = tmp_path / "eol.db"
+    records = [SoftwareLifecycle(name=f"product-{index}", version="1", eol="2030-01-01") for index in range(50)]
+
+    async def lookups() -> tuple[list[list[SoftwareLifecycle]], list[HardwareLifecycle], set[str]]:
+        async with AsyncDatabase(cache_path, readers=2) as database:
+            database.database.save(records, [HardwareLifecycle(manufacturer="dell", model="R740", eol="2030-01-01")])
+            threads: set[str] = set()
+            search = database.database.search_software
+
+            def recording_search(name: str) -> list[SoftwareLifecycle]:
+                threads.add(threading.current_thread().name)
+                return search(name)
+
+            database.database.search_software = recording_search  # type: ignore[method-assign,assignment]
+            results = await asyncio.gather(
+                *(database.search_software(f"product-{index % 50}") for index in range(1000))
+            )
+            return results, await database.search_hardware("R740"), threads
+
+    results, hardware, threads = asyncio.run(lookups())
+
+    assert [result[0].name for result in results] == [f"product-{index % 50}" for index in range(1000)]
+    assert [record.model for record in hardware] == ["R740"]
+    assert len(threads) <= 2 and all(name.startswith("eolchecker-reader") for name in threads)
+
+
+def test_async_lookup_past_its_deadline_raises_a_cache_error(tmp_path: Path) -> None:
+    release = threading.Event()
+
+    async def lookup() -> None:
+        async with AsyncDatabase(tmp_path / "eol.db", deadline=0.05) as database:
+
+            def blocked_search(name: str) -> list[SoftwareLifecycle]:
+                release.wait(5)
+                return []
+
+            database.database.search_software = blocked_search  # type: ignore[method-assign,assignment]
+            try:
+                await database.search_software("nginx")
+            finally:
+                release.set()
+
+    with pytest.raises(CacheError, match="timed out"):
+        asyncio.run(lookup())
+
+
+class StalledResponse:
+    status_code = 200
+
+    def __init__(self, session: StalledSession, content: bytes = b"", content_type: str = "application/json") -> None:
+        self._session = session
+        self.content = content
+        self.headers = {"Content-Type": content_type}
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def iter_content(self, chunk_size: int) -> Any:
+        body = json.dumps({"result": [{"name": "nginx", "releases": [{"name": "1.26", "eolFrom": None}]}]}).encode()
+        for chunk in (body[:10], body[10:]):
+            self._session.chunks.append(chunk)
+            yield chunk
+            self._session.stall()
+
+    def __enter__(self) -> StalledResponse:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        return None
+
+
+class StalledSession:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.stalled = True
+        self.downloader: Downloader | None = None
+
+    def stall(self) -> None:
+        """Block the retrieval while ``stalled`` until it is cancelled, for at most five seconds."""
+        deadline = time.monotonic() + 5
+        while self.stalled and self.downloader is not None and time.monotonic() < deadline:
+            self.downloader._check_cancelled("stalled")
+            time.sleep(0.005)
+
+    def get(
+        self, url: str, timeout: tuple[float, float], headers: dict[str, str] | None = None, stream: bool = False
+    ) -> StalledResponse:
+        if stream:
+            return StalledResponse(self)
+        model = url.rsplit("/", 1)[-1].encode()
+        page = (
+            b"<table><thead><tr><th>Manuf.</th><th>Model</th></tr></thead>"
+            b"<tbody><tr><td>Vendor</td><td>" + model + b"</td></tr></tbody></table>"
+        )
+        return StalledResponse(self, page, "text/html")
+
+
+def test_cancelled_or_expired_async_retrieval_stops_the_download() -> None:
+    session = StalledSession()
+    downloader = AsyncDownloader(deadline=0.05, session=session)
+    session.downloader = downloader.downloader
+
+    async def retrieve() -> tuple[list[SoftwareLifecycle], list[HardwareLifecycle]]:
+        started = time.monotonic()
+        with pytest.raises(SourceError, match="timed out"):
+            await downloader.get_eol_datasets()
+
+        task = asyncio.ensure_future(downloader.get_eol_datasets())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Both stalled downloads were released by the cancellation rather than by their own timeout.
+        assert time.monotonic() - started < 4
+
+        session.stalled = False
+        return await downloader.get_eol_datasets()
+
+    try:
+        software, hardware = asyncio.run(retrieve())
+        assert software == [SoftwareLifecycle(name="nginx", version="1.26", eol="unknown")]
+        assert len(hardware) == len(Downloader.HARDWARE_MANUFACTURERS)
+    finally:
+        asyncio.run(downloader.aclose())
+
+
+def test_expired_async_retrieval_does_not_cancel_a_concurrent_one() -> None:
+    session = StalledSession()
+    downloader = AsyncDownloader(deadline=1.0, session=session)
+    session.downloader = downloader.downloader
+    first_failed = threading.Event()
+    get = session.get
+
+    def get_after_first_failure(url: str, *args: Any, **kwargs: Any) -> StalledResponse:
+        if url.startswith(Downloader.SOFTWARE_EOL_API):
+            session.stall()
+        else:
+            first_failed.wait(5)
+        return get(url, *args, **kwargs)
+
+    session.get = get_after_first_failure  # type: ignore[method-assign]
+
+    async def retrieve() -> list[HardwareLifecycle]:
+        stalled = asyncio.ensure_future(downloader.get_eol_software())
+        await asyncio.sleep(0.5)
+        # The second call waits for its first page while the first call times out on the shared downloader.
+        hardware = asyncio.ensure_future(downloader.get_eol_hardware())
+        with pytest.raises(SourceError, match="timed out"):
+            await stalled
+        first_failed.set()
+        return await hardware
+
+    try:
+        assert len(asyncio.run(retrieve())) == len(Downloader.HARDWARE_MANUFACTURERS)
+    finally:
+        asyncio.run(downloader.aclose())
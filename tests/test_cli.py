@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import csv
+import io
+import json
+import subprocess
+import sys
 from pathlib import Path
 
+import pytest
+
 import eolchecker.eolchecker as cli
-from eolchecker.models import HardwareLifecycle, SoftwareLifecycle
+import eolchecker.tools.downloader as downloader_module
+from eolchecker.models import HardwareColumns, HardwareLifecycle, SoftwareColumns, SoftwareLifecycle
+from eolchecker.tools.database import Database
 from eolchecker.tools.downloader import SourceError
 
 
@@ -29,23 +38,47 @@ def test_missing_cache_query_is_read_only(tmp_path: Path, capsys: object) -> Non
     assert not cache_path.exists()
 
 
+def test_query_only_invocations_do_not_import_the_network_stack(tmp_path: Path) -> None:
+    cache_path = tmp_path / "eol.db"
+    Database(cache_path).save(
+        [SoftwareLifecycle("nginx", "1.26", "2026-04-23")], [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01")]
+    )
+    script = (
+        "import sys\n"
+        "import eolchecker.eolchecker as cli\n"
+        f"cli.main(['--cache-path', {str(cache_path)!r}, '--software', 'nginx', '--hardware', 'Dell'])\n"
+        "print(sorted(name for name in ('requests', 'urllib3', 'bs4', 'http.server') if name in sys.modules))\n"
+    )
+
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+    assert "nginx, 1.26: 2026-04-23" in completed.stdout
+    assert completed.stdout.splitlines()[-1] == "[]"
+
+
 def test_update_persists_downloaded_records(tmp_path: Path, capsys: object, monkeypatch: object) -> None:
     cache_path = tmp_path / "eol.db"
 
     class StubDownloader:
+        validators: dict[str, object] = {}
+        product_names: dict[str, tuple[str, ...]] = {}
+
+        def __init__(self, **_: object) -> None:
+            return None
+
         def __enter__(self) -> StubDownloader:
             return self
 
         def __exit__(self, *_: object) -> None:
             return None
 
-        def get_eol_software(self) -> list[SoftwareLifecycle]:
-            return [SoftwareLifecycle("nginx", "1.26", "2026-04-23")]
+        def get_eol_columns(self) -> tuple[SoftwareColumns, HardwareColumns]:
+            return (
+                SoftwareColumns(("nginx",), ("1.26",), ("2026-04-23",)),
+                HardwareColumns(("Dell",), ("PowerEdge",), ("2030-01-01",), ("",)),
+            )
 
-        def get_eol_hardware(self) -> list[HardwareLifecycle]:
-            return [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01")]
-
-    monkeypatch.setattr(cli, "Downloader", StubDownloader)  # type: ignore[attr-defined]
+    monkeypatch.setattr(downloader_module, "Downloader", StubDownloader)  # type: ignore[attr-defined]
 
     exit_code = cli.main(["--cache-path", str(cache_path), "--update", "--software", "nginx"])
 
@@ -60,22 +93,319 @@ def test_update_failure_returns_operational_exit_code(
     tmp_path: Path, capsys: object, monkeypatch: object
 ) -> None:
     class FailingDownloader:
+        def __init__(self, **_: object) -> None:
+            return None
+
         def __enter__(self) -> FailingDownloader:
             return self
 
         def __exit__(self, *_: object) -> None:
             return None
 
-        def get_eol_software(self) -> list[SoftwareLifecycle]:
+        def get_eol_columns(self) -> tuple[SoftwareColumns, HardwareColumns]:
             raise SourceError("upstream unavailable")
 
-        def get_eol_hardware(self) -> list[HardwareLifecycle]:
-            raise AssertionError("Hardware source must not be called after software failure")
-
-    monkeypatch.setattr(cli, "Downloader", FailingDownloader)  # type: ignore[attr-defined]
+    monkeypatch.setattr(downloader_module, "Downloader", FailingDownloader)  # type: ignore[attr-defined]
 
     exit_code = cli.main(["--cache-path", str(tmp_path / "eol.db"), "--update"])
 
     captured = capsys.readouterr()  # type: ignore[attr-defined]
     assert exit_code == 3
     assert "ERROR: upstream unavailable" in captured.err
+
+
+def test_failed_update_still_writes_refresh_metrics(tmp_path: Path, capsys: object, monkeypatch: object) -> None:
+    class FailingDownloader:
+        def __init__(self, **_: object) -> None:
+            return None
+
+        def __enter__(self) -> FailingDownloader:
+            return self
+
+        def __exit__(self, *_: object) -> None:
+            return None
+
+        def get_eol_columns(self) -> tuple[SoftwareColumns, HardwareColumns]:
+            raise SourceError("upstream unavailable")
+
+    monkeypatch.setattr(downloader_module, "Downloader", FailingDownloader)  # type: ignore[attr-defined]
+    metrics_path = tmp_path / "metrics" / "eolchecker.json"
+    textfile_path = tmp_path / "metrics" / "eolchecker.prom"
+
+    exit_code = cli.main(
+        [
+            "--cache-path",
+            str(tmp_path / "eol.db"),
+            "--update",
+            "--stats",
+            "--metrics-json",
+            str(metrics_path),
+            "--prometheus-textfile",
+            str(textfile_path),
+        ]
+    )
+
+    captured = capsys.readouterr()  # type: ignore[attr-defined]
+    assert exit_code == 3
+    assert "Refresh failed in" in captured.out
+    assert json.loads(metrics_path.read_text(encoding="utf-8"))["succeeded"] is False
+    assert "eolchecker_refresh_success 0.0" in textfile_path.read_text(encoding="utf-8").splitlines()
+
+def test_software_file_queries_are_grouped_by_term(
+    tmp_path: Path, capsys: object, monkeypatch: object
+) -> None:
+    cache_path = tmp_path / "eol.db"
+    Database(cache_path).save(
+        [SoftwareLifecycle("nginx", "1.26", "2026-04-23"), SoftwareLifecycle("nginx", "1.24", "2024-04-23")],
+        [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01")],
+    )
+    monkeypatch.setattr("sys.stdin", io.StringIO("# inventory\nnginx\t1.24\nredis\n"))  # type: ignore[attr-defined]
+
+    exit_code = cli.main(["--cache-path", str(cache_path), "--software-file", "-"])
+
+    captured = capsys.readouterr()  # type: ignore[attr-defined]
+    assert exit_code == 0
+    assert captured.out.splitlines() == [
+        "== nginx 1.24 ==",
+        "Software, Version: EOL Date",
+        "***************************",
+        "nginx, 1.24: 2024-04-23",
+        "***************************",
+        "Total 1 software records found.",
+        "== redis ==",
+        "No software matches found.",
+    ]
+
+
+def test_version_query_prints_only_the_matching_release_cycle(tmp_path: Path, capsys: object) -> None:
+    cache_path = tmp_path / "eol.db"
+    Database(cache_path).save(
+        [SoftwareLifecycle("nginx", "1.26", "2026-04-23"), SoftwareLifecycle("nginx", "1.24", "2024-04-23")],
+        [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01")],
+    )
+
+    exit_code = cli.main(["--cache-path", str(cache_path), "--software", "nginx", "--version", "1.24.0"])
+
+    captured = capsys.readouterr()  # type: ignore[attr-defined]
+    assert exit_code == 0
+    assert "nginx, 1.24: 2024-04-23" in captured.out
+    assert "1.26" not in captured.out
+    assert "Total 1 software records found." in captured.out
+
+
+def test_fuzzy_software_query_resolves_inventory_names_to_products(tmp_path: Path, capsys: object) -> None:
+    cache_path = tmp_path / "eol.db"
+    Database(cache_path).save(
+        [
+            SoftwareLifecycle("mssqlserver", "2019", "2030-01-08"),
+            SoftwareLifecycle("mssqlserver", "2022", "2033-01-11"),
+            SoftwareLifecycle("mssqlserver-tools", "1", "2030-01-01"),
+        ],
+        [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01")],
+        product_names={"mssqlserver": ("Microsoft SQL Server",)},
+    )
+
+    assert cli.main(["--cache-path", str(cache_path), "--software", "Microsoft SQL Server 2019", "--fuzzy"]) == 0
+    captured = capsys.readouterr()  # type: ignore[attr-defined]
+    assert "Matched 'Microsoft SQL Server 2019' to mssqlserver (1.00 via 'Microsoft SQL Server')" in captured.out
+    assert "mssqlserver, 2019: 2030-01-08" in captured.out
+    assert "Total 1 software records found." in captured.out
+
+    assert cli.main(["--cache-path", str(cache_path), "--software", "MS-SQL-Server", "--fuzzy"]) == 0
+    captured = capsys.readouterr()  # type: ignore[attr-defined]
+    assert "Total 2 software records found." in captured.out
+    assert "mssqlserver-tools" not in captured.out.split("Software, Version")[1]
+
+
+def test_rollback_reinstalls_the_previous_generation(tmp_path: Path, capsys: object) -> None:
+    cache_path = tmp_path / "eol.db"
+    for eol in ("2026-01-01", "2026-04-23"):
+        Database(cache_path, retain=3).save(
+            [SoftwareLifecycle("nginx", "1.26", eol)], [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01")]
+        )
+    previous = Database(cache_path).list_generations()[1]
+
+    exit_code = cli.main(["--cache-path", str(cache_path), "--rollback", "--list-generations", "--software", "nginx"])
+
+    captured = capsys.readouterr()  # type: ignore[attr-defined]
+    assert exit_code == 0
+    assert f"Rolled back lifecycle cache {cache_path} to generation {previous.id}" in captured.out
+    assert f"{previous.id}  {previous.created:%Y-%m-%d %H:%M:%S} UTC  (active)" in captured.out
+    assert "nginx, 1.26: 2026-01-01" in captured.out
+
+
+def test_incremental_update_prints_a_change_report(tmp_path: Path, capsys: object, monkeypatch: object) -> None:
+    cache_path = tmp_path / "eol.db"
+    Database(cache_path).save(
+        [SoftwareLifecycle("nginx", "1.26", "2026-01-01")], [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01")]
+    )
+
+    class StubDownloader:
+        validators: dict[str, object] = {}
+        product_names: dict[str, tuple[str, ...]] = {}
+
+        def __init__(self, **_: object) -> None:
+            return None
+
+        def __enter__(self) -> StubDownloader:
+            return self
+
+        def __exit__(self, *_: object) -> None:
+            return None
+
+        def get_eol_columns(self) -> tuple[SoftwareColumns, HardwareColumns]:
+            return (
+                SoftwareColumns(("nginx",), ("1.26",), ("2026-04-23",)),
+                HardwareColumns(("Dell",), ("PowerEdge",), ("2030-01-01",), ("",)),
+            )
+
+    monkeypatch.setattr(downloader_module, "Downloader", StubDownloader)  # type: ignore[attr-defined]
+
+    exit_code = cli.main(["--cache-path", str(cache_path), "--update", "--incremental"])
+
+    captured = capsys.readouterr()  # type: ignore[attr-defined]
+    assert exit_code == 0
+    assert "Changes: 0 added, 0 removed, 1 EOL values changed" in captured.out
+    assert "~ nginx, 1.26: 2026-01-01  ->  2026-04-23" in captured.out
+
+
+def test_selective_update_refreshes_only_the_chosen_products_and_manufacturers(
+    tmp_path: Path, capsys: object, monkeypatch: object
+) -> None:
+    cache_path = tmp_path / "eol.db"
+    Database(cache_path).save(
+        [SoftwareLifecycle("nginx", "1.26", "2026-01-01"), SoftwareLifecycle("redis", "7.2", "2026-02-28")],
+        [
+            HardwareLifecycle("Dell", "PowerEdge", "2030-01-01", "dell"),
+            HardwareLifecycle("HP", "ProLiant", "2028-01-01", "hp"),
+        ],
+    )
+    selections: list[tuple[list[str], list[str]]] = []
+
+    class StubDownloader:
+        validators: dict[str, object] = {}
+        product_names: dict[str, tuple[str, ...]] = {}
+
+        def __init__(self, **_: object) -> None:
+            return None
+
+        def __enter__(self) -> StubDownloader:
+            return self
+
+        def __exit__(self, *_: object) -> None:
+            return None
+
+        def get_eol_columns(
+            self, products: list[str], manufacturers: list[str]
+        ) -> tuple[SoftwareColumns, HardwareColumns]:
+            selections.append((products, manufacturers))
+            return SoftwareColumns.from_records([SoftwareLifecycle("nginx", "1.26", "2026-04-23")]), HardwareColumns()
+
+    monkeypatch.setattr(downloader_module, "Downloader", StubDownloader)  # type: ignore[attr-defined]
+
+    exit_code = cli.main(["--cache-path", str(cache_path), "--update", "--products", "nginx, nginx,", "--software", ""])
+
+    captured = capsys.readouterr()  # type: ignore[attr-defined]
+    assert exit_code == 0
+    assert selections == [(["nginx"], [])]
+    assert "~ nginx, 1.26: 2026-01-01  ->  2026-04-23" in captured.out
+    assert "redis, 7.2: 2026-02-28" in captured.out
+    assert [record.model for record in Database(cache_path).search_hardware("")] == ["PowerEdge", "ProLiant"]
+
+    with pytest.raises(SystemExit):
+        cli.main(["--cache-path", str(cache_path), "--software", "nginx", "--manufacturers", "dell"])
+
+
+def test_expiring_within_rejects_windows_that_end_after_the_last_representable_date() -> None:
+    parser = cli.build_parser()
+
+    assert parser.parse_args(["--expiring-within", "30"]).expiring_within == 30
+    for days in ("0", "3000000"):
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--expiring-within", days])
+
+
+def test_serve_options_are_validated_and_default_to_the_server_thread_pool() -> None:
+    from eolchecker.tools.server import DEFAULT_THREADS
+
+    parser = cli.build_parser()
+
+    assert parser.parse_args([]).threads == DEFAULT_THREADS
+    assert parser.parse_args(["--port", "0"]).port == 0
+    assert parser.parse_args(["--port", "65535"]).port == 65535
+    for port in ("-1", "65536", "http"):
+        with pytest.raises(SystemExit):
+            parser.parse_args(["--port", port])
+
+
+def test_snapshot_exported_on_one_host_is_imported_on_another(tmp_path: Path, capsys: object) -> None:
+    source_path, consumer_path = tmp_path / "source.db", tmp_path / "consumer.db"
+    snapshot = tmp_path / "eol.tar.gz"
+    Database(source_path).save(
+        [SoftwareLifecycle("nginx", "1.26", "2026-04-23")], [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01")]
+    )
+
+    assert cli.main(["--cache-path", str(source_path), "--export-snapshot", str(snapshot)]) == 0
+    exported = capsys.readouterr().out  # type: ignore[attr-defined]
+    assert f"Exported snapshot of 1 software and 1 hardware records to {snapshot}" in exported
+
+    exit_code = cli.main(
+        ["--cache-path", str(consumer_path), "--import-snapshot", str(snapshot), "--software", "nginx"]
+    )
+
+    captured = capsys.readouterr()  # type: ignore[attr-defined]
+    assert exit_code == 0
+    assert f"Imported snapshot with 1 software and 1 hardware records into {consumer_path}" in captured.out
+    assert "nginx, 1.26: 2026-04-23" in captured.out
+    with pytest.raises(SystemExit):
+        cli.main(["--cache-path", str(consumer_path), "--update", "--import-snapshot", str(snapshot)])
+
+
+def test_structured_formats_stream_one_record_per_row(tmp_path: Path, capsys: object) -> None:
+    cache_path = tmp_path / "eol.db"
+    Database(cache_path).save(
+        [SoftwareLifecycle("Acme, Inc. Server", "1.0", "2026-01-01"), SoftwareLifecycle("nginx", "1.26", "unknown")],
+        [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01")],
+    )
+    arguments = ["--cache-path", str(cache_path), "--software", "", "--hardware", "Dell"]
+
+    assert cli.main([*arguments, "--format", "jsonl"]) == 0
+    lines = capsys.readouterr().out.splitlines()  # type: ignore[attr-defined]
+    assert [json.loads(line) for line in lines] == [
+        {"type": "software", "query": "", "name": "Acme, Inc. Server", "version": "1.0", "eol": "2026-01-01"},
+        {"type": "software", "query": "", "name": "nginx", "version": "1.26", "eol": "unknown"},
+        {"type": "hardware", "query": "Dell", "manufacturer": "Dell", "model": "PowerEdge", "eol": "2030-01-01"},
+    ]
+
+    assert cli.main([*arguments, "--format", "json"]) == 0
+    assert json.loads(capsys.readouterr().out) == [json.loads(line) for line in lines]  # type: ignore[attr-defined]
+
+    assert cli.main([*arguments, "--format", "csv"]) == 0
+    rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))  # type: ignore[attr-defined]
+    assert rows[0] == ["type", "query", "name", "version", "manufacturer", "model", "eol"]
+    assert rows[1] == ["software", "", "Acme, Inc. Server", "1.0", "", "", "2026-01-01"]
+    assert rows[3] == ["hardware", "Dell", "", "", "Dell", "PowerEdge", "2030-01-01"]
+
+
+def test_export_streams_every_record(tmp_path: Path, capsys: object) -> None:
+    cache_path = tmp_path / "eol.db"
+    Database(cache_path).save(
+        [SoftwareLifecycle("redis", "7.2", "2026-02-28"), SoftwareLifecycle("nginx", "1.26", "unknown")],
+        [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01")],
+    )
+
+    assert cli.main(["--cache-path", str(cache_path), "--export", "--format", "ndjson"]) == 0
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]  # type: ignore[attr-defined]
+    assert [(record["type"], record.get("name") or record["model"]) for record in records] == [
+        ("software", "redis"),
+        ("software", "nginx"),
+        ("hardware", "PowerEdge"),
+    ]
+
+
+def test_json_format_of_an_empty_result_is_an_empty_array(tmp_path: Path, capsys: object) -> None:
+    exit_code = cli.main(["--cache-path", str(tmp_path / "eol.db"), "--software", "nginx", "--format", "json"])
+
+    assert exit_code == 0
+    assert json.loads(capsys.readouterr().out) == []  # type: ignore[attr-defined]
@@ -1,14 +1,25 @@
 from __future__ import annotations
 
 import sqlite3
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
 from types import TracebackType
 from typing import Any
 
 import pytest
 
-from eolchecker.models import HardwareLifecycle, SoftwareLifecycle
+from eolchecker.models import (
+    HardwareColumns,
+    HardwareLifecycle,
+    ProductMatch,
+    SoftwareColumns,
+    SoftwareLifecycle,
+    SourceValidator,
+)
 from eolchecker.tools.database import CacheError, Database
+from eolchecker.tools.resultcache import ResultCache, ResultCacheStats
 
 
 def software(name: str = "nginx") -> SoftwareLifecycle:
@@ -114,3 +125,614 @@ def test_generation_connection_is_closed_before_cache_replacement(
 
     assert len(connections) == 1
     assert connections[0].closed
+
+
+def test_bulk_load_pragmas_can_be_left_out_of_a_build(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import eolchecker.tools.database as database_module
+
+    configured: list[sqlite3.Connection] = []
+    monkeypatch.setattr(database_module, "_configure_bulk_load", configured.append)
+    path = tmp_path / "eol.db"
+
+    assert Database(path).save([software()], [hardware()], bulk_load=False)
+    assert configured == []
+    assert Database(path).save([software()], [hardware()])
+    assert len(configured) == 1
+    assert Database(path).search_software("nginx") == [software()]
+
+
+def test_compacted_generation_is_synced_and_installed_with_query_statistics(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import eolchecker.tools.database as database_module
+
+    original_fsync = database_module.os.fsync
+    synced: list[int] = []
+
+    def tracking_fsync(descriptor: int) -> None:
+        synced.append(descriptor)
+        original_fsync(descriptor)
+
+    monkeypatch.setattr(database_module.os, "fsync", tracking_fsync)
+    path = tmp_path / "eol.db"
+
+    assert Database(path).save([software()], [hardware()], compact=True)
+
+    assert len(synced) == 2
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ["eol.db"]
+    assert Database(path).search_software("nginx") == [software()]
+    with sqlite3.connect(path) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        assert connection.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+
+
+def test_source_validators_and_page_records_are_stored_with_the_generation(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db")
+    page = "https://example.test/dell"
+    validator = SourceValidator(url=page, etag='"abc"')
+
+    database.save(
+        [software()],
+        [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01", source=page), hardware("Other")],
+        validators={page: validator},
+    )
+
+    assert database.source_validators() == {page: validator}
+    assert [record.source for record in database.hardware_for_source(page)] == [page]
+    assert Database(tmp_path / "missing.db").source_validators() == {}
+
+
+def test_failing_record_stream_preserves_active_cache(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db")
+    database.save([software()], [hardware()])
+
+    def interrupted_stream() -> Iterator[SoftwareLifecycle]:
+        yield software("partial")
+        raise RuntimeError("stream interrupted")
+
+    with pytest.raises(RuntimeError, match="stream interrupted"):
+        database.save(interrupted_stream(), [hardware("replacement")])
+
+    assert database.search_software("") == [software()]
+    assert list(tmp_path.iterdir()) == [tmp_path / "eol.db"]
+
+
+def test_persistent_reader_is_reused_and_reopened_after_replacement(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import eolchecker.tools.database as database_module
+
+    original_connect = sqlite3.connect
+    read_only_connections: list[str] = []
+
+    def counting_connect(database: str, *arguments: Any, **keywords: Any) -> sqlite3.Connection:
+        if keywords.get("uri"):
+            read_only_connections.append(database)
+        return original_connect(database, *arguments, **keywords)  # type: ignore[no-any-return]
+
+    monkeypatch.setattr(database_module.sqlite3, "connect", counting_connect)
+
+    with Database(tmp_path / "eol.db", persistent=True) as database:
+        database.save([software("old")], [hardware()])
+        assert database.search_software("old") == [software("old")]
+        assert database.search_hardware("PowerEdge") == [hardware()]
+        assert len(read_only_connections) == 1
+
+        Database(tmp_path / "eol.db").save([software("new")], [hardware()])
+
+        assert database.search_software("old") == []
+        assert database.search_software("new") == [software("new")]
+        assert len(read_only_connections) == 2
+
+
+def test_in_memory_database_reads_each_generation_once_across_threads(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import eolchecker.tools.database as database_module
+
+    original_connect = sqlite3.connect
+    file_reads: list[str] = []
+    memory_copies: list[str] = []
+
+    def counting_connect(database: str, *arguments: Any, **keywords: Any) -> sqlite3.Connection:
+        if keywords.get("uri"):
+            (memory_copies if "mode=memory" in database else file_reads).append(database)
+        return original_connect(database, *arguments, **keywords)  # type: ignore[no-any-return]
+
+    cache_path = tmp_path / "eol.db"
+    Database(cache_path).save([software("old")], [hardware()])
+    monkeypatch.setattr(database_module.sqlite3, "connect", counting_connect)
+
+    with Database(cache_path, in_memory=True) as database:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: database.search_software("old"), range(8)))
+        assert results == [[software("old")]] * 8
+        assert len(file_reads) == 1
+        assert len(memory_copies) > 1 and len(set(memory_copies)) == 1
+
+        Database(cache_path).save([software("new")], [hardware()])
+
+        assert database.search_software("old") == []
+        assert database.search_software("new") == [software("new")]
+        assert len(file_reads) == 2
+        assert len(set(memory_copies)) == 2
+
+
+def test_result_cache_answers_repeated_queries_until_a_generation_is_installed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import eolchecker.tools.database as database_module
+
+    original_connect = sqlite3.connect
+    reads: list[str] = []
+
+    def counting_connect(database: str, *arguments: Any, **keywords: Any) -> sqlite3.Connection:
+        if keywords.get("uri"):
+            reads.append(database)
+        return original_connect(database, *arguments, **keywords)  # type: ignore[no-any-return]
+
+    monkeypatch.setattr(database_module.sqlite3, "connect", counting_connect)
+    path = tmp_path / "eol.db"
+    database = Database(path, result_cache=ResultCache())
+    database.save([software("old")], [hardware()])
+
+    results = [database.search_software(" OLD "), database.search_software("old"), database.search_software("Old")]
+    results[0].append(software("mutated"))
+
+    assert results[1:] == [[software("old")], [software("old")]]
+    assert database.search_software("old") == [software("old")]
+    assert database.find_software_release("OLD", "1.0.3") == database.find_software_release("old", "1.0.3")
+    assert len(reads) == 2
+    assert database.result_cache is not None
+    assert database.result_cache.stats() == ResultCacheStats(
+        hits=4, misses=2, evictions=0, invalidations=0, entries=2
+    )
+
+    database.save([software("new")], [hardware()])
+    assert database.search_software("old") == []
+    Database(path).save([software("old")], [hardware()])
+    assert database.search_software("old") == [software("old")]
+    assert len(reads) == 4
+    assert database.result_cache.stats().invalidations == 3
+
+
+def test_result_cache_bounds_entries_rows_and_age() -> None:
+    now = [0.0]
+    cache = ResultCache(max_entries=2, max_rows=2, ttl=10, clock=lambda: now[0])
+    loads: list[str] = []
+
+    def lookup(key: str, rows: int = 1) -> list[str]:
+        def load() -> list[str]:
+            loads.append(key)
+            return [key] * rows
+
+        return cache.lookup("eol.db", 1, key, load)
+
+    for key in ("a", "b", "a", "c", "a", "b"):
+        lookup(key)
+    lookup("large", rows=3)
+    lookup("large", rows=3)
+    now[0] = 11
+    lookup("a")
+
+    assert loads == ["a", "b", "c", "b", "large", "large", "a"]
+    assert cache.stats() == ResultCacheStats(hits=2, misses=7, evictions=2, invalidations=0, entries=2)
+
+
+def test_product_matching_ranks_names_aliases_and_labels_through_the_trigram_index(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db")
+    database.save(
+        [
+            SoftwareLifecycle("mssqlserver", "2019", "2030-01-08"),
+            SoftwareLifecycle("nginx", "1.24", "2024-04-23"),
+            SoftwareLifecycle("nginx-plus", "R30", "2025-08-13"),
+            SoftwareLifecycle("postgresql", "15", "2027-11-11"),
+        ],
+        [hardware()],
+        product_names={"mssqlserver": ("Microsoft SQL Server",), "postgresql": ("postgres", "PostgreSQL")},
+    )
+
+    matches = database.match_products_many(["Microsoft SQL Server 2019", "nginx/1.24", "Postgress", "zzz"])
+
+    assert matches["Microsoft SQL Server 2019"] == [
+        ProductMatch("mssqlserver", 1.0, "Microsoft SQL Server", version="2019")
+    ]
+    assert [(match.product, match.version) for match in matches["nginx/1.24"]] == [
+        ("nginx", "1.24"),
+        ("nginx-plus", "1.24"),
+    ]
+    assert matches["nginx/1.24"][1].score < 1.0
+    assert [(match.product, match.matched) for match in matches["Postgress"]] == [("postgresql", "postgres")]
+    assert matches["zzz"] == []
+    assert database.match_products("nginx/1.24", threshold=1.0, limit=1) == [
+        ProductMatch("nginx", 1.0, "nginx", "1.24")
+    ]
+    with pytest.raises(ValueError, match="threshold"):
+        database.match_products("nginx", threshold=0)
+
+    database.save_incremental([SoftwareLifecycle("postgresql", "16", "2028-11-09")], [hardware()])
+
+    assert database.product_names() == {"postgresql": ("postgres",)}
+    assert [match.product for match in database.match_products("postgres")] == ["postgresql"]
+    assert database.match_products("mssqlserver") == []
+
+
+def test_retained_generations_are_rolled_back_and_pruned(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db", retain=2)
+    for name in ("first", "second", "third"):
+        database.save([software(name)], [hardware()])
+
+    generations = database.list_generations()
+
+    assert [generation.active for generation in generations] == [True, False]
+    assert len({generation.sha256 for generation in generations}) == 2
+    assert database.search_software("third") == [software("third")]
+
+    previous = database.rollback()
+
+    assert previous.id == generations[1].id
+    assert database.search_software("second") == [software("second")]
+    assert database.search_software("third") == []
+    assert [generation.active for generation in database.list_generations()] == [False, True]
+
+    with pytest.raises(CacheError, match="No generation older"):
+        Database(tmp_path / "eol.db").rollback()
+    database.rollback(generations[0].sha256[:8])
+    assert database.search_software("third") == [software("third")]
+    with pytest.raises(CacheError, match="matches no"):
+        database.rollback("missing")
+
+    database.save([software("fourth")], [hardware()])
+    assert len(database.list_generations()) == 2
+    assert Database(tmp_path / "unretained.db").list_generations() == []
+
+
+def test_pinned_generation_is_read_consistently_while_a_new_one_is_installed(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db", retain=3)
+    database.save([software("old")], [hardware()])
+
+    with database.pin() as pinned:
+        database.save([software("new")], [hardware()])
+
+        assert pinned.search_software("old") == [software("old")]
+        assert pinned.search_software("new") == []
+        with pytest.raises(CacheError, match="read-only"):
+            pinned.save([software("other")], [hardware()])
+
+    oldest = database.list_generations()[-1].id
+    with database.pin(oldest) as pinned:
+        assert pinned.search_software("") == [software("old")]
+    assert database.search_software("") == [software("new")]
+
+
+def test_search_index_is_looked_up_once_per_pooled_or_pinned_generation(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    lookups: list[sqlite3.Connection] = []
+    has_search_index = Database._has_search_index
+
+    def counting_lookup(connection: sqlite3.Connection) -> bool:
+        lookups.append(connection)
+        return has_search_index(connection)
+
+    database = Database(tmp_path / "eol.db", persistent=True)
+    database.save([software()], [hardware()])
+    monkeypatch.setattr(Database, "_has_search_index", staticmethod(counting_lookup))
+
+    assert database.search_software("nginx") == [software()]
+    assert database.search_hardware_many(["Power", "Edge"])["Edge"] == [hardware()]
+    assert len(lookups) == 1
+    database.save([software("postgresql")], [hardware()])
+    assert database.search_software("postgresql") == [software("postgresql")]
+    assert database.search_software("nginx") == []
+    assert len(lookups) == 2
+
+    with database.pin() as pinned:
+        assert pinned.search_software("postgresql") == [software("postgresql")]
+        assert pinned.search_hardware("Power") == [hardware()]
+    assert len(lookups) == 3
+    database.close()
+
+
+def test_batch_searches_group_results_by_input_term(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db")
+    releases = [SoftwareLifecycle("nginx", "1.26", "2026-04-23"), SoftwareLifecycle("nginx", "1.24", "2024-04-23")]
+    database.save([*releases, software("postgresql")], [hardware("PowerEdge R740"), hardware("PowerVault")])
+
+    assert database.search_software_many(["nginx", ("nginx", "1.24"), "missing", "nginx"]) == {
+        "nginx": [releases[1], releases[0]],
+        ("nginx", "1.24"): [releases[1]],
+        "missing": [],
+    }
+    assert database.search_hardware_many(["Power", "R740"]) == {
+        "Power": [hardware("PowerEdge R740"), hardware("PowerVault")],
+        "R740": [hardware("PowerEdge R740")],
+    }
+
+
+def test_trigram_index_and_table_scan_return_identical_results(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    software_records = [software(name) for name in ("nginx", "NGINX-plus", "openssl", "Ærø", "go")]
+    hardware_records = [hardware(model) for model in ("PowerEdge R740", "PowerVault", "Optiplex")]
+    indexed = Database(tmp_path / "indexed.db")
+    indexed.save(software_records, hardware_records)
+    monkeypatch.setattr(Database, "_build_search_index", staticmethod(lambda _: False))
+    scanned = Database(tmp_path / "scanned.db")
+    scanned.save(software_records, hardware_records)
+
+    connection = sqlite3.connect(tmp_path / "indexed.db")
+    try:
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        connection.close()
+    assert {"software_search", "hardware_search"} <= tables
+    for term in ("gin", "GINX", "g", "ærø", "", "%", "power", "R7", "dell"):
+        assert indexed.search_software(term) == scanned.search_software(term)
+        assert indexed.search_hardware(term) == scanned.search_hardware(term)
+    assert indexed.search_hardware_many(["power", "dell"]) == scanned.search_hardware_many(["power", "dell"])
+
+
+def test_installed_versions_resolve_to_the_most_specific_release_cycle(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db")
+    cycles = [
+        SoftwareLifecycle("nginx", "1.24", "2024-04-23"),
+        SoftwareLifecycle("nginx", "1.2", "2013-04-02"),
+        SoftwareLifecycle("nginx", "1", "unknown"),
+        SoftwareLifecycle("ubuntu", "22.04", "2027-04-01"),
+    ]
+    database.save(cycles, [hardware()])
+
+    assert database.find_software_release("nginx", "1.24.3") == cycles[0]
+    assert database.find_software_release("NGINX", "v1.2") == cycles[1]
+    assert database.find_software_release("nginx", "1.25.0") == cycles[2]
+    assert database.find_software_release("ubuntu", "22.04.3 LTS") == cycles[3]
+    assert database.find_software_release("nginx", "2.0") is None
+    assert database.find_software_release("ngin", "1.24") is None
+
+
+def test_expiring_records_are_selected_by_parsed_eol_date(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db")
+    database.save(
+        [
+            SoftwareLifecycle("nginx", "1.24", "2024-04-23"),
+            SoftwareLifecycle("nginx", "1.26", "2026-04-23"),
+            SoftwareLifecycle("nginx", "1.27", "unknown"),
+        ],
+        [
+            HardwareLifecycle("Dell", "PowerEdge R740", "05/2026"),
+            HardwareLifecycle("Dell", "PowerEdge R750", "31.12.2030"),
+        ],
+    )
+
+    software_records, hardware_records = database.expiring_before(date(2026, 6, 1), since=date(2025, 1, 1))
+
+    assert software_records == [SoftwareLifecycle("nginx", "1.26", "2026-04-23")]
+    assert hardware_records == [HardwareLifecycle("Dell", "PowerEdge R740", "05/2026")]
+    assert len(database.expiring_before(date(2026, 6, 1))[0]) == 2
+
+
+def test_columns_are_validated_as_a_batch_and_loaded_like_records(tmp_path: Path) -> None:
+    software_records = [SoftwareLifecycle("nginx", "1.24", "2024-04-23"), SoftwareLifecycle("nginx", "1.26", "unknown")]
+    hardware_records = [HardwareLifecycle("Dell", "PowerEdge R740", "05/2026", "dell")]
+    records, columns = Database(tmp_path / "records.db"), Database(tmp_path / "columns.db")
+
+    records.save(software_records, hardware_records)
+    columns.save(SoftwareColumns.from_records(software_records), HardwareColumns.from_records(hardware_records))
+
+    assert columns.search_software("") == records.search_software("") == software_records
+    assert columns.search_hardware("") == records.search_hardware("") == hardware_records
+    assert columns.expiring_before(date(2026, 6, 1)) == records.expiring_before(date(2026, 6, 1))
+    assert columns.find_software_release("nginx", "1.26.1") == SoftwareLifecycle("nginx", "1.26", "unknown")
+    with pytest.raises(ValueError, match="version must not be empty"):
+        SoftwareColumns(("nginx", "redis"), ("1.26", " "), ("unknown", "unknown"))
+    with pytest.raises(ValueError, match="equal lengths"):
+        HardwareColumns(("Dell",), ("PowerEdge",), ("2030-01-01",), ())
+
+
+def test_incremental_refresh_patches_only_changed_rows_and_reports_them(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db")
+    page = "https://example.test/dell"
+    database.save(
+        [software("nginx"), software("redis"), SoftwareLifecycle("go", "1.22", "2025-02-11")],
+        [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01", source=page)],
+    )
+
+    report = database.save_incremental(
+        [software("nginx"), SoftwareLifecycle("go", "1.22", "2025-08-13"), software("openssl")],
+        [
+            HardwareLifecycle("Dell", "PowerEdge", "2030-01-01", source=page),
+            HardwareLifecycle("Dell", "PowerVault", "2031-01-01", source=page),
+        ],
+    )
+
+    assert not report.rebuilt
+    assert report.added == (software("openssl"), HardwareLifecycle("Dell", "PowerVault", "2031-01-01"))
+    assert report.removed == (software("redis"),)
+    assert [(change.previous.eol, change.current.eol) for change in report.changed] == [("2025-02-11", "2025-08-13")]
+    assert database.search_software("") == [
+        SoftwareLifecycle("go", "1.22", "2025-08-13"),
+        software("nginx"),
+        software("openssl"),
+    ]
+    assert database.search_software("open") == [software("openssl")]
+    assert database.search_software("redis") == []
+    assert database.search_hardware("Vault") == [HardwareLifecycle("Dell", "PowerVault", "2031-01-01")]
+    assert database.find_software_release("go", "1.22.4") == SoftwareLifecycle("go", "1.22", "2025-08-13")
+
+
+def test_incremental_refresh_without_an_active_generation_rebuilds_the_cache(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db")
+
+    report = database.save_incremental([software()], [hardware()])
+
+    assert report.rebuilt
+    assert database.search_software("nginx") == [software()]
+
+
+def test_selective_refresh_replaces_only_the_supplied_products_and_sources(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db")
+    dell, hp = "https://example.test/dell", "https://example.test/hp"
+    with pytest.raises(CacheError, match="selective refresh needs a complete active cache"):
+        database.save_selective([software()], [])
+    database.save(
+        [software("nginx"), SoftwareLifecycle("nginx", "1.24", "2024-04-23"), software("redis")],
+        [
+            HardwareLifecycle("Dell", "PowerEdge", "2030-01-01", source=dell),
+            HardwareLifecycle("HP", "ProLiant", "2029-01-01", source=hp),
+        ],
+        validators={dell: SourceValidator(dell, etag='"dell-1"'), hp: SourceValidator(hp, etag='"hp-1"')},
+        product_names={"redis": ("Redis OSS",)},
+    )
+
+    report = database.save_selective(
+        [SoftwareLifecycle("nginx", "1.24", "2024-04-24")],
+        [HardwareLifecycle("Dell", "PowerVault", "2031-01-01", source=dell)],
+        validators={dell: SourceValidator(dell, etag='"dell-2"')},
+        product_names={"nginx": ("NGINX OSS",)},
+    )
+
+    assert report.added == (HardwareLifecycle("Dell", "PowerVault", "2031-01-01"),)
+    assert report.removed == (software("nginx"), HardwareLifecycle("Dell", "PowerEdge", "2030-01-01"))
+    assert [(change.previous.eol, change.current.eol) for change in report.changed] == [("2024-04-23", "2024-04-24")]
+    assert database.search_software("") == [SoftwareLifecycle("nginx", "1.24", "2024-04-24"), software("redis")]
+    assert [record.model for record in database.search_hardware("")] == ["PowerVault", "ProLiant"]
+    assert {url: validator.etag for url, validator in database.source_validators().items()} == {
+        dell: '"dell-2"',
+        hp: '"hp-1"',
+    }
+    assert database.product_names() == {"nginx": ("NGINX OSS",), "redis": ("Redis OSS",)}
+
+    with pytest.raises(CacheError, match="without any selected records"):
+        database.save_selective([], [])
+
+
+def test_snapshot_round_trip_installs_a_verified_generation(tmp_path: Path) -> None:
+    page = "https://example.test/dell"
+    source = Database(tmp_path / "source" / "eol.db")
+    source.save(
+        [software("nginx"), software("redis")],
+        [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01", source=page)],
+        validators={page: SourceValidator(page, etag='"v1"')},
+        product_names={"redis": ("Redis OSS",)},
+    )
+    snapshot = tmp_path / "eol.snapshot.tar.gz"
+
+    manifest = source.export_snapshot(snapshot)
+
+    assert (manifest.software_records, manifest.hardware_records) == (2, 1)
+    assert manifest.sources == (SourceValidator(page, etag='"v1"'),)
+    consumer = Database(tmp_path / "consumer" / "eol.db", retain=2)
+    consumer.save([software("old")], [hardware()])
+    with snapshot.open("rb") as stream:
+        assert consumer.import_snapshot(stream) == manifest
+    assert consumer.search_software("") == [software("nginx"), software("redis")]
+    assert consumer.source_validators() == {page: SourceValidator(page, etag='"v1"')}
+    assert consumer.match_products("Redis OSS")[0].product == "redis"
+    assert len(consumer.list_generations()) == 2
+
+    archive = bytearray(snapshot.read_bytes())
+    archive[len(archive) // 2] ^= 0xFF
+    damaged = tmp_path / "damaged.tar.gz"
+    damaged.write_bytes(bytes(archive))
+    with pytest.raises(CacheError, match="Snapshot"):
+        consumer.import_snapshot(damaged)
+    assert consumer.search_software("") == [software("nginx"), software("redis")]
+
+
+def test_keyset_pages_read_identical_records_exactly_once(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db")
+    software_records = [software("nginx"), software("nginx"), software("redis"), software("nginx")]
+    hardware_records = [
+        HardwareLifecycle("Dell", "PowerEdge", "2030-01-01", "dell-a"),
+        HardwareLifecycle("Dell", "PowerEdge", "2030-01-01", "dell-b"),
+    ]
+    database.save(software_records, hardware_records)
+
+    paged: list[SoftwareLifecycle] = []
+    page = database.software_page(limit=1)
+    while True:
+        paged.extend(page.records)
+        if page.cursor is None:
+            break
+        page = database.software_page(limit=1, after=page.cursor)
+    first = database.hardware_page(limit=1)
+
+    assert paged == sorted(software_records, key=lambda record: record.name)
+    assert first.cursor is not None
+    assert [*first.records, *database.iter_hardware(after=first.cursor)] == hardware_records
+    with pytest.raises(ValueError, match="Invalid page cursor"):
+        database.software_page(after="not a cursor")
+
+
+def test_export_rows_read_one_generation_while_a_new_one_is_installed(tmp_path: Path) -> None:
+    cache_path = tmp_path / "eol.db"
+    Database(cache_path).save([SoftwareLifecycle("redis", "7.2", "2026-02-28")], [hardware("R740")])
+    database = Database(cache_path)
+
+    rows = database.export_rows()
+    assert next(rows) == ("software", ("redis", "7.2", "2026-02-28"))
+    Database(cache_path).save([SoftwareLifecycle("nginx", "1.26", "unknown")], [hardware("R640")])
+
+    assert list(rows) == [("hardware", ("Dell", "R740", "2030-01-01", ""))]
+    assert [row for _, row in database.export_rows()][0] == ("nginx", "1.26", "unknown")
+
+
+@pytest.mark.parametrize("in_memory", [False, True], ids=["persistent", "in_memory"])
+def test_export_survives_a_replacement_followed_by_a_query_on_the_same_thread(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, in_memory: bool
+) -> None:
+    cache_path = tmp_path / "eol.db"
+    records = [SoftwareLifecycle(f"product-{index:03}", "1.0", "2030-01-01") for index in range(100)]
+    Database(cache_path).save(records, [hardware()])
+    database = Database(cache_path, persistent=True, in_memory=in_memory)
+    monkeypatch.setattr(database, "_FETCH_SIZE", 16)
+
+    exported = database.export()
+    assert next(exported) == records[0]
+    Database(cache_path).save([software("replacement")], [hardware("R640")])
+    assert database.search_software("replacement") == [software("replacement")]
+
+    assert list(exported) == [*records[1:], hardware()]
+    assert database.search_software("product") == []
+    database.close()
+
+
+def test_iterators_page_by_offset_and_keyset_and_release_their_connection(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import eolchecker.tools.database as database_module
+
+    cache_path = tmp_path / "eol.db"
+    records = [SoftwareLifecycle(f"product-{index:03}", "1.0", "2030-01-01") for index in range(250)]
+    Database(cache_path).save(records[::-1], [hardware("R740"), hardware("R640")])
+    database = Database(cache_path)
+    monkeypatch.setattr(database, "_FETCH_SIZE", 16)
+
+    assert list(database.iter_software()) == records
+    assert list(database.iter_software("product-01")) == records[10:20]
+    assert list(database.iter_software(limit=5, offset=100)) == records[100:105]
+    page = database.software_page(limit=201)
+    assert page.records == tuple(records[:201])
+    assert list(database.iter_software(limit=5, after=page.cursor)) == records[201:206]
+    assert list(database.iter_hardware("R")) == [hardware("R640"), hardware("R740")]
+    assert list(database.export()) == records[::-1] + [hardware("R740"), hardware("R640")]
+    with pytest.raises(ValueError, match="negative"):
+        database.iter_software(limit=-1)
+
+    original_connect = sqlite3.connect
+    connections: list[sqlite3.Connection] = []
+
+    def recording_connect(*arguments: Any, **keywords: Any) -> sqlite3.Connection:
+        connection: sqlite3.Connection = original_connect(*arguments, **keywords)
+        connections.append(connection)
+        return connection
+
+    monkeypatch.setattr(database_module.sqlite3, "connect", recording_connect)
+    iterator = database.iter_software()
+    assert next(iterator) == records[0]
+    assert len(connections) == 1
+    iterator.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
@@ -1,19 +1,34 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
+from urllib.parse import unquote
 
 import pytest
+import requests
 
-from eolchecker.models import HardwareLifecycle, SoftwareLifecycle
+from eolchecker.models import HardwareColumns, HardwareLifecycle, SoftwareColumns, SoftwareLifecycle
+from eolchecker.tools.database import Database
 from eolchecker.tools.downloader import Downloader, SourceError
+from eolchecker.tools.metrics import CACHE_SOURCE, RefreshMetrics
 
 
 class FakeResponse:
-    def __init__(self, payload: object, content_type: str = "application/json") -> None:
+    def __init__(
+        self,
+        payload: object,
+        content_type: str = "application/json",
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+    ) -> None:
         self._payload = payload
-        self.headers = {"Content-Type": content_type}
+        self.headers = {"Content-Type": content_type, **(headers or {})}
         self.content = b"unused"
+        self.status_code = status_code
 
     def json(self) -> object:
         return self._payload
@@ -27,7 +42,9 @@ class FakeSession:
         self.response = response
         self.urls: list[str] = []
 
-    def get(self, url: str, timeout: tuple[float, float]) -> FakeResponse:
+    def get(
+        self, url: str, timeout: tuple[float, float], headers: dict[str, str] | None = None, stream: bool = False
+    ) -> FakeResponse:
         self.urls.append(url)
         return self.response
 
@@ -40,6 +57,8 @@ def test_software_download_maps_v1_product_releases() -> None:
                 "result": [
                     {
                         "name": "nginx",
+                        "aliases": ["nginx-server", " "],
+                        "label": "Nginx",
                         "releases": [
                             {"name": "1.26", "eolFrom": "2026-04-23"},
                             {"name": "1.25", "eolFrom": None},
@@ -58,6 +77,7 @@ def test_software_download_maps_v1_product_releases() -> None:
         SoftwareLifecycle(name="nginx", version="1.26", eol="2026-04-23"),
         SoftwareLifecycle(name="nginx", version="1.25", eol="unknown"),
     ]
+    assert downloader.product_names == {"nginx": ("nginx-server", "Nginx")}
 
 
 def test_software_download_rejects_non_json_responses() -> None:
@@ -83,7 +103,7 @@ def test_hardware_parser_skips_short_and_invalid_rows() -> None:
     """
     downloader = Downloader(session=FakeSession(FakeResponse({})))  # type: ignore[arg-type]
 
-    records = downloader._parse_hardware_page(html, "fixture")
+    records = downloader.parse_hardware_page(html, "fixture")
     serialized = json.loads(downloader.html_to_json(html))
 
     assert records == [
@@ -104,3 +124,310 @@ def test_software_download_rejects_products_without_releases() -> None:
 
     with pytest.raises(SourceError, match="no release list"):
         downloader.get_eol_software()
+
+
+class PageSession:
+    def __init__(self, failing_url: str | None = None) -> None:
+        self.failing_url = failing_url
+        self.urls: list[str] = []
+
+    def get(
+        self, url: str, timeout: tuple[float, float], headers: dict[str, str] | None = None, stream: bool = False
+    ) -> FakeResponse:
+        self.urls.append(url)
+        if url == self.failing_url:
+            raise requests.ConnectionError("simulated outage")
+        response = FakeResponse({}, "text/html")
+        model = url.rsplit("/", 1)[-1]
+        response.content = (
+            b"<table><thead><tr><th>Manuf.</th><th>Model</th></tr></thead>"
+            b"<tbody><tr><td>Vendor</td><td>" + model.encode() + b"</td></tr></tbody></table>"
+        )
+        return response
+
+
+def test_concurrent_hardware_download_preserves_source_order() -> None:
+    session = PageSession()
+    downloader = Downloader(session=session, max_workers=4)  # type: ignore[arg-type]
+
+    records = downloader.get_eol_hardware()
+
+    assert [record.model for record in records] == list(Downloader.HARDWARE_MANUFACTURERS)
+    assert sorted(session.urls) == sorted(
+        f"{Downloader.HARDWARE_EOL_URL}/{path}" for path in Downloader.HARDWARE_MANUFACTURERS
+    )
+
+
+def test_concurrent_hardware_download_fails_the_whole_dataset() -> None:
+    failing_url = f"{Downloader.HARDWARE_EOL_URL}/{Downloader.HARDWARE_MANUFACTURERS[3]}"
+    downloader = Downloader(session=PageSession(failing_url), max_workers=4)  # type: ignore[arg-type]
+
+    with pytest.raises(SourceError, match="simulated outage"):
+        downloader.get_eol_hardware()
+
+
+class RevalidatingSession:
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, dict[str, str]]] = []
+
+    def get(
+        self, url: str, timeout: tuple[float, float], headers: dict[str, str] | None = None, stream: bool = False
+    ) -> FakeResponse:
+        self.requests.append((url, dict(headers or {})))
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(None, status_code=304)
+        payload = {
+            "result": [
+                {"name": "nginx", "label": "NGINX OSS", "releases": [{"name": "1.26", "eolFrom": "2026-04-23"}]}
+            ]
+        }
+        return FakeResponse(payload, headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+
+def test_unchanged_software_source_reuses_cached_records(tmp_path: Path) -> None:
+    database = Database(tmp_path / "eol.db")
+    url = "https://endoflife.date/api/v1/products/full"
+    session = RevalidatingSession()
+    first = Downloader(session=session, cache=database)  # type: ignore[arg-type]
+    database.save(
+        first.get_eol_software(),
+        [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01")],
+        validators=first.validators,
+        product_names=first.product_names,
+    )
+
+    second = Downloader(session=session, cache=database)  # type: ignore[arg-type]
+    records = second.get_eol_software()
+
+    assert session.requests[-1] == (
+        url,
+        {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"},
+    )
+    assert records == [SoftwareLifecycle(name="nginx", version="1.26", eol="2026-04-23")]
+    assert second.validators[url].etag == '"v1"'
+    assert second.product_names == {"nginx": ("NGINX OSS",)}
+
+
+class StreamingResponse(FakeResponse):
+    def __init__(self, body: bytes) -> None:
+        super().__init__(None)
+        self._body = body
+
+    def iter_content(self, chunk_size: int) -> Any:
+        return (self._body[index : index + 7] for index in range(0, len(self._body), 7))
+
+    def __enter__(self) -> StreamingResponse:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        return None
+
+
+def test_streamed_software_download_yields_validated_records() -> None:
+    body = json.dumps(
+        {
+            "schema_version": "1.2.1",
+            "result": [
+                {"name": "nginx", "releases": [{"name": "1.26", "eolFrom": "2026-04-23"}]},
+                {"name": "pótgres", "releases": [{"name": "16", "eolFrom": None}]},
+            ],
+        }
+    ).encode()
+    downloader = Downloader(session=FakeSession(StreamingResponse(body)))  # type: ignore[arg-type]
+
+    assert list(downloader.iter_eol_software()) == [
+        SoftwareLifecycle(name="nginx", version="1.26", eol="2026-04-23"),
+        SoftwareLifecycle(name="pótgres", version="16", eol="unknown"),
+    ]
+
+
+def test_streamed_software_download_rejects_truncated_documents() -> None:
+    body = b'{"result": [{"name": "nginx", "releases": [{"name": "1.26", "eolFrom": null}]}, {"name": "ngi'
+    downloader = Downloader(session=FakeSession(StreamingResponse(body)))  # type: ignore[arg-type]
+    records = downloader.iter_eol_software()
+
+    assert next(records) == SoftwareLifecycle(name="nginx", version="1.26", eol="unknown")
+    with pytest.raises(SourceError, match="invalid product list"):
+        next(records)
+
+
+class DatasetSession(PageSession):
+    def __init__(self, software: StreamingResponse, failing_url: str | None = None) -> None:
+        super().__init__(failing_url)
+        self.software = software
+        self.started = threading.Barrier(2, timeout=5)
+
+    def get(
+        self, url: str, timeout: tuple[float, float], headers: dict[str, str] | None = None, stream: bool = False
+    ) -> FakeResponse:
+        if url.startswith(Downloader.SOFTWARE_EOL_API):
+            self.started.wait()
+            return self.software
+        if not self.urls:
+            self.started.wait()
+        return super().get(url, timeout, headers, stream)
+
+
+def test_software_and_hardware_datasets_are_fetched_concurrently() -> None:
+    body = json.dumps({"result": [{"name": "nginx", "releases": [{"name": "1.26", "eolFrom": None}]}]}).encode()
+    downloader = Downloader(session=DatasetSession(StreamingResponse(body)))  # type: ignore[arg-type]
+
+    software_records, hardware_records = downloader.get_eol_datasets()
+
+    assert software_records == [SoftwareLifecycle(name="nginx", version="1.26", eol="unknown")]
+    assert [record.model for record in hardware_records] == list(Downloader.HARDWARE_MANUFACTURERS)
+
+
+def test_first_dataset_failure_cancels_the_other_retrieval() -> None:
+    chunks: list[bytes] = []
+
+    class SlowResponse(StreamingResponse):
+        def iter_content(self, chunk_size: int) -> Any:
+            for chunk in (b'{"result": [', b'{"name": "nginx", "releases": []}', b"]}"):
+                chunks.append(chunk)
+                yield chunk
+                # Stall until the failure of the hardware retrieval cancels this one.
+                deadline = time.monotonic() + 5
+                while time.monotonic() < deadline:
+                    downloader._check_cancelled("stalled")
+                    time.sleep(0.005)
+
+    failing_url = f"{Downloader.HARDWARE_EOL_URL}/{Downloader.HARDWARE_MANUFACTURERS[0]}"
+    session = DatasetSession(SlowResponse(b""), failing_url)
+    downloader = Downloader(session=session)  # type: ignore[arg-type]
+
+    with pytest.raises(SourceError, match="simulated outage"):
+        downloader.get_eol_datasets()
+
+    assert len(chunks) < 3
+    assert session.urls == [failing_url]
+
+
+def test_selected_products_and_manufacturers_are_fetched_from_their_own_sources() -> None:
+    class ProductSession(PageSession):
+        def get(
+            self, url: str, timeout: tuple[float, float], headers: dict[str, str] | None = None, stream: bool = False
+        ) -> FakeResponse:
+            if not url.startswith(Downloader.SOFTWARE_EOL_API):
+                return super().get(url, timeout, headers, stream)
+            self.urls.append(url)
+            name = unquote(url.rsplit("/", 1)[-1])
+            releases = [{"name": "1", "eolFrom": "2030-01-01"}] if name != "retired" else []
+            return FakeResponse({"result": {"name": name, "label": name.upper(), "releases": releases}})
+
+    session = ProductSession()
+    downloader = Downloader(session=session, max_workers=2)  # type: ignore[arg-type]
+
+    software_records, hardware_records = downloader.get_eol_datasets(["nginx", "pot gres", "nginx"], ["DELL"])
+
+    assert software_records == [
+        SoftwareLifecycle(name="nginx", version="1", eol="2030-01-01"),
+        SoftwareLifecycle(name="pot gres", version="1", eol="2030-01-01"),
+    ]
+    assert [record.model for record in hardware_records] == ["dell-end-of-life-en"]
+    assert sorted(session.urls) == [
+        f"{Downloader.SOFTWARE_EOL_API}/products/nginx",
+        f"{Downloader.SOFTWARE_EOL_API}/products/pot%20gres",
+        f"{Downloader.HARDWARE_EOL_URL}/dell-end-of-life-en",
+    ]
+    assert downloader.product_names == {"nginx": ("NGINX",), "pot gres": ("POT GRES",)}
+    assert downloader.get_eol_datasets([], ["hp-end-of-life-en"])[0] == []
+
+    with pytest.raises(SourceError, match="returned no lifecycle records"):
+        downloader.get_eol_products(["retired"])
+    with pytest.raises(SourceError, match="Unknown hardware manufacturers acme; choose from hp, ibm, dell"):
+        downloader.get_eol_hardware(["dell", "acme"])
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.mark.parametrize("page", sorted((FIXTURES / "hardware").glob("*.html")), ids=lambda page: page.stem)
+def test_hardware_parser_backends_produce_identical_rows_and_warnings(
+    page: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    content = page.read_bytes()
+    results = []
+    for backend in ("beautifulsoup", "events"):
+        downloader = Downloader(session=FakeSession(FakeResponse({})), hardware_parser=backend)  # type: ignore[arg-type]
+        caplog.clear()
+        with caplog.at_level("WARNING"):
+            rows = downloader._extract_hardware_rows(content, page.name)
+        results.append((rows, [record.getMessage() for record in caplog.records]))
+
+    assert results[0] == results[1]
+    assert results[0][0] and results[0][1]
+
+
+def test_refresh_metrics_record_stages_bytes_records_and_retries(tmp_path: Path) -> None:
+    response = FakeResponse({"result": [{"name": "nginx", "releases": [{"name": "1.26", "eolFrom": "2026-04-23"}]}]})
+    retries = SimpleNamespace(history=("first attempt", "second attempt"))
+    response.raw = SimpleNamespace(retries=retries)  # type: ignore[attr-defined]
+    metrics = RefreshMetrics()
+    downloader = Downloader(session=FakeSession(response), metrics=metrics)  # type: ignore[arg-type]
+
+    Database(tmp_path / "eol.db").save(
+        downloader.get_eol_software(), [HardwareLifecycle("Dell", "PowerEdge", "2030-01-01")], metrics=metrics
+    )
+    metrics.finish(succeeded=True)
+
+    software_url = f"{Downloader.SOFTWARE_EOL_API}/products/full"
+    sources = {source.source: source for source in metrics.sources}
+    assert set(sources[software_url].seconds) == {"download", "decode", "validate"}
+    assert (sources[software_url].bytes, sources[software_url].records, sources[software_url].retries) == (6, 1, 2)
+    assert {"insert", "index", "commit", "replace"} <= set(sources[CACHE_SOURCE].seconds)
+    assert sources[CACHE_SOURCE].records == 2
+    exposition = metrics.prometheus()
+    assert "eolchecker_refresh_success 1.0" in exposition
+    assert f'eolchecker_refresh_retries{{source="{software_url}"}} 2.0' in exposition
+    assert json.loads(json.dumps(metrics.as_dict()))["retries"] == 2
+
+
+def test_recorded_software_feed_decodes_identically_when_streamed() -> None:
+    body = (Path(__file__).parent / "fixtures" / "software" / "products_full.json").read_bytes()
+    products = json.loads(body)["result"]
+    mirror = "http://mirror.test/api/v1/"
+
+    session = FakeSession(FakeResponse(json.loads(body)))
+    records = Downloader(session=session, software_api=mirror).get_eol_software()  # type: ignore[arg-type]
+    streaming = Downloader(session=FakeSession(StreamingResponse(body)), software_api=mirror)  # type: ignore[arg-type]
+    streamed = list(streaming.iter_eol_software())
+
+    assert session.urls == ["http://mirror.test/api/v1/products/full"]
+    assert len(records) == sum(len(product["releases"]) for product in products)
+    assert streamed == records
+    assert Downloader(session=FakeSession(FakeResponse({}))).parse_software_feed(body) == records  # type: ignore[arg-type]
+    with pytest.raises(SourceError, match="product result list"):
+        streaming.parse_software_feed(b"[]")
+
+
+def test_columnar_lists_match_the_validated_records_of_recorded_sources() -> None:
+    products = json.loads((FIXTURES / "software" / "products_full.json").read_bytes())["result"]
+    downloader = Downloader(session=FakeSession(FakeResponse({})))  # type: ignore[arg-type]
+
+    software_lists: tuple[list[str], list[str], list[str]] = ([], [], [])
+    for product in products:
+        downloader._add_software_product(product, software_lists)
+    software_records = [
+        SoftwareLifecycle.from_v1_release(product["name"], release)
+        for product in products
+        for release in product["releases"]
+    ]
+    assert SoftwareColumns(*map(tuple, software_lists)).records() == software_records
+
+    for page in sorted((FIXTURES / "hardware").glob("*.html")):
+        content = page.read_bytes()
+        hardware_lists = downloader._parse_hardware_lists(content, page.name)
+        extracted = downloader._extract_hardware_rows(content, page.name)
+        records = [HardwareLifecycle.from_dict(row, page.name) for row in extracted]
+        assert HardwareColumns(*map(tuple, hardware_lists)).records() == records
+
+
+def test_invalid_release_fails_the_columns_when_they_are_assembled() -> None:
+    body = json.dumps({"result": [{"name": "nginx", "releases": [{"name": " ", "eolFrom": None}]}]}).encode()
+    downloader = Downloader(session=DatasetSession(StreamingResponse(body)))  # type: ignore[arg-type]
+
+    with pytest.raises(SourceError, match="version must not be empty"):
+        downloader.get_eol_columns()
+    with pytest.raises(SourceError, match="contains an invalid release"):
+        downloader._software_records({"name": "nginx", "releases": [{"name": " ", "eolFrom": None}]})
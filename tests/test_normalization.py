@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+
+from eolchecker.tools.normalization import (
+    parse_eol_date,
+    product_key,
+    split_product_version,
+    trigrams,
+    version_key,
+    version_key_prefixes,
+)
+
+
+def test_version_keys_sort_numerically_and_prefix_their_cycles() -> None:
+    assert version_key("1.10") > version_key("1.9")
+    assert version_key("v1.24.3-rc1").startswith(version_key("1.24") + ".")
+    assert version_key_prefixes("22.04.3") == [version_key("22.04.3"), version_key("22.04"), version_key("22")]
+    assert version_key_prefixes("") == []
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("2026-04-23", ("2026-04-23", "day")),
+        ("31.12.2024", ("2024-12-31", "day")),
+        ("June 15, 2025", ("2025-06-15", "day")),
+        ("12/2024", ("2024-12-01", "month")),
+        ("Juni 2025", ("2025-06-01", "month")),
+        ("Q3 2025", ("2025-07-01", "quarter")),
+        ("ca. 2030*", ("2030-01-01", "year")),
+        ("unknown", (None, None)),
+        ("2024-02-30", (None, None)),
+        ("see vendor notice", (None, None)),
+    ],
+)
+def test_eol_values_are_parsed_to_the_start_of_their_period(
+    value: str, expected: tuple[str | None, str | None]
+) -> None:
+    assert parse_eol_date(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("nginx/1.24", ("nginx", "1.24")),
+        ("Microsoft SQL Server 2019", ("Microsoft SQL Server", "2019")),
+        ("ubuntu-22.04", ("ubuntu", "22.04")),
+        ("openjdk v17.0.2+8", ("openjdk", "17.0.2+8")),
+        ("log4j", ("log4j", None)),
+        (" python3 ", ("python3", None)),
+    ],
+)
+def test_inventory_names_are_split_from_their_trailing_version(value: str, expected: tuple[str, str | None]) -> None:
+    assert split_product_version(value) == expected
+
+
+def test_product_keys_ignore_case_accents_and_punctuation() -> None:
+    assert product_key("Microsoft SQL Server") == product_key("microsoft-sql_server") == "microsoftsqlserver"
+    assert product_key("Ångström") == "angstrom"
+    assert trigrams("sql") == {"  s", " sq", "sql", "ql "}
+    assert trigrams("") == set()
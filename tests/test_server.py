@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from eolchecker.models import HardwareLifecycle, SoftwareLifecycle
+from eolchecker.tools.database import Database
+from eolchecker.tools.server import LifecycleServer
+
+
+@pytest.fixture
+def cache_path(tmp_path: Path) -> Path:
+    path = tmp_path / "eol.db"
+    soon = (date.today() + timedelta(days=10)).isoformat()
+    Database(path).save(
+        [SoftwareLifecycle("nginx", "1.24", soon), SoftwareLifecycle("nginx", "1.26", "2030-01-01")],
+        [HardwareLifecycle("Dell", "PowerEdge R740", "2030-01-01")],
+    )
+    return path
+
+
+@pytest.fixture
+def server(cache_path: Path) -> Iterator[LifecycleServer]:
+    with LifecycleServer(("127.0.0.1", 0), Database(cache_path, in_memory=True), threads=2) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield server
+        finally:
+            server.shutdown()
+            thread.join()
+            server.database.close()
+
+
+def get(server: LifecycleServer, path: str) -> tuple[int, Any]:
+    try:
+        with urllib.request.urlopen(server.url + path.lstrip("/"), timeout=5) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as error:
+        with error:
+            return error.code, json.load(error)
+
+
+def test_server_answers_software_hardware_and_expiring_queries(server: LifecycleServer) -> None:
+    assert get(server, "/health") == (200, {"status": "ok"})
+    assert get(server, "/software?name=NGINX&version=1.24.3") == (
+        200,
+        {"software": [{"name": "nginx", "version": "1.24", "eol": (date.today() + timedelta(days=10)).isoformat()}]},
+    )
+    status, payload = get(server, "/software?name=ngin")
+    assert status == 200
+    assert [record["version"] for record in payload["software"]] == ["1.24", "1.26"]
+    assert get(server, "/hardware?name=R740") == (
+        200,
+        {"hardware": [{"manufacturer": "Dell", "model": "PowerEdge R740", "eol": "2030-01-01"}]},
+    )
+    status, payload = get(server, "/expiring?days=30")
+    assert status == 200
+    assert [record["version"] for record in payload["software"]] == ["1.24"]
+    assert payload["hardware"] == []
+
+
+def test_server_rejects_unknown_endpoints_and_invalid_parameters(server: LifecycleServer) -> None:
+    assert get(server, "/unknown")[0] == 404
+    assert get(server, "/software")[0] == 400
+    assert get(server, "/expiring?days=soon")[0] == 400
+    assert get(server, "/expiring?days=99999999") == (
+        400,
+        {"error": "Invalid number of days for 'days' beyond 9999-12-31: '99999999'"},
+    )
+
+
+def test_server_switches_to_a_replaced_generation(server: LifecycleServer, cache_path: Path) -> None:
+    assert len(get(server, "/software?name=nginx")[1]["software"]) == 2
+
+    Database(cache_path).save(
+        [SoftwareLifecycle("postgresql", "16", "2028-11-09")],
+        [HardwareLifecycle("Dell", "PowerEdge R750", "2032-01-01")],
+    )
+
+    assert get(server, "/software?name=nginx") == (200, {"software": []})
+    assert get(server, "/software?name=postgres")[1]["software"][0]["version"] == "16"